@@ -0,0 +1,189 @@
+# OSSL2Gif - Textur-Atlas: mehrere Animationen in einer Zweierpotenz-Textur
+# llSetTextureAnim teilt die ganze Textur in ein gleichmäßiges Raster und spielt davon eine
+# zusammenhängende Folge (start, length) ab. Deshalb teilen sich alle Animationen ein
+# gemeinsames Zellraster und liegen als aufeinanderfolgende Zellbereiche darin.
+# Das Raster wird so gewählt, dass die Zellen möglichst die Originalgröße der Bilder
+# erreichen und die Textur dabei so klein wie möglich bleibt.
+
+import math
+import os
+
+from PIL import Image
+
+import core
+from profiler import PROFILER
+
+ATLAS_MAX = 2048
+
+
+def plan_grid(frame_count, cell_size, max_w=ATLAS_MAX, max_h=ATLAS_MAX):
+    # (Spalten, Zeilen, Atlasbreite, Atlashöhe) für frame_count Zellen der Wunschgröße cell_size
+    target_w, target_h = cell_size
+    # Obergrenze auf eine Zweierpotenz abrunden (z.B. 1000 -> 512), sonst wäre die Textur keine
+    max_w = 1 << (max(1, int(max_w)).bit_length() - 1)
+    max_h = 1 << (max(1, int(max_h)).bit_length() - 1)
+    best = None
+    for cols in range(1, frame_count + 1):
+        rows = math.ceil(frame_count / cols)
+        atlas_w = min(max_w, core.power_of_two(cols * target_w))
+        atlas_h = min(max_h, core.power_of_two(rows * target_h))
+        cell_w = atlas_w // cols
+        cell_h = atlas_h // rows
+        if not cell_w or not cell_h:
+            continue
+        # Erreichte Auflösung (1 = Originalgröße), dann kleinste und möglichst quadratische Textur
+        scale = min(cell_w / target_w, cell_h / target_h, 1.0)
+        key = (-scale, atlas_w * atlas_h, abs(atlas_w - atlas_h))
+        if best is None or key < best[0]:
+            best = (key, (cols, rows, atlas_w, atlas_h))
+    if best is None:
+        raise ValueError("Zu viele Bilder für die maximale Atlasgröße")
+    return best[1]
+
+
+def pack(animations, effects, bg_color="#00000000", max_w=ATLAS_MAX, max_h=ATLAS_MAX, borderless=False, progress=None):
+    # animations: [(Name, Bilder, Verzögerungen)]; liefert Atlasbild, Raster und je Animation
+    # Startzelle, Länge und Bildrate; progress(fertig, gesamt) nach jeder Zelle
+    total = sum(len(frames) for _, frames, _ in animations)
+    if not total:
+        raise ValueError("Keine Bilder für den Atlas")
+    cell_size = (max(frames[0].width for _, frames, _ in animations if frames),
+                 max(frames[0].height for _, frames, _ in animations if frames))
+    cols, rows, atlas_w, atlas_h = plan_grid(total, cell_size, max_w, max_h)
+    cell_w = atlas_w // cols
+    cell_h = atlas_h // rows
+    with PROFILER.stage("sheet") as st:
+        atlas = Image.new("RGBA", (atlas_w, atlas_h), core.parse_color(bg_color))
+        st.add_image(atlas)
+    entries = []
+    cell = 0
+    for name, frames, durations in animations:
+        box = core.trim_box(frames, borderless)
+        entries.append({'name': name, 'start': cell, 'length': len(frames), 'fps': core.animation_fps(durations)})
+        for frame in frames:
+            f = core.render_tile(frame, cell_w, cell_h, effects, box)
+            with PROFILER.stage("paste"):
+                atlas.paste(f, ((cell % cols) * cell_w, (cell // cols) * cell_h))
+            cell += 1
+            if progress is not None:
+                progress(cell, total)
+    return {'image': atlas, 'grid': (cols, rows), 'cell': (cell_w, cell_h), 'entries': entries}
+
+
+def generate_lsl_atlas_script(texture_name, cols, rows, entries):
+    # Ein Skript für jede Prim: die Animation wird über die Objektbeschreibung (Name) gewählt.
+    # Tabelle je Animation: Name, Startzelle, Länge, Bilder/s
+    table = ",\n    ".join(f'"{e["name"]}", {e["start"]}, {e["length"]}, {e["fps"]}' for e in entries)
+    return f'''// LSL Texture Atlas Script
+// Generated by OSSL2Gif
+// Texture: {texture_name}
+// Die Animation wird über die Objektbeschreibung gewählt (Name aus der Tabelle),
+// sonst die erste. manual = TRUE schaltet auf Einzelschritte per Offset/Repeat um.
+
+integer face = ALL_SIDES;
+integer manual = FALSE;
+integer sideX = {cols};
+integer sideY = {rows};
+// Name, Startzelle, Länge, Bilder/s
+list animations = [
+    {table}
+];
+
+integer start;
+integer length;
+float fps;
+integer step;
+
+select() {{
+    integer idx = llListFindList(animations, [llGetObjectDesc()]);
+    if (idx < 0 || idx % 4 != 0) idx = 0;
+    start = llList2Integer(animations, idx + 1);
+    length = llList2Integer(animations, idx + 2);
+    fps = llList2Float(animations, idx + 3);
+}}
+
+showCell(integer cell) {{
+    // Offset/Repeat für eine einzelne Zelle des Rasters
+    float u = ((float)(cell % sideX) + 0.5) / sideX - 0.5;
+    float v = 0.5 - ((float)(cell / sideX) + 0.5) / sideY;
+    llSetPrimitiveParams([PRIM_TEXTURE, face, "{texture_name}", <1.0 / sideX, 1.0 / sideY, 0.0>, <u, v, 0.0>, 0.0]);
+}}
+
+play() {{
+    select();
+    llSetTexture("{texture_name}", face);
+    if (manual) {{
+        llSetTextureAnim(FALSE, face, 0, 0, 0.0, 0.0, 1.0);
+        step = 0;
+        showCell(start);
+        llSetTimerEvent(1.0 / fps);
+    }}
+    else {{
+        llSetTimerEvent(0.0);
+        llSetTextureAnim(ANIM_ON | LOOP, face, sideX, sideY, (float)start, (float)length, fps);
+    }}
+}}
+
+default
+{{
+    state_entry()
+    {{
+        play();
+    }}
+    timer()
+    {{
+        step = (step + 1) % length;
+        showCell(start + step);
+    }}
+    changed(integer what)
+    {{
+        if (what & CHANGED_INVENTORY)
+        {{
+            play();
+        }}
+    }}
+    touch_start(integer total)
+    {{
+        // Beschreibung geändert? Neu auswählen
+        play();
+    }}
+}}
+'''
+
+
+def load_animations(sources, progress=None):
+    # progress(fertig, gesamt) nach jeder Datei
+    animations = []
+    for source in sources:
+        image, frames, durations = core.load_frames(source)
+        image.close()
+        animations.append((core.texture_basename(source), frames, durations))
+        if progress is not None:
+            progress(len(animations), len(sources))
+    return animations
+
+
+def controller_entries(result, texture_name, links=None):
+    # Tabelle für core.generate_lsl_controller_script: je verknüpfter Fläche ein Zellbereich
+    cols, rows = result['grid']
+    by_name = {e['name']: e for e in result['entries']}
+    return [{'link': link, 'face': face, 'texture': texture_name, 'tiles_x': cols, 'tiles_y': rows,
+             'start': by_name[name]['start'], 'length': by_name[name]['length'], 'fps': by_name[name]['fps']}
+            for name, link, face in core.controller_links(list(by_name), links)]
+
+
+def save_atlas(result, outdir, name, speed_val, fmt, links=None):
+    # Atlas-Textur (name;X;Y;speed), LSL-Skript je Prim und Linkset-Controller schreiben
+    cols, rows = result['grid']
+    ext = fmt.lower()
+    filename = core.texture_filename(name, cols, rows, speed_val, ext)
+    texture_name = os.path.splitext(filename)[0]
+    texture = os.path.join(outdir, filename)
+    core.save_texture(result['image'], texture, fmt)
+    lsl = os.path.join(outdir, f"{name}.lsl")
+    with open(lsl, "w", encoding="utf-8") as f:
+        f.write(generate_lsl_atlas_script(texture_name, cols, rows, result['entries']))
+    controller = os.path.join(outdir, f"{name}_controller.lsl")
+    with open(controller, "w", encoding="utf-8") as f:
+        f.write(core.generate_lsl_controller_script(controller_entries(result, texture_name, links)))
+    return {'texture': texture, 'lsl': lsl, 'controller': controller}
@@ -0,0 +1,324 @@
+# OSSL2Gif - Benchmark-Suite ohne Tk-Fenster
+# Misst GIF-Laden, Sprite-Sheet-Aufbau (1024/2048/4096), jeden Effekt-Zweig und den Export
+# (Textur, GIF, LSL) über synthetische und echte GIF-Korpora.
+#
+#   python benchmark.py --preset quick --output bench.json
+#   python benchmark.py --preset standard --baseline bench.json --threshold 0.25
+#   python benchmark.py --startup-only
+#
+# Mit --baseline endet der Lauf mit Exit-Code 1, wenn eine Stufe langsamer als erlaubt ist,
+# mit --startup ebenso, wenn ein Kaltstart sein Zeitbudget überschreitet.
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from PIL import Image, ImageDraw, __version__ as PIL_VERSION
+
+import core
+import project
+from profiler import PROFILER
+from timeline import Timeline
+
+# Synthetische Korpora: (Bilder, Breite, Höhe, transparent)
+CORPORA = {
+    'quick': [
+        (8, 256, 256, True),
+        (64, 128, 128, False),
+    ],
+    'standard': [
+        (8, 1024, 1024, True),
+        (64, 512, 512, True),
+        (256, 256, 256, False),
+        (1024, 64, 64, True),
+    ],
+    'full': [
+        (8, 4096, 4096, True),
+        (32, 2048, 2048, False),
+        (128, 1024, 1024, True),
+        (512, 512, 512, False),
+        (1024, 256, 256, True),
+    ],
+}
+
+SHEET_SIZES = (1024, 2048, 4096)
+
+# Ein Eintrag je Schritt des Effekt-Plans (effects.py), 'fused' = Transparenz + Pastell in einer Tabelle
+EFFECT_CASES = {
+    'none': {},
+    'grayscale': {'grayscale': 1},
+    'sharpen': {'sharpen': 1, 'sharpen_value': 2.5},
+    'blur': {'blur': 1, 'blur_value': 3.5},
+    'transparency': {'transparency': 1, 'transparency_value': 0.5},
+    'pastel': {'colorintensity_active': 1, 'colorintensity': 0.25},
+    'vivid': {'colorintensity_active': 1, 'colorintensity': 0.75},
+    'fused': {'transparency': 1, 'transparency_value': 0.5, 'colorintensity_active': 1, 'colorintensity': 0.25},
+}
+
+# Kantenlänge der Einzelbilder für den GIF-Export (gedeckelt, damit 1024 Bilder machbar bleiben)
+GIF_EXPORT_MAX = 512
+DEFAULT_THRESHOLD = 0.25
+# Absolute Untergrenze: kleinere Verschlechterungen gelten als Messrauschen
+DEFAULT_MIN_DELTA = 0.005
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Kaltstart je Einstiegspunkt (neuer Interpreter pro Messung) und Budget in Sekunden
+STARTUP_COMMANDS = {
+    'gui_import': ["-c", "import main"],
+    'gui_window': ["main.py", "--startup-probe"],
+    'cli': ["cli.py", "--help"],
+}
+STARTUP_BUDGETS = {
+    'gui_import': 0.5,
+    'gui_window': 1.5,
+    'cli': 0.3,
+}
+
+
+def synthetic_gif(path, frame_count, width, height, transparent, seed=0, margin=0):
+    # Deterministisches Test-GIF: bewegte Formen auf transparentem oder farbigem Hintergrund;
+    # margin hält die Formmittelpunkte so weit vom Rand fern (Randlos-Tests)
+    rnd = random.Random(f"{seed}:{frame_count}:{width}:{height}:{transparent}")
+    shapes = [(rnd.random(), rnd.random(), rnd.uniform(0.05, 0.25), tuple(rnd.randrange(256) for _ in range(3)))
+              for _ in range(6)]
+    frames = []
+    for i in range(frame_count):
+        phase = i / frame_count
+        if transparent:
+            img = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        else:
+            img = Image.new("RGBA", (width, height), (40 + i * 7 % 180, 60, 90, 255))
+        draw = ImageDraw.Draw(img)
+        for sx, sy, r, color in shapes:
+            cx = margin + ((sx + phase) % 1.0) * (width - 2 * margin)
+            cy = margin + ((sy + phase * 0.5) % 1.0) * (height - 2 * margin)
+            rad = max(1, r * min(width - 2 * margin, height - 2 * margin))
+            draw.ellipse((cx - rad, cy - rad, cx + rad, cy + rad), fill=color + (255,))
+        frames.append(img)
+    frames[0].save(path, format="GIF", save_all=True, append_images=frames[1:], loop=0, duration=40, disposal=2)
+
+
+def corpus_cases(preset, workdir, corpus_dir=None):
+    # Liefert [(Name, Pfad)]; synthetische GIFs werden im Arbeitsverzeichnis zwischengespeichert
+    cases = []
+    for frame_count, width, height, transparent in CORPORA[preset]:
+        name = f"syn_{frame_count}f_{width}x{height}_{'alpha' if transparent else 'opaque'}"
+        path = os.path.join(workdir, name + ".gif")
+        if not os.path.exists(path):
+            synthetic_gif(path, frame_count, width, height, transparent)
+        cases.append((name, path))
+    if corpus_dir:
+        for entry in sorted(os.listdir(corpus_dir)):
+            if entry.lower().endswith(".gif"):
+                cases.append((f"file_{os.path.splitext(entry)[0]}", os.path.join(corpus_dir, entry)))
+    return cases
+
+
+def measure(fn, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, {'median': statistics.median(times), 'min': min(times), 'runs': repeat}
+
+
+def run_case(name, path, repeat, log):
+    results = {}
+
+    def record(stage, fn):
+        value, stats = measure(fn, repeat)
+        results[f"{name}/{stage}"] = stats
+        log(f"  {stage:<22} {stats['median'] * 1000:10.1f} ms")
+        return value
+
+    log(f"{name}")
+    _, frames, _ = record("load", lambda: core.load_frames(path))
+    defaults = core.effect_settings()
+    sheets = {}
+    for size in SHEET_SIZES:
+        sheets[size] = record(f"compose_{size}", lambda size=size: core.compose_sheet(frames, size, size, defaults))
+    # Effekte auf Kachelgröße des 2048er-Sheets, wie in der Textur-Vorschau
+    tiles_x, tiles_y = core.grid_size(len(frames))
+    tile_size = (2048 // tiles_x, 2048 // tiles_y)
+    tiles = [f.resize(tile_size, Image.Resampling.LANCZOS) for f in frames]
+    for effect, overrides in EFFECT_CASES.items():
+        settings = core.effect_settings(**overrides)
+        record(f"effects_{effect}", lambda settings=settings: [core.apply_effects(t, settings) for t in tiles])
+    # Erneuter Sheet-Aufbau mit unveränderten Bildern und Effekten: Kacheln aus dem Cache
+    timeline = Timeline(frames, [0] * len(frames))
+    core.TILE_CACHE.clear()
+    core.compose_sheet(timeline, 512, 512, defaults)
+    record("compose_512_cached", lambda: core.compose_sheet(timeline, 512, 512, defaults))
+    core.TILE_CACHE.clear()
+    # Resampling-Stufen der Vorschau: Sheet direkt in Vorschaugröße und Skalierung des 2048er-Sheets
+    for quality in core.QUALITIES:
+        record(f"preview_sheet_{quality}", lambda quality=quality: core.compose_sheet(frames, 512, 512, defaults, quality=quality))
+        record(f"preview_scale_{quality}", lambda quality=quality: core.resize(sheets[2048], (512, 512), quality))
+    record("export_texture", lambda: core.save_texture(sheets[2048], io.BytesIO(), "PNG"))
+    # 1024er und 512er Variante aus dem 2048er-Sheet ableiten und parallel kodieren (Dateien werden danach gelöscht)
+    with tempfile.TemporaryDirectory(prefix="ossl2gif_bench_") as outdir:
+        record("export_pyramid", lambda: core.save_texture_variants(core.sheet_pyramid(sheets[2048], (2048, 1024, 512)), outdir,
+                                                                    "ossl2gif_bench_pyramid", tiles_x, tiles_y, 10, "PNG"))
+    # Aufbau + Kodierung in Kachelreihen (Vergleich: compose_2048 + export_texture)
+    record("export_texture_stream", lambda: core.save_texture_streaming(frames, io.BytesIO(), 2048, 2048, defaults))
+    gif_w = min(frames[0].width, GIF_EXPORT_MAX)
+    gif_h = min(frames[0].height, GIF_EXPORT_MAX)
+    record("export_gif", lambda: core.save_gif(frames, io.BytesIO(), gif_w, gif_h, defaults, 40))
+    record("export_lsl", lambda: core.generate_lsl_script(name, tiles_x, tiles_y, 10.0))
+    # Projektdatei: Bilder + 2048er-Sheet schreiben, Öffnen = Abbilden statt Dekodieren (Vergleich: load)
+    with tempfile.TemporaryDirectory(prefix="ossl2gif_bench_") as outdir:
+        project_path = os.path.join(outdir, "ossl2gif_bench" + project.EXTENSION)
+        record("project_save", lambda: project.save_project(project_path, {}, frames, timeline.state(), ("bench", sheets[2048])))
+        record("project_open", lambda: project.open_project(project_path))
+    return results
+
+
+def has_display():
+    # Ohne X-Server (Linux/BSD, z.B. CI) lässt sich kein Tk-Fenster öffnen; Windows und macOS haben immer eins
+    return sys.platform in ("win32", "darwin") or bool(os.environ.get("DISPLAY"))
+
+
+def measure_startup(repeat, log):
+    # Liefert (Ergebnisse, Fehlschläge als [(Name, Exit-Code, stderr)]). Übersprungen wird nur
+    # gui_window ohne Display; jeder andere Fehlschlag zählt, sonst bestünde ein abstürzender
+    # Start die Budgetprüfung
+    results = {}
+    failures = []
+    log("startup")
+    for name, args in STARTUP_COMMANDS.items():
+        if name == 'gui_window' and not has_display():
+            log(f"  {name:<22} übersprungen (kein Display)")
+            continue
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            proc = subprocess.run([sys.executable] + args, cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                  text=True, errors="replace")
+            if proc.returncode != 0:
+                break
+            times.append(time.perf_counter() - start)
+        if len(times) < repeat:
+            if name == 'gui_window' and "TclError" in proc.stderr and "display" in proc.stderr:
+                # DISPLAY gesetzt, aber nicht erreichbar
+                log(f"  {name:<22} übersprungen (Display nicht erreichbar)")
+                continue
+            log(f"  {name:<22} FEHLER (Exit-Code {proc.returncode})")
+            failures.append((name, proc.returncode, proc.stderr))
+            continue
+        results[f"startup/{name}"] = {'median': statistics.median(times), 'min': min(times), 'runs': repeat}
+        log(f"  {name:<22} {results[f'startup/{name}']['median'] * 1000:10.1f} ms")
+    return results, failures
+
+
+def check_startup_budgets(results, budgets):
+    over = []
+    for name, budget in budgets.items():
+        stats = results.get(f"startup/{name}")
+        if stats and stats['median'] > budget:
+            over.append((name, stats['median'], budget))
+    return over
+
+
+def compare(results, baseline, threshold, stage_thresholds, min_delta):
+    # Liste der Regressionen: (Schlüssel, Basis, aktuell, Verhältnis, erlaubt)
+    regressions = []
+    for key, stats in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        stage = key.split("/", 1)[1]
+        allowed = stage_thresholds.get(stage, threshold)
+        cur, ref = stats['median'], base['median']
+        if ref > 0 and cur > ref * (1 + allowed) and cur - ref > min_delta:
+            regressions.append((key, ref, cur, cur / ref, allowed))
+    return regressions
+
+
+def parse_stage_thresholds(values, defaults=None):
+    thresholds = dict(defaults or {})
+    for value in values or []:
+        stage, _, limit = value.partition("=")
+        thresholds[stage] = float(limit)
+    return thresholds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OSSL2Gif Benchmark (ohne GUI)")
+    parser.add_argument("--preset", choices=sorted(CORPORA), default="quick")
+    parser.add_argument("--corpus", help="Verzeichnis mit zusätzlichen echten GIFs")
+    parser.add_argument("--workdir", help="Ablage der synthetischen GIFs (Standard: Temp-Verzeichnis)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--baseline", help="Vergleichsergebnisse (JSON eines früheren Laufs)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="erlaubte Verlangsamung, 0.25 = +25%%")
+    parser.add_argument("--stage-threshold", action="append", metavar="STUFE=WERT", help="Schwelle je Stufe, z.B. compose_4096=0.5")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA, help="absolute Untergrenze in Sekunden")
+    parser.add_argument("--trace", help="Chrome-Trace der Stufen-Messpunkte speichern")
+    parser.add_argument("--startup", action="store_true", help="zusätzlich Kaltstartzeiten von GUI und CLI messen")
+    parser.add_argument("--startup-only", action="store_true", help="nur Kaltstartzeiten messen")
+    parser.add_argument("--startup-budget", action="append", metavar="NAME=SEKUNDEN", help="Budget je Einstiegspunkt, z.B. cli=0.2")
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or os.path.join(tempfile.gettempdir(), "ossl2gif_bench")
+    os.makedirs(workdir, exist_ok=True)
+    if args.trace:
+        PROFILER.enabled = True
+        PROFILER.reset()
+
+    results = {}
+    if not args.startup_only:
+        for name, path in corpus_cases(args.preset, workdir, args.corpus):
+            results.update(run_case(name, path, args.repeat, print))
+    status = 0
+    if args.startup or args.startup_only:
+        startup, failures = measure_startup(args.repeat, print)
+        results.update(startup)
+        for name, returncode, stderr in failures:
+            print(f"STARTUP {name}: Exit-Code {returncode}\n{stderr.rstrip()}", file=sys.stderr)
+            status = 1
+        for name, seconds, budget in check_startup_budgets(results, parse_stage_thresholds(args.startup_budget, STARTUP_BUDGETS)):
+            print(f"BUDGET {name}: {seconds * 1000:.0f} ms > {budget * 1000:.0f} ms")
+            status = 1
+
+    report = {
+        'version': 1,
+        'meta': {
+            'preset': args.preset,
+            'repeat': args.repeat,
+            'python': platform.python_version(),
+            'pillow': PIL_VERSION,
+            'platform': platform.platform(),
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.trace:
+        PROFILER.export_chrome_trace(args.trace)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get('results', {})
+        regressions = compare(results, baseline, args.threshold, parse_stage_thresholds(args.stage_threshold), args.min_delta)
+        for key, ref, cur, ratio, allowed in regressions:
+            print(f"REGRESSION {key}: {ref * 1000:.1f} ms -> {cur * 1000:.1f} ms (x{ratio:.2f}, erlaubt x{1 + allowed:.2f})")
+        if regressions:
+            return 1
+        print("Keine Regressionen.")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
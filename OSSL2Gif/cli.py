@@ -0,0 +1,289 @@
+# OSSL2Gif - Kommandozeile ohne GUI: GIF -> Textur (name;X;Y;speed) + LSL-Skript, optional GIF
+#
+#   python cli.py animation.gif -o ausgabe --size 1024 1024 --set grayscale=1 --set blur=1
+#
+# Die Verarbeitung entspricht "Textur speichern", "LSL exportieren" und "GIF speichern" der GUI.
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from lazyimport import lazy_import
+
+core = lazy_import("core")
+planner = lazy_import("planner")
+atlas = lazy_import("atlas")
+
+DEFAULT_SETTINGS = {
+    'width': 2048,
+    'height': 2048,
+    'export_format': "PNG",
+    'framerate': 10,
+    'bg_color': "#00000000",
+    'borderless': 0,
+    # Texturpanel- und GIF-Panel-Effekte (Schlüssel wie core.EFFECT_DEFAULTS)
+    'effects': {},
+    'gif_effects': {},
+    'gif': 0,
+    'lsl': 1,
+    # Statischen Hintergrund abtrennen: Hintergrund + Sheet des bewegten Ausschnitts + Zwei-Prim-Skript
+    'split_static': 0,
+    # Bildspeicher: 'auto' (nach Speicherbudget), 'memory' oder 'memmap' (Auslagerungsdatei)
+    'frame_store': 'auto',
+    # Texturvarianten (Breiten, z.B. [2048, 1024, 512]): ein Sheet, kleinere durch Halbieren
+    'sizes': [],
+}
+
+
+def merge_settings(settings=None):
+    merged = dict(DEFAULT_SETTINGS)
+    merged.update(settings or {})
+    return merged
+
+
+def convert_file(source, outdir, settings=None):
+    # Eine Animation konvertieren; liefert die geschriebenen Pfade und Zeiten je Schritt (s)
+    settings = merge_settings(settings)
+    os.makedirs(outdir, exist_ok=True)
+    timings = {}
+    start = time.perf_counter()
+    plan = planner.plan_file(source, (settings['width'], settings['height']), (0, 0), frame_store=settings['frame_store'])
+    # Sheets über dem Budget (je Variante eigener Plan, Höhe im Verhältnis von --size)
+    heights = {w: round(settings['height'] * w / settings['width']) for w in settings['sizes']}
+    if heights:
+        over = [w for w in heights if planner.plan_file(source, (w, heights[w]), (0, 0), plan.budget, plan.frame_store).streaming]
+    else:
+        heights = {settings['width']: settings['height']}
+        over = [settings['width']] if plan.streaming else []
+    if over and not core.can_stream_texture(settings['export_format']):
+        # Über dem Budget entsteht das Sheet nur streifenweise, und das kann nur PNG (wie in der GUI)
+        w = max(over)
+        raise ValueError(f"{settings['export_format']}-Textur {w}x{heights[w]} passt nicht ins Speicherbudget "
+                         f"({planner.format_bytes(plan.budget)}), darüber nur PNG (--format PNG oder kleinere --size)")
+    image, frames, durations = core.load_frames(source, backing=plan.frame_store)
+    image.close()
+    timings['load'] = time.perf_counter() - start
+    if not frames:
+        raise ValueError(f"{source}: keine Einzelbilder")
+
+    name = core.texture_basename(source)
+    tiles_x, tiles_y = core.grid_size(len(frames))
+    ext = settings['export_format'].lower()
+    result = {'source': source, 'name': name, 'frames': len(frames), 'tiles': (tiles_x, tiles_y), 'timings': timings,
+              'frame_store': plan.frame_store, 'estimated_peak': plan.peak, 'fps': core.animation_fps(durations)}
+
+    texture = os.path.join(outdir, core.texture_filename(name, tiles_x, tiles_y, settings['framerate'], ext))
+    effects = core.effect_settings(**settings['effects'])
+    large = settings['width'] * settings['height'] >= core.STREAM_MIN_PIXELS
+    if settings['sizes']:
+        # Varianten über dem Budget oder sehr große streifenweise schreiben, die übrigen aus der
+        # größten davon ableiten
+        streamed = []
+        if core.can_stream_texture(settings['export_format']):
+            streamed = [w for w in heights if w in over or w * heights[w] >= core.STREAM_MIN_PIXELS]
+        composed = [w for w in heights if w not in streamed]
+        variants = {}
+        if streamed:
+            start = time.perf_counter()
+            for w in streamed:
+                variants[w] = os.path.join(outdir, core.texture_filename(f"{name}_{w}", tiles_x, tiles_y, settings['framerate'], ext))
+                core.save_texture_streaming(frames, variants[w], w, heights[w], effects, settings['bg_color'], settings['borderless'])
+            timings['stream'] = time.perf_counter() - start
+        if composed:
+            widest = max(composed)
+            start = time.perf_counter()
+            sheet = core.compose_sheet(frames, widest, heights[widest], effects, settings['bg_color'], settings['borderless'])
+            timings['compose'] = time.perf_counter() - start
+            start = time.perf_counter()
+            levels = core.sheet_pyramid(sheet, composed)
+            timings['pyramid'] = time.perf_counter() - start
+            start = time.perf_counter()
+            variants.update(core.save_texture_variants(levels, outdir, name, tiles_x, tiles_y, settings['framerate'], settings['export_format']))
+            timings['encode'] = time.perf_counter() - start
+        result['variants'] = variants
+        texture = variants[max(variants)]
+    elif (plan.streaming or large) and core.can_stream_texture(settings['export_format']):
+        # Großes Sheet: Kachelreihe für Kachelreihe rendern und kodieren
+        start = time.perf_counter()
+        core.save_texture_streaming(frames, texture, settings['width'], settings['height'], effects, settings['bg_color'],
+                                    settings['borderless'])
+        timings['stream'] = time.perf_counter() - start
+    else:
+        start = time.perf_counter()
+        sheet = core.compose_sheet(frames, settings['width'], settings['height'], effects, settings['bg_color'], settings['borderless'])
+        timings['compose'] = time.perf_counter() - start
+        start = time.perf_counter()
+        core.save_texture(sheet, texture, settings['export_format'])
+        timings['encode'] = time.perf_counter() - start
+    result['texture'] = texture
+
+    if settings['lsl']:
+        start = time.perf_counter()
+        lsl = os.path.join(outdir, f"{name}.lsl")
+        with open(lsl, "w", encoding="utf-8") as f:
+            f.write(core.generate_lsl_script(name, tiles_x, tiles_y, 10.0))
+        timings['lsl'] = time.perf_counter() - start
+        result['lsl'] = lsl
+    if settings['split_static']:
+        start = time.perf_counter()
+        split = core.split_static(frames, settings['width'], settings['height'], effects, settings['bg_color'])
+        result['static'] = core.save_static_split(split, outdir, name, settings['framerate'], settings['export_format'])
+        result['region'] = split['region']
+        timings['static'] = time.perf_counter() - start
+    if settings['gif']:
+        start = time.perf_counter()
+        gif = os.path.join(outdir, f"{name}.gif")
+        core.save_gif(frames, gif, settings['width'], settings['height'], core.effect_settings(**settings['gif_effects']), settings['framerate'])
+        timings['gif'] = time.perf_counter() - start
+        result['gif'] = gif
+    frames.close()
+    return result
+
+
+def write_controller(results, outdir, links=None, filename="controller.lsl"):
+    # Ein Root-Skript für alle konvertierten Animationen (statt je Prim ein Skript)
+    by_name = {r['name']: r for r in results}
+    entries = []
+    for name, link, face in core.controller_links(list(by_name), links):
+        r = by_name[name]
+        tiles_x, tiles_y = r['tiles']
+        entries.append({'link': link, 'face': face, 'texture': os.path.splitext(os.path.basename(r['texture']))[0],
+                        'tiles_x': tiles_x, 'tiles_y': tiles_y, 'start': 0, 'length': r['frames'], 'fps': r['fps']})
+    path = os.path.join(outdir, filename)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(core.generate_lsl_controller_script(entries))
+    return path
+
+
+def load_links(path):
+    # Zuordnung Animation -> Link/Fläche aus JSON, z.B. {"fire": {"link": 2, "face": 1}}
+    if not path:
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def convert_atlas(sources, outdir, name, settings=None, links=None):
+    # Mehrere Animationen in eine Atlas-Textur packen (Größe = Obergrenze, Zweierpotenz)
+    settings = merge_settings(settings)
+    os.makedirs(outdir, exist_ok=True)
+    timings = {}
+    start = time.perf_counter()
+    animations = atlas.load_animations(sources)
+    timings['load'] = time.perf_counter() - start
+    start = time.perf_counter()
+    packed = atlas.pack(animations, core.effect_settings(**settings['effects']), settings['bg_color'],
+                        settings['width'], settings['height'], settings['borderless'])
+    timings['compose'] = time.perf_counter() - start
+    start = time.perf_counter()
+    result = atlas.save_atlas(packed, outdir, name, settings['framerate'], settings['export_format'], links)
+    timings['encode'] = time.perf_counter() - start
+    result.update({'frames': sum(e['length'] for e in packed['entries']), 'grid': packed['grid'],
+                   'size': packed['image'].size, 'entries': packed['entries'], 'timings': timings})
+    return result
+
+
+def parse_assignments(values):
+    # "--set blur=1 --set blur_value=2.5" -> {'blur': 1, 'blur_value': 2.5}
+    parsed = {}
+    for value in values or []:
+        key, sep, raw = value.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Erwartet SCHLÜSSEL=WERT: {value}")
+        try:
+            parsed[key] = float(raw) if "." in raw else int(raw)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Ungültiger Wert: {value}")
+    return parsed
+
+
+def add_settings_arguments(parser):
+    # Umwandlungsoptionen, gemeinsam mit watch.py
+    parser.add_argument("-o", "--outdir", default=".")
+    parser.add_argument("--size", nargs=2, type=int, metavar=("BREITE", "HÖHE"), default=(2048, 2048))
+    parser.add_argument("--format", choices=["PNG", "JPG", "BMP"], default="PNG")
+    parser.add_argument("--sizes", nargs="+", type=int, metavar="BREITE", default=[],
+                        help="Texturvarianten, z.B. 2048 1024 512 (Dateien name_BREITE;X;Y;speed;0)")
+    parser.add_argument("--framerate", type=int, default=10, help="ms/Bild wie in der GUI")
+    parser.add_argument("--bg", default="#00000000", help="Hintergrundfarbe")
+    parser.add_argument("--borderless", action="store_true")
+    parser.add_argument("--set", action="append", metavar="EFFEKT=WERT", help="Textur-Effekt, z.B. grayscale=1")
+    parser.add_argument("--gif", action="store_true", help="zusätzlich GIF speichern")
+    parser.add_argument("--no-lsl", action="store_true", help="kein LSL-Skript schreiben")
+    parser.add_argument("--split-static", action="store_true",
+                        help="zusätzlich Hintergrund + Sheet nur des bewegten Ausschnitts + Zwei-Prim-Skript")
+    parser.add_argument("--frame-store", choices=["auto", "memory", "memmap"], default="auto",
+                        help="Einzelbilder im RAM oder in einer Auslagerungsdatei (auto: nach OSSL2GIF_MEMORY_BUDGET)")
+    return parser
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="OSSL2Gif ohne GUI: GIF in Textur und LSL-Skript umwandeln")
+    parser.add_argument("inputs", nargs="+", help="GIF-, animierte WebP- oder APNG-Dateien")
+    add_settings_arguments(parser)
+    parser.add_argument("--controller", action="store_true",
+                        help="ein Linkset-Controller-Skript statt eines Skripts je Prim")
+    parser.add_argument("--links", metavar="LINKS.json",
+                        help="Zuordnung Name -> Link/Fläche für --controller und --atlas")
+    parser.add_argument("--atlas", metavar="NAME", help="alle Eingaben in eine Atlas-Textur NAME packen (--size = Obergrenze)")
+    return parser
+
+
+def settings_from_args(args):
+    return merge_settings({
+        'width': args.size[0],
+        'height': args.size[1],
+        'export_format': args.format,
+        'framerate': args.framerate,
+        'bg_color': args.bg,
+        'borderless': int(args.borderless),
+        'effects': parse_assignments(args.set),
+        'gif': int(args.gif),
+        'lsl': int(not args.no_lsl),
+        'split_static': int(args.split_static),
+        'frame_store': args.frame_store,
+        'sizes': args.sizes,
+    })
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        settings = settings_from_args(args)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    links = load_links(args.links)
+    if args.controller:
+        settings['lsl'] = 0
+    if args.atlas:
+        try:
+            result = convert_atlas(args.inputs, args.outdir, args.atlas, settings, links)
+        except Exception as e:
+            print(f"Fehler: {args.atlas}: {e}", file=sys.stderr)
+            return 1
+        total = sum(result['timings'].values())
+        print(f"{result['texture']} ({len(result['entries'])} Animationen, {result['frames']} Bilder, "
+              f"{result['size'][0]}x{result['size'][1]}, {total * 1000:.0f} ms)")
+        return 0
+    status = 0
+    results = []
+    for source in args.inputs:
+        try:
+            result = convert_file(source, args.outdir, settings)
+        except Exception as e:
+            print(f"Fehler: {source}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        results.append(result)
+        total = sum(result['timings'].values())
+        print(f"{result['texture']} ({result['frames']} Bilder, {total * 1000:.0f} ms)")
+    if args.controller and results:
+        print(write_controller(results, args.outdir, links))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,625 @@
+# OSSL2Gif - Render-Kern ohne Tk: GIF laden, Effekte, Sprite-Sheet, Export, LSL
+# Wird von der GUI (main.py) und von kopflosen Werkzeugen (benchmark.py) gemeinsam genutzt.
+
+import math
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageColor
+from profiler import PROFILER
+from lazyimport import lazy_import
+from framestore import FrameStore
+from effects import compile_plan, TILE_CACHE
+from pngstream import PNGStreamWriter
+
+# NumPy wird nur für den Pastell-Effekt gebraucht und erst dann geladen
+np = lazy_import("numpy")
+
+# Effekt-Einstellungen eines Panels (entspricht den Tk-Variablen {prefix}_... in main.py)
+EFFECT_DEFAULTS = {
+    'grayscale': 0,
+    'sharpen': 0,
+    'sharpen_value': 2.5,
+    'blur': 0,
+    'blur_value': 3.5,
+    'transparency': 0,
+    'transparency_value': 0.5,
+    'colorintensity': 0.5,
+    'colorintensity_active': 0,
+}
+
+
+def effect_settings(**overrides):
+    settings = dict(EFFECT_DEFAULTS)
+    settings.update(overrides)
+    return settings
+
+
+def first_frame_index(image):
+    # APNG: ist das Standardbild nicht Teil der Animation, ist es Bild 0 und wird übersprungen
+    return 1 if image.format == "PNG" and image.info.get('default_image') and getattr(image, 'n_frames', 1) > 1 else 0
+
+
+def iter_frames(image):
+    # Einzelbilder erst bei Bedarf dekodieren: (Bild, Verzögerung in ms, 0 = keine Angabe).
+    # GIF, animiertes WebP und APNG setzt Pillow bereits vollständig zusammen (Disposal/Blending);
+    # WebP und APNG behalten dabei den vollen 8-Bit-Alphakanal. Das Bild wird weitergeschaltet,
+    # also vor dem nächsten Schritt verarbeiten oder kopieren.
+    index = first_frame_index(image)
+    while True:
+        try:
+            with PROFILER.stage("decode"):
+                image.seek(index)
+                image.load()
+        except EOFError:
+            return
+        yield image, round(image.info.get('duration') or 0)
+        index += 1
+
+
+def load_frames(source, store=None, backing='memory', scratch_dir=None, durations=None, progress=None):
+    # Alle Einzelbilder (GIF, animiertes WebP, APNG) dekodieren und kompakt ablegen
+    # (Palettenindizes, bei mehr als 256 Farben RGBA); liefert (geöffnetes Bild, FrameStore,
+    # Verzögerungen in ms). backing='memmap' legt die Bilder in einer Auslagerungsdatei ab.
+    # Texturen nach dem Schema name;X;Y;speed werden wieder in Einzelbilder zerlegt.
+    # Mit store/durations vom Aufrufer kann ein anderer Thread schon während des Dekodierens
+    # lesen (erst das Bild, dann seine Verzögerung); progress(fertig, gesamt) nach jedem Bild
+    image = Image.open(source)
+    try:
+        return _load_frames(image, source, store, backing, scratch_dir, [] if durations is None else durations, progress)
+    except BaseException:
+        # Abbruch (Cancelled) oder Fehler: die Datei nicht geöffnet lassen (unter Windows gesperrt)
+        image.close()
+        raise
+
+
+def _load_frames(image, source, store, backing, scratch_dir, durations, progress):
+    layout = parse_texture_filename(source) if isinstance(source, str) else None
+    if layout is not None and getattr(image, 'n_frames', 1) == 1:
+        image, frames, sheet_durations = load_sheet(image, layout[1], layout[2], layout[3], store, backing, scratch_dir)
+        durations.extend(sheet_durations)
+        if progress is not None:
+            progress(len(durations), len(durations))
+        return image, frames, durations
+    frames = FrameStore(backing, scratch_dir) if store is None else store
+    total = getattr(image, 'n_frames', 1) - first_frame_index(image)
+    frames.reserve(total, image.size)
+    for frame, duration in iter_frames(image):
+        with PROFILER.stage("decode") as st:
+            frames.append(frame)
+            st.add_bytes(frame.width * frame.height)
+        durations.append(duration)
+        if progress is not None:
+            progress(len(durations), total)
+    frames.shrink_to_fit()
+    return image, frames, durations
+
+
+def parse_texture_filename(path):
+    # "name;X;Y;speed;0.ext" (texture_filename) -> (name, X, Y, speed); None bei anderen Namen
+    match = re.fullmatch(r"(.*?);(\d+);(\d+);(\d+(?:[.,]\d+)?)(?:;\d+)?", os.path.splitext(os.path.basename(path))[0])
+    if match is None or not int(match.group(2)) or not int(match.group(3)):
+        return None
+    return match.group(1), int(match.group(2)), int(match.group(3)), float(match.group(4).replace(',', '.'))
+
+
+def sheet_tiles(sheet, tiles_x, tiles_y):
+    # Alle Kacheln als eine NumPy-Ansicht (Zeilen, Spalten, h, w, Kanäle), ohne Kopie
+    tile_h = sheet.shape[0] // tiles_y
+    tile_w = sheet.shape[1] // tiles_x
+    grid = sheet[:tiles_y * tile_h, :tiles_x * tile_w]
+    return grid.reshape(tiles_y, tile_h, tiles_x, tile_w, -1).swapaxes(1, 2)
+
+
+def load_sheet(image, tiles_x, tiles_y, speed_val=10, store=None, backing='memory', scratch_dir=None):
+    # Sprite-Sheet wieder in Einzelbilder zerlegen: das Sheet wird einmal als RGBA dekodiert,
+    # die Bilder sind Ansichten darauf. Voll transparente Kacheln am Ende (unvollständige
+    # letzte Zeile) zählen nicht mit. Verzögerung = speed aus dem Dateinamen (ms/Bild wie GIF speichern)
+    with PROFILER.stage("decode") as st:
+        sheet = np.asarray(image.convert("RGBA"))
+        st.add_bytes(sheet.nbytes)
+    tile_w = sheet.shape[1] // tiles_x
+    tile_h = sheet.shape[0] // tiles_y
+    if not tile_w or not tile_h:
+        raise ValueError(f"Raster {tiles_x}x{tiles_y} passt nicht zur Texturgröße {image.width}x{image.height}")
+    with PROFILER.stage("slice"):
+        # Sichtbarkeit je Kachel in einem Schritt über die Ansicht aller Kacheln
+        visible = sheet_tiles(sheet, tiles_x, tiles_y)[..., 3].any(axis=(2, 3)).reshape(-1)
+        count = int(np.flatnonzero(visible)[-1]) + 1 if visible.any() else 1
+        frames = FrameStore(backing, scratch_dir) if store is None else store
+        frames.append_tiles(sheet, (tile_w, tile_h), count)
+    return image, frames, [max(1, round(speed_val))] * count
+
+
+def grid_size(frame_count):
+    # Kachelraster (Spalten, Zeilen) für frame_count Bilder
+    tiles_x = math.ceil(math.sqrt(frame_count))
+    tiles_y = math.ceil(frame_count / tiles_x)
+    return tiles_x, tiles_y
+
+
+def parse_color(color):
+    try:
+        return ImageColor.getcolor(color, "RGBA")
+    except Exception:
+        return (0, 0, 0, 0)
+
+
+def apply_effects(img, effects):
+    # Effekte über den einmal je Einstellung übersetzten Plan (effects.compile_plan)
+    return compile_plan(effects)(img)
+
+
+def compose_sheet(frames, tex_w, tex_h, effects, bg_color="#00000000", borderless=False, box=None, quality='final',
+                  progress=None):
+    # Alle Einzelbilder als Kacheln in ein tex_w x tex_h Sprite-Sheet setzen;
+    # box: fester Ausschnitt jedes Bildes (sonst bei Randlos der sichtbare Bereich);
+    # quality: Resampling-Stufe (QUALITIES), Vorschauen schneller als der Export;
+    # progress(fertig, gesamt) nach jeder Kachel
+    tiles_x, tiles_y = grid_size(len(frames))
+    # Kachelgröße berechnen, damit alle Tiles in tex_w x tex_h passen
+    tile_w = tex_w // tiles_x
+    tile_h = tex_h // tiles_y
+    box = box or trim_box(frames, borderless)
+    with PROFILER.stage("sheet") as st:
+        sheet = Image.new("RGBA", (tex_w, tex_h), parse_color(bg_color))
+        st.add_image(sheet)
+    for idx in range(len(frames)):
+        tx = idx % tiles_x
+        ty = idx // tiles_x
+        f = render_frame_tile(frames, idx, tile_w, tile_h, effects, box, quality)
+        x = tx * tile_w
+        y = ty * tile_h
+        with PROFILER.stage("paste"):
+            sheet.paste(f, (x, y))
+        if progress is not None:
+            progress(idx + 1, len(frames))
+    return sheet
+
+
+def union_bbox(frames):
+    # Gemeinsamer Rahmen der sichtbaren Pixel aller Bilder (FrameStore vektorisiert)
+    if hasattr(frames, 'union_bbox'):
+        return frames.union_bbox()
+    box = None
+    for frame in frames:
+        if frame.size != frames[0].size:
+            return None
+        b = frame.getbbox()
+        if b:
+            box = b if box is None else (min(box[0], b[0]), min(box[1], b[1]), max(box[2], b[2]), max(box[3], b[3]))
+    return box
+
+
+def trim_box(frames, borderless):
+    # Randlos: jedes Bild vor dem Layout auf den gemeinsamen sichtbaren Rahmen zuschneiden,
+    # damit die Kacheln den Inhalt statt transparenter Ränder enthalten
+    if not borderless or not frames:
+        return None
+    with PROFILER.stage("trim"):
+        return union_bbox(frames)
+
+
+def change_bbox(frames):
+    # Rahmen der Pixel, die sich gegenüber dem ersten Bild ändern (FrameStore vektorisiert)
+    if hasattr(frames, 'change_bbox'):
+        return frames.change_bbox()
+    if len(frames) < 2:
+        return None
+    ref = np.array(frames[0].convert("RGBA"))
+    ref[ref[..., 3] == 0] = 0
+    rows = np.zeros(ref.shape[0], dtype=bool)
+    cols = np.zeros(ref.shape[1], dtype=bool)
+    for frame in frames[1:]:
+        if frame.size != frames[0].size:
+            return (0, 0) + frames[0].size
+        rgba = np.array(frame.convert("RGBA"))
+        rgba[rgba[..., 3] == 0] = 0
+        diff = (rgba != ref).any(axis=2)
+        rows |= diff.any(axis=1)
+        cols |= diff.any(axis=0)
+    if not rows.any():
+        return None
+    ys = np.flatnonzero(rows)
+    xs = np.flatnonzero(cols)
+    return int(xs[0]), int(ys[0]), int(xs[-1]) + 1, int(ys[-1]) + 1
+
+
+def power_of_two(value):
+    # Kleinste Zweierpotenz >= value (Texturgrößen für Second Life/OpenSim)
+    return 1 << max(0, (int(value) - 1).bit_length())
+
+
+def split_static(frames, tex_w, tex_h, effects, bg_color="#00000000", progress=None):
+    # Statischer Hintergrund (erstes Bild) + Sprite-Sheet nur des veränderlichen Ausschnitts.
+    # Beide Texturen so klein wie möglich (Zweierpotenz, höchstens tex_w x tex_h).
+    # progress(fertig, gesamt) je Kachel des Ausschnitt-Sheets
+    with PROFILER.stage("diff"):
+        region = change_bbox(frames)
+    frame_w, frame_h = frames[0].size
+    base = compose_sheet(frames[:1], min(tex_w, power_of_two(frame_w)), min(tex_h, power_of_two(frame_h)), effects, bg_color)
+    result = {'base': base, 'sheet': None, 'region': region, 'frame_size': (frame_w, frame_h), 'tiles': None}
+    if region is None:
+        return result
+    tiles_x, tiles_y = grid_size(len(frames))
+    region_w = region[2] - region[0]
+    region_h = region[3] - region[1]
+    sheet_w = min(tex_w, power_of_two(tiles_x * region_w))
+    sheet_h = min(tex_h, power_of_two(tiles_y * region_h))
+    result['sheet'] = compose_sheet(frames, sheet_w, sheet_h, effects, bg_color, box=region, progress=progress)
+    result['tiles'] = (tiles_x, tiles_y)
+    return result
+
+
+def save_static_split(split, outdir, name, speed_val, fmt, lsl_speed=10.0):
+    # Hintergrund (name_base), Ausschnitt-Sheet (name_anim;X;Y;speed) und Zwei-Prim-Skript schreiben
+    ext = fmt.lower()
+    base_name = f"{name}_base"
+    anim_name = f"{name}_anim"
+    paths = {'base': os.path.join(outdir, f"{base_name}.{ext}")}
+    save_texture(split['base'], paths['base'], fmt)
+    if split['sheet'] is None:
+        return paths
+    tiles_x, tiles_y = split['tiles']
+    paths['sheet'] = os.path.join(outdir, texture_filename(anim_name, tiles_x, tiles_y, speed_val, ext))
+    save_texture(split['sheet'], paths['sheet'], fmt)
+    paths['lsl'] = os.path.join(outdir, f"{name}_static.lsl")
+    with open(paths['lsl'], "w", encoding="utf-8") as f:
+        f.write(generate_lsl_static_script(anim_name, base_name, tiles_x, tiles_y, lsl_speed, split['region'], split['frame_size']))
+    return paths
+
+
+# Resampling-Stufen: Vorschauen wählen schnell, Exporte immer 'final'
+#   draft     NEAREST (Scrubbing, Abspielen); liest nur die Zielpixel und ist damit auch
+#             schneller als reduce(), das jedes Quellpixel mittelt
+#   balanced  BOX-Vorverkleinerung (reduce) um ganze Faktoren, danach BILINEAR
+#   final     LANCZOS über das ganze Bild
+QUALITIES = ('draft', 'balanced', 'final')
+# Pillow verkleinert bei reducing_gap zuerst per reduce() auf höchstens das Doppelte der Zielgröße
+BALANCED_REDUCING_GAP = 2.0
+
+
+def resize(img, size, quality='final', box=None):
+    if quality == 'final':
+        return img.resize(size, Image.Resampling.LANCZOS, box=box)
+    if quality == 'balanced':
+        return img.resize(size, Image.Resampling.BILINEAR, box=box, reducing_gap=BALANCED_REDUCING_GAP)
+    if quality != 'draft':
+        raise ValueError(f"Unbekannte Qualitätsstufe: {quality}")
+    return img.resize(size, Image.Resampling.NEAREST, box=box)
+
+
+def render_tile(frame, tile_w, tile_h, effects, box=None, quality='final'):
+    # box: Ausschnitt des Bildes (Randlos), wird ohne Zwischenkopie mitskaliert
+    with PROFILER.stage("resize") as st:
+        f = resize(frame, (tile_w, tile_h), quality, box)
+        st.add_image(f)
+    with PROFILER.stage("effects") as st:
+        f = apply_effects(f, effects)
+        st.add_image(f)
+    return f
+
+
+def render_frame_tile(frames, idx, tile_w, tile_h, effects, box=None, quality='final'):
+    # render_tile mit Kachel-Cache: Bilder mit fester Kennung (Timeline.frame_key) werden je
+    # Größe, Ausschnitt, Qualität und Effekt-Plan nur einmal verarbeitet; GIF- und
+    # Textur-Panel mit gleicher Wirkung teilen sich das Ergebnis
+    key = frames.frame_key(idx) if hasattr(frames, 'frame_key') else None
+    if key is None:
+        return render_tile(frames[idx], tile_w, tile_h, effects, box, quality)
+    cache_key = (key, tile_w, tile_h, box, quality, compile_plan(effects).key)
+    tile = TILE_CACHE.get(cache_key)
+    if tile is None:
+        tile = render_tile(frames[idx], tile_w, tile_h, effects, box, quality)
+        TILE_CACHE.put(cache_key, tile)
+    return tile
+
+
+def compose_sheet_strips(frames, tex_w, tex_h, effects, bg_color="#00000000", borderless=False, progress=None):
+    # Wie compose_sheet, aber Kachelreihe für Kachelreihe als Streifen tex_w x tile_h;
+    # der Rest unter der letzten Reihe kommt als Hintergrundstreifen
+    tiles_x, tiles_y = grid_size(len(frames))
+    tile_w = tex_w // tiles_x
+    tile_h = tex_h // tiles_y
+    box = trim_box(frames, borderless)
+    background = parse_color(bg_color)
+    for ty in range(tiles_y):
+        with PROFILER.stage("sheet") as st:
+            strip = Image.new("RGBA", (tex_w, tile_h), background)
+            st.add_image(strip)
+        for idx in range(ty * tiles_x, min(len(frames), (ty + 1) * tiles_x)):
+            f = render_frame_tile(frames, idx, tile_w, tile_h, effects, box)
+            with PROFILER.stage("paste"):
+                strip.paste(f, ((idx % tiles_x) * tile_w, 0))
+            if progress is not None:
+                progress(idx + 1, len(frames))
+        yield strip
+    if tex_h > tiles_y * tile_h:
+        yield Image.new("RGBA", (tex_w, tex_h - tiles_y * tile_h), background)
+
+
+# Ab dieser Sheet-Größe (Pixel) exportieren kopflose Werkzeuge streifenweise
+STREAM_MIN_PIXELS = 4096 * 4096
+
+
+def can_stream_texture(fmt):
+    # Streifenweise nur als PNG
+    return export_format(fmt) == "PNG"
+
+
+def save_texture_streaming(frames, file, tex_w, tex_h, effects, bg_color="#00000000", borderless=False, progress=None):
+    # Sprite-Sheet Reihe für Reihe rendern und direkt kodieren: im Speicher liegt nur ein
+    # Kachelstreifen. Pixelgleich mit compose_sheet + save_texture (PNG), nicht bytegleich.
+    with PNGStreamWriter(file, tex_w, tex_h, "RGBA") as writer:
+        for strip in compose_sheet_strips(frames, tex_w, tex_h, effects, bg_color, borderless, progress):
+            with PROFILER.stage("encode") as st:
+                writer.write(strip)
+                st.add_image(strip)
+
+
+def render_gif_frames(frames, width, height, effects, quality='final', progress=None):
+    result = []
+    for f in frames:
+        with PROFILER.stage("resize") as st:
+            f = resize(f, (width, height), quality)
+            st.add_image(f)
+        with PROFILER.stage("effects") as st:
+            f = apply_effects(f, effects)
+            st.add_image(f)
+        result.append(f)
+        if progress is not None:
+            progress(len(result), len(frames))
+    return result
+
+
+def save_gif(frames, file, width, height, effects, duration, progress=None):
+    # Animiertes GIF mit Pillow speichern; file kann Pfad oder Dateiobjekt sein;
+    # progress(fertig, gesamt) je bearbeitetem Bild, die Kodierung am Ende ist ein Schritt
+    frames = render_gif_frames(frames, width, height, effects, progress=progress)
+    with PROFILER.stage("encode"):
+        frames[0].save(file, format="GIF", save_all=True, append_images=frames[1:], loop=0, duration=duration)
+
+
+def export_format(fmt):
+    # Combobox-Wert (PNG/JPG/BMP) in Pillow-Formatnamen übersetzen
+    fmt = fmt.upper()
+    return "JPEG" if fmt == "JPG" else fmt
+
+
+def save_texture(img, file, fmt):
+    fmt = export_format(fmt)
+    if fmt == "JPEG":
+        img = img.convert("RGB")
+    with PROFILER.stage("encode"):
+        img.save(file, format=fmt)
+
+
+def sheet_pyramid(sheet, widths):
+    # Größtes Sheet einmal aufbauen, kleinere Varianten durch fortgesetztes Halbieren (LANCZOS)
+    # ableiten statt Kacheln und Effekte je Größe neu zu rechnen; Seitenverhältnis bleibt.
+    # Liefert {Breite: Bild}, Breiten größer als das Sheet werden ausgelassen
+    levels = {}
+    current = sheet
+    for width in sorted(set(widths), reverse=True):
+        if width > sheet.width:
+            continue
+        target = (width, max(1, round(sheet.height * width / sheet.width)))
+        with PROFILER.stage("pyramid") as st:
+            while current.width // 2 >= target[0] and current.height // 2 >= target[1]:
+                current = current.resize((current.width // 2, current.height // 2), Image.Resampling.LANCZOS)
+            level = current if current.size == target else current.resize(target, Image.Resampling.LANCZOS)
+            st.add_image(level)
+        levels[width] = level
+    return levels
+
+
+def save_texture_variants(levels, outdir, name, tiles_x, tiles_y, speed_val, fmt, workers=None):
+    # Alle Varianten parallel kodieren (Pillow gibt beim Kodieren den GIL frei);
+    # Dateinamen name_BREITE;X;Y;speed;0.ext, das LSL-Namensschema bleibt erhalten
+    ext = fmt.lower()
+    paths = {width: os.path.join(outdir, texture_filename(f"{name}_{width}", tiles_x, tiles_y, speed_val, ext)) for width in levels}
+    with ThreadPoolExecutor(max_workers=workers or min(len(levels), os.cpu_count() or 1) or 1) as pool:
+        for future in [pool.submit(save_texture, levels[width], paths[width], fmt) for width in levels]:
+            future.result()
+    return paths
+
+
+def texture_basename(source_filename):
+    if not source_filename:
+        return "texture"
+    # Importierte Textur: Raster und Geschwindigkeit nicht doppelt anhängen
+    layout = parse_texture_filename(source_filename)
+    if layout is not None:
+        return layout[0]
+    return os.path.splitext(os.path.basename(source_filename))[0]
+
+
+def texture_filename(name, tiles_x, tiles_y, speed_val, ext):
+    # Namensschema name;X;Y;speed, das das LSL-Skript per llParseString2List auswertet
+    return f"{name};{tiles_x};{tiles_y};{speed_val};0.{ext}"
+
+
+def generate_lsl_static_script(name, base_name, tiles_x, tiles_y, speed, region, frame_size):
+    # Zwei Prims: Root zeigt den Hintergrund, Kind-Prim (Link 2) liegt passend skaliert über
+    # dem veränderlichen Ausschnitt und spielt das kleine Sheet per llSetLinkTextureAnim ab
+    frame_w, frame_h = frame_size
+    left, top, right, bottom = region
+    return f'''// LSL Texture Animation Script (statischer Hintergrund + animierter Ausschnitt)
+// Generated by OSSL2Gif
+// Hintergrund: {base_name}
+// Texture: {name};{tiles_x};{tiles_y};{speed}
+// Aufbau: Root-Prim = flache Box (z.B. <1.0, 0.01, 1.0>), angezeigt wird Seite 1 (-Y).
+// Eine zweite Box als Kind-Prim (Link 2) verlinken; Größe und Position setzt das Skript.
+
+integer face = 1;
+integer child = 2;
+integer sideX = {tiles_x};
+integer sideY = {tiles_y};
+float speed = {speed};
+// Ausschnitt relativ zum Bild (0..1): links, oben, Breite, Höhe
+float regionX = {left / frame_w:.6f};
+float regionY = {top / frame_h:.6f};
+float regionW = {(right - left) / frame_w:.6f};
+float regionH = {(bottom - top) / frame_h:.6f};
+// Abstand des Kind-Prims vor der Hintergrundfläche
+float gap = 0.002;
+string base = "{base_name}";
+string sheet = "";
+
+layout() {{
+    vector size = llGetScale();
+    vector childSize = <size.x * regionW, size.y, size.z * regionH>;
+    vector childPos = <(regionX + regionW / 2.0 - 0.5) * size.x, -gap, (0.5 - regionY - regionH / 2.0) * size.z>;
+    llSetLinkPrimitiveParamsFast(child, [PRIM_POS_LOCAL, childPos, PRIM_SIZE, childSize]);
+}}
+
+fetch() {{
+    integer i;
+    integer count = llGetInventoryNumber(INVENTORY_TEXTURE);
+    for (i = 0; i < count; i++) {{
+        string texture = llGetInventoryName(INVENTORY_TEXTURE, i);
+        // name;X;Y;speed ist das Sheet, alles andere der Hintergrund
+        list data = llParseString2List(texture, [";"], []);
+        if (llGetListLength(data) > 3) {{
+            sheet = texture;
+            sideX = (integer)llList2String(data, 1);
+            sideY = (integer)llList2String(data, 2);
+            speed = (float)llList2String(data, 3);
+        }}
+        else {{
+            base = texture;
+        }}
+    }}
+    llSetTexture(base, face);
+    if (sheet != "") {{
+        llSetLinkTexture(child, sheet, face);
+        llSetLinkTextureAnim(child, ANIM_ON | LOOP, face, sideX, sideY, 0.0, (float)(sideX * sideY), speed);
+    }}
+}}
+
+default
+{{
+    state_entry()
+    {{
+        layout();
+        fetch();
+    }}
+    changed(integer what)
+    {{
+        if (what & (CHANGED_INVENTORY | CHANGED_LINK))
+        {{
+            fetch();
+        }}
+        if (what & (CHANGED_SCALE | CHANGED_LINK))
+        {{
+            layout();
+        }}
+    }}
+}}
+'''
+
+
+# LSL-Konstante ALL_SIDES (alle Flächen einer Prim)
+ALL_SIDES = -1
+
+
+def animation_fps(durations, default=10.0):
+    # Mittlere GIF-Verzögerung in Bilder/s (Standard, wenn das GIF keine Angaben hat)
+    durations = [d for d in durations if d]
+    if not durations:
+        return default
+    return round(1000.0 / (sum(durations) / len(durations)), 2)
+
+
+def controller_links(names, mapping=None):
+    # Verknüpfungstabelle: [(Name, Link, Fläche)]; mapping = {Name: {"link": 2, "face": 1}} oder
+    # eine Liste solcher Angaben. Nicht zugeordnete Namen bekommen fortlaufend freie Links ab 2
+    mapping = mapping or {}
+    used = set()
+    for targets in mapping.values():
+        for target in targets if isinstance(targets, list) else [targets]:
+            used.add(int(target['link']))
+    links = []
+    next_link = 2
+    for name in names:
+        targets = mapping.get(name)
+        if targets is None:
+            while next_link in used:
+                next_link += 1
+            used.add(next_link)
+            targets = [{'link': next_link}]
+        for target in targets if isinstance(targets, list) else [targets]:
+            face = target.get('face', 'all')
+            links.append((name, int(target['link']), ALL_SIDES if face in ('all', None) else int(face)))
+    return links
+
+
+def generate_lsl_controller_script(entries):
+    # Ein Skript in der Root-Prim für alle animierten Flächen des Linksets.
+    # entries: [{'link', 'face', 'texture', 'tiles_x', 'tiles_y', 'start', 'length', 'fps'}]
+    rows = []
+    for e in entries:
+        face = "ALL_SIDES" if e['face'] == ALL_SIDES else e['face']
+        rows.append(f'{e["link"]}, {face}, "{e["texture"]}", {e["tiles_x"]}, {e["tiles_y"]}, {e["start"]}, {e["length"]}, {float(e["fps"])}')
+    table = ",\n    ".join(rows)
+    return f'''// LSL Linkset Controller Script
+// Generated by OSSL2Gif
+// Ein Skript in der Root-Prim steuert alle animierten Flächen des Linksets; die einzelnen
+// Prims brauchen kein eigenes Skript. Die Texturen liegen im Inventar der Root-Prim
+// (oder UUIDs in die Tabelle eintragen). Texturanimationen sind Prim-Eigenschaften und
+// laufen weiter, auch wenn dieses Skript nach dem Start gelöscht wird.
+
+// Link, Fläche, Textur, Spalten, Zeilen, Startzelle, Länge, Bilder/s
+list faces = [
+    {table}
+];
+integer STRIDE = 8;
+
+apply() {{
+    list params = [];
+    integer count = llGetListLength(faces);
+    integer i;
+    for (i = 0; i < count; i += STRIDE) {{
+        integer link = llList2Integer(faces, i);
+        integer face = llList2Integer(faces, i + 1);
+        integer sideX = llList2Integer(faces, i + 3);
+        integer sideY = llList2Integer(faces, i + 4);
+        integer start = llList2Integer(faces, i + 5);
+        // Wiederholung/Versatz der Startzelle, bis die Animation läuft
+        float u = ((float)(start % sideX) + 0.5) / sideX - 0.5;
+        float v = 0.5 - ((float)(start / sideX) + 0.5) / sideY;
+        params += [PRIM_LINK_TARGET, link, PRIM_TEXTURE, face, llList2String(faces, i + 2),
+                   <1.0 / sideX, 1.0 / sideY, 0.0>, <u, v, 0.0>, 0.0];
+    }}
+    llSetLinkPrimitiveParamsFast(LINK_ROOT, params);
+    for (i = 0; i < count; i += STRIDE) {{
+        llSetLinkTextureAnim(llList2Integer(faces, i), ANIM_ON | LOOP, llList2Integer(faces, i + 1),
+                             llList2Integer(faces, i + 3), llList2Integer(faces, i + 4),
+                             llList2Float(faces, i + 5), llList2Float(faces, i + 6), llList2Float(faces, i + 7));
+    }}
+}}
+
+default
+{{
+    state_entry()
+    {{
+        apply();
+    }}
+    on_rez(integer param)
+    {{
+        apply();
+    }}
+    changed(integer what)
+    {{
+        if (what & (CHANGED_INVENTORY | CHANGED_LINK))
+        {{
+            apply();
+        }}
+    }}
+}}
+'''
+
+
+def generate_lsl_script(name, tiles_x, tiles_y, speed):
+    length = tiles_x * tiles_y
+    return f'''// LSL Texture Animation Script\n// Generated by OSSL2Gif\n// Texture: {name};{tiles_x};{tiles_y};{speed}\n\ninteger animOn = TRUE;\nlist effects = [LOOP];\ninteger movement = 0;\ninteger face = ALL_SIDES;\ninteger sideX = {tiles_x};\ninteger sideY = {tiles_y};\nfloat start = 0.0;\nfloat length = {length};\nfloat speed = {speed};\n\ninitAnim() {{\n    if(animOn) {{\n        integer effectBits;\n        integer i;\n        for(i = 0; i < llGetListLength(effects); i++) {{\n            effectBits = (effectBits | llList2Integer(effects,i));\n        }}\n        integer params = (effectBits|movement);\n        llSetTextureAnim(ANIM_ON|params,face,sideX,sideY,start,length,speed);\n    }}\n    else {{\n        llSetTextureAnim(0,face,sideX,sideY,start,length,speed);\n    }}\n}}\n\nfetch() {{\n     string texture = llGetInventoryName(INVENTORY_TEXTURE,0);\n            llSetTexture(texture,face);\n            // llParseString2List braucht als Trennzeichen eine Liste!\n            list data  = llParseString2List(texture,[";"],[]);\n            string X = llList2String(data,1);\n            string Y = llList2String(data,2);\n            string Z = llList2String(data,3);\n            sideX = (integer) X;\n            sideY = (integer) Y;\n            speed = (float) Z;\n            length = (float)(sideX * sideY);\n            if (speed) \n                initAnim();\n}}\n\ndefault\n{{\n    state_entry()\n    {{\n        llSetTextureAnim(FALSE, face, 0, 0, 0.0, 0.0, 1.0);\n        fetch();\n    }}\n    changed(integer what)\n    {{\n        if (what & CHANGED_INVENTORY)\n        {{\n            fetch();\n        }}\n    }}\n}}\n'''
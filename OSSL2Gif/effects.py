@@ -0,0 +1,140 @@
+# OSSL2Gif - Effekt-Plan und Kachel-Cache
+# Die Effekt-Einstellungen eines Panels werden einmal je Änderung in einen Plan übersetzt:
+# eine geordnete Schrittfolge ohne wirkungslose Schritte (Schärfe 1.0, Radius 0, Transparenz 1.0,
+# neutrale Farbintensität). Reine Pixelabbildungen (Transparenz auf Alpha, Pastell auf RGB)
+# werden zu einer Tabelle zusammengefasst und in einem Durchgang (Image.point) angewendet.
+# Der Schlüssel eines Plans hängt nur von seinen Schritten ab: Panels mit gleicher Wirkung
+# teilen sich über den Kachel-Cache dieselben verarbeiteten Bilder.
+# Ergebnis ist pixelgleich mit der früheren festen Effektkette.
+
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageEnhance, ImageFilter
+
+# Obergrenze des Kachel-Caches in Byte (verarbeitete RGBA-Bilder)
+TILE_CACHE_BYTES = 64 * 1024 * 1024
+IDENTITY = tuple(range(256))
+
+
+class EffectPlan:
+    def __init__(self, grayscale, steps):
+        self.grayscale = grayscale
+        # (Name, Parameter) in Ausführungsreihenfolge
+        self.steps = tuple(steps)
+        self.key = hashlib.sha1(repr((grayscale, self.steps)).encode("ascii")).hexdigest()[:16]
+
+    @property
+    def identity(self):
+        # Nur Umwandlung nach RGBA
+        return not self.grayscale and not self.steps
+
+    def __call__(self, img):
+        # Graustufen verwerfen den Alphakanal (wie bisher), sonst nur nach RGBA wandeln
+        if self.grayscale:
+            img = img.convert("L").convert("RGBA")
+        elif img.mode != "RGBA":
+            img = img.convert("RGBA")
+        for name, param in self.steps:
+            img = STEPS[name](img, param)
+        return img
+
+
+def _sharpen(img, factor):
+    return ImageEnhance.Sharpness(img).enhance(factor)
+
+
+def _blur(img, radius):
+    return img.filter(ImageFilter.GaussianBlur(radius))
+
+
+def _point(img, table):
+    # Je Kanal 256 Einträge (R, G, B, A) in einem Durchgang
+    return img.point(table)
+
+
+def _color(img, factor):
+    return ImageEnhance.Color(img).enhance(factor)
+
+
+STEPS = {'sharpen': _sharpen, 'blur': _blur, 'point': _point, 'color': _color}
+
+
+def _settings_key(effects):
+    return tuple(sorted(effects.items()))
+
+
+def compile_plan(effects):
+    return _compile(_settings_key(effects))
+
+
+@functools.lru_cache(maxsize=64)
+def _compile(key):
+    effects = dict(key)
+    steps = []
+    if effects['sharpen'] and effects['sharpen_value'] != 1.0:
+        steps.append(('sharpen', effects['sharpen_value']))
+    if effects['blur'] and effects['blur_value'] > 0:
+        steps.append(('blur', effects['blur_value']))
+    # Transparenz (Alpha) und Pastell (RGB) sind Tabellen je Kanal und lassen sich zusammenfassen
+    rgb = alpha = IDENTITY
+    if effects['transparency']:
+        value = effects['transparency_value']
+        # value: 0.0 (voll transparent) bis 1.0 (keine Änderung)
+        alpha = tuple(int(p * value) for p in range(256))
+    colorint = effects['colorintensity'] if effects['colorintensity_active'] else 0.5
+    if colorint < 0.5:
+        # Pastell: zu Weiß interpolieren, abgeschnitten wie die frühere Gleitkomma-Rechnung
+        factor = colorint * 2
+        rgb = tuple(int(min(max(v * factor + 255 * (1 - factor), 0), 255)) for v in range(256))
+    if rgb != IDENTITY or alpha != IDENTITY:
+        steps.append(('point', rgb * 3 + alpha))
+    if colorint > 0.5:
+        # Kräftig: colorint 0.5...1.0 → Faktor 1.0...2.0
+        steps.append(('color', 1.0 + (colorint - 0.5) * 2))
+    return EffectPlan(bool(effects['grayscale']), steps)
+
+
+class TileCache:
+    # LRU-Cache verarbeiteter Bilder, begrenzt auf max_bytes; Bilder nur lesen, nicht verändern
+    def __init__(self, max_bytes=TILE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            img = self._items.get(key)
+            if img is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return img
+
+    def put(self, key, img):
+        size = img.width * img.height * len(img.getbands())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.width * old.height * len(old.getbands())
+            self._items[key] = img
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.nbytes -= evicted.width * evicted.height * len(evicted.getbands())
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+
+TILE_CACHE = TileCache()
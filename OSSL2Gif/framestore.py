@@ -0,0 +1,525 @@
+# OSSL2Gif - Kompakter Einzelbild-Speicher
+# Statt einer Liste voller RGBA-Kopien (4 Byte/Pixel) liegen die Bilder als Palettenindizes
+# (1 Byte/Pixel) in einem zusammenhängenden Puffer; Paletten werden zwischen Bildern geteilt.
+# Erst beim Zugriff (Render-Stufe) wird ein Bild wieder im ursprünglichen Modus erzeugt.
+# Mit backing='memmap' liegen die Puffer in einer NumPy-memmap-Auslagerungsdatei; was im RAM
+# bleibt, entscheidet dann der Seiten-Cache des Betriebssystems (für sehr große Animationen).
+
+import itertools
+import math
+import os
+import tempfile
+
+from PIL import Image
+from lazyimport import lazy_import
+
+np = lazy_import("numpy")
+
+# Speicherart je Bild:
+#   'P'    Palettenbild wie vom Decoder geliefert (Palette + Transparenzindex)
+#   'L'    Graustufen, Indizes = Grauwerte
+#   'RGB'  / 'RGBA'  exakt in <= 256 Farben zerlegt (verlustfrei), beim Zugriff zurückgewandelt
+#   'rawRGB' / 'rawRGBA'  mehr als 256 Farben: unverändert im RGBA-Puffer
+#   'image' andere Größe oder anderer Modus: PIL-Bild unverändert
+#   'view'  Kachel eines importierten Sprite-Sheets: nur Position, die Pixel bleiben im Sheet
+GROWTH = 1.5
+BACKINGS = ('memory', 'memmap')
+# Fortlaufende Kennung je Speicher (Schlüssel für den Kachel-Cache in effects.py)
+_TOKENS = itertools.count(1)
+
+
+class _SlotBuffer:
+    # Zusammenhängender Puffer mit festen Slots (Anzahl x h x w [x Kanäle]), wächst bei Bedarf
+    def __init__(self, store, channels):
+        self.store = store
+        self.channels = channels
+        self.pixels = None
+        self.next_slot = 0
+        self._file = None
+
+    def shape(self, count):
+        w, h = self.store.size
+        return (count, h, w) if self.channels is None else (count, h, w, self.channels)
+
+    def ensure_capacity(self, count):
+        if self.pixels is not None and count <= len(self.pixels):
+            return
+        if self.pixels is not None:
+            count = max(count, int(len(self.pixels) * GROWTH) + 1)
+        shape = self.shape(max(1, count))
+        if self.store.backing == 'memmap':
+            # Datei vergrößern und neu abbilden; vorhandene Daten bleiben in der Datei stehen
+            previous = None
+            if self._file is None:
+                self._file = tempfile.TemporaryFile(prefix="ossl2gif_", suffix=".frames", dir=self.store.scratch_dir)
+                # Puffer aus fremder Abbildung (Projektdatei, nur lesbar) in die eigene Datei übernehmen
+                previous = self.pixels
+            self._file.truncate(math.prod(shape))
+            self.pixels = np.memmap(self._file, dtype=np.uint8, mode='r+', shape=shape)
+            if previous is not None:
+                self.pixels[:len(previous)] = previous
+        else:
+            grown = np.empty(shape, dtype=np.uint8)
+            if self.pixels is not None:
+                grown[:len(self.pixels)] = self.pixels
+            self.pixels = grown
+
+    def alloc(self):
+        # Slots werden nie wiederverwendet: ausgegebene Bilder sind Ansichten auf den Puffer
+        # und würden sonst nachträglich überschrieben
+        slot = self.next_slot
+        self.next_slot += 1
+        self.ensure_capacity(self.next_slot)
+        return slot
+
+    def shrink_to_fit(self):
+        # Die Auslagerungsdatei bleibt stehen, nur der RAM-Puffer wird verkleinert
+        if self.store.backing == 'memory' and self.pixels is not None and self.next_slot < len(self.pixels):
+            self.pixels = self.pixels[:max(1, self.next_slot)].copy()
+
+    def nbytes(self):
+        return 0 if self.pixels is None else self.pixels.nbytes
+
+    def detach(self):
+        # Puffer aus fremder Abbildung (Projektdatei) in eigenen Speicher kopieren; pixels wird
+        # erst gefüllt ausgetauscht, Leser sehen den alten oder den neuen Puffer
+        previous = self.pixels
+        if self.store.backing == 'memmap':
+            self._file = tempfile.TemporaryFile(prefix="ossl2gif_", suffix=".frames", dir=self.store.scratch_dir)
+            self._file.truncate(previous.nbytes)
+            pixels = np.memmap(self._file, dtype=np.uint8, mode='r+', shape=previous.shape)
+            pixels[:] = previous
+        else:
+            pixels = np.array(previous)
+        self.pixels = pixels
+
+    def close(self):
+        self.pixels = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class FrameStore:
+    def __init__(self, backing='memory', scratch_dir=None):
+        if backing not in BACKINGS:
+            raise ValueError(f"Unbekannter Bildspeicher: {backing}")
+        self.backing = backing
+        self.scratch_dir = scratch_dir
+        self.token = next(_TOKENS)
+        self.size = None
+        self._indexed = _SlotBuffer(self, None)
+        self._rgba = _SlotBuffer(self, 4)
+        self._frames = []
+        self._palettes = []
+        self._palette_ids = {}
+        # Importierte Sprite-Sheets (h x w x 4), auf die 'view'-Bilder zeigen, und ihre Auslagerungsdateien
+        self._sources = []
+        self._source_files = []
+        # Abgebildete Dateien, aus denen Puffer, Paletten, Sheets und Sonderbilder direkt lesen (from_state)
+        self._mapped = set()
+        # Zwischengespeicherter Rahmen aller sichtbaren Pixel (union_bbox) als (Bildanzahl, Rahmen),
+        # False = noch offen
+        self._bbox = False
+
+    def __len__(self):
+        return len(self._frames)
+
+    def __bool__(self):
+        return bool(self._frames)
+
+    def __iter__(self):
+        for idx in range(len(self._frames)):
+            yield self[idx]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self._frames)))]
+        return self._expand(self._frames[idx])
+
+    def __delitem__(self, idx):
+        # Nur Abschneiden am Ende wird unterstützt (Max. Bilder)
+        if not isinstance(idx, slice) or idx.step not in (None, 1) or idx.stop not in (None, len(self._frames)):
+            raise TypeError("FrameStore unterstützt nur del store[n:]")
+        self.truncate(idx.indices(len(self._frames))[0])
+
+    def truncate(self, count):
+        # Die Slots der entfernten Bilder bleiben belegt (siehe _SlotBuffer.alloc), bereits
+        # ausgegebene Ansichten darauf behalten ihre Pixel
+        del self._frames[count:]
+        self._bbox = False
+
+    def _buffer(self, kind):
+        if kind in ('P', 'L', 'RGB', 'RGBA'):
+            return self._indexed
+        if kind in ('rawRGB', 'rawRGBA'):
+            return self._rgba
+        return None
+
+    def reserve(self, count, size):
+        # Indexpuffer für count Bilder der Größe size vorab anlegen (z.B. aus Image.n_frames)
+        if self.size is None:
+            self.size = size
+        if size == self.size:
+            self._indexed.ensure_capacity(count)
+
+    def shrink_to_fit(self):
+        self._indexed.shrink_to_fit()
+        self._rgba.shrink_to_fit()
+
+    def close(self):
+        # Puffer und Auslagerungsdateien freigeben; der Speicher ist danach leer
+        self._indexed.close()
+        self._rgba.close()
+        self._frames = []
+        self._sources = []
+        for file in self._source_files:
+            file.close()
+        self._source_files = []
+        self._mapped = set()
+
+    def reads_from(self, path):
+        # Liest der Speicher direkt aus dieser Datei (z.B. dem gerade geöffneten Projekt)?
+        return _filename(path) in self._mapped
+
+    def detach(self):
+        # Alles, was noch aus einer abgebildeten Projektdatei liest, in eigene Puffer kopieren
+        # (Auslagerungsdatei oder RAM wie backing). Danach darf die Datei ersetzt werden, unter
+        # Windows geht das nicht, solange sie abgebildet ist. Jede Zuweisung tauscht ein fertiges
+        # Objekt aus: die GUI kann währenddessen weiterlesen
+        def mapped(array):
+            return isinstance(array, np.memmap) and array.filename is not None and _filename(array.filename) in self._mapped
+        for buffer in (self._indexed, self._rgba):
+            if mapped(buffer.pixels):
+                buffer.detach()
+        self._palettes = [np.array(pal) if mapped(pal) else pal for pal in self._palettes]
+        self._sources = [self._own_sheet(sheet, copy=True) if mapped(sheet) else sheet for sheet in self._sources]
+        # Sonderbilder verraten ihren Speicher nicht: alle kopieren (selten, klein)
+        self._frames = [(kind, slot, data.copy() if kind == 'image' else data, transparency)
+                        for kind, slot, data, transparency in self._frames]
+        self._mapped = set()
+
+    def export_state(self):
+        # Für Projektdateien (project.py): Beschreibung als JSON-fähiges dict und alle Pixel als
+        # Liste zusammenhängender uint8-Arrays (Puffer, Paletten, Sheets, Sonderbilder); die
+        # Beschreibung verweist per Listenindex auf die Arrays
+        arrays = []
+
+        def add(array):
+            arrays.append(np.ascontiguousarray(array, dtype=np.uint8))
+            return len(arrays) - 1
+        buffers = {}
+        for name, buffer in (('indexed', self._indexed), ('rgba', self._rgba)):
+            used = None if buffer.pixels is None else add(buffer.pixels[:buffer.next_slot])
+            buffers[name] = {'array': used}
+        palettes = []
+        for pal in self._palettes:
+            if isinstance(pal, tuple):
+                palettes.append({'mode': pal[0], 'array': add(np.frombuffer(pal[1], dtype=np.uint8))})
+            else:
+                palettes.append({'array': add(pal)})
+        frames = []
+        for kind, slot, data, transparency in self._frames:
+            if kind == 'image':
+                entry = {'kind': kind, 'mode': data.mode, 'size': list(data.size),
+                         'array': add(np.frombuffer(data.tobytes(), dtype=np.uint8)),
+                         'transparency': _encode_info(data.info.get('transparency'))}
+                if data.mode == 'P':
+                    entry['palette'] = [data.palette.mode, add(np.frombuffer(data.palette.tobytes(), dtype=np.uint8))]
+            else:
+                entry = {'kind': kind, 'slot': slot, 'data': list(data) if kind == 'view' else data,
+                         'transparency': _encode_info(transparency)}
+            frames.append(entry)
+        state = {'size': None if self.size is None else list(self.size), 'buffers': buffers, 'palettes': palettes,
+                 'sources': [add(sheet) for sheet in self._sources], 'frames': frames}
+        return state, arrays
+
+    @classmethod
+    def from_state(cls, state, arrays, backing='memmap'):
+        # Gegenstück zu export_state: die Arrays (z.B. memmap-Ansichten einer Projektdatei) werden
+        # übernommen, nicht kopiert. Neue Bilder landen in eigenen Puffern (siehe ensure_capacity)
+        store = cls(backing)
+        store.size = None if state['size'] is None else tuple(state['size'])
+        for name, buffer in (('indexed', store._indexed), ('rgba', store._rgba)):
+            entry = state['buffers'][name]
+            if entry['array'] is not None:
+                buffer.pixels = arrays[entry['array']]
+                buffer.next_slot = len(buffer.pixels)
+        for pal in state['palettes']:
+            # Ohne _palette_ids: später angehängte Bilder legen gleiche Paletten neu an
+            array = arrays[pal['array']]
+            store._palettes.append((pal['mode'], array.tobytes()) if 'mode' in pal else array)
+        store._sources = [arrays[idx] for idx in state['sources']]
+        store._mapped = {_filename(a.filename) for a in arrays if isinstance(a, np.memmap) and a.filename is not None}
+        for entry in state['frames']:
+            kind = entry['kind']
+            transparency = _decode_info(entry['transparency'])
+            if kind == 'image':
+                mode, size = entry['mode'], tuple(entry['size'])
+                img = Image.frombuffer(mode, size, arrays[entry['array']], 'raw', mode, 0, 1)
+                if 'palette' in entry:
+                    img.putpalette(arrays[entry['palette'][1]].tobytes(), entry['palette'][0])
+                if transparency is not None:
+                    img.info['transparency'] = transparency
+                store._frames.append(('image', None, img, None))
+            else:
+                data = tuple(entry['data']) if kind == 'view' else entry['data']
+                store._frames.append((kind, entry['slot'], data, transparency))
+        return store
+
+    def _palette_id(self, key, data):
+        # Gleiche Paletten werden nur einmal gespeichert
+        pid = self._palette_ids.get(key)
+        if pid is None:
+            pid = self._palette_ids[key] = len(self._palettes)
+            self._palettes.append(data)
+        return pid
+
+    def append(self, img):
+        self._bbox = False
+        if self.size is None:
+            self.size = img.size
+        if img.size != self.size or img.mode not in ('P', 'L', 'RGB', 'RGBA'):
+            self._frames.append(('image', None, img.copy(), None))
+            return
+        if img.mode == 'P':
+            palette = img.palette
+            raw = palette.tobytes()
+            pid = self._palette_id(('P', palette.mode, raw), (palette.mode, raw))
+            self._store(self._indexed, np.asarray(img), 'P', pid, img.info.get('transparency'))
+        elif img.mode == 'L':
+            self._store(self._indexed, np.asarray(img), 'L', None, None)
+        else:
+            rgba_img = img if img.mode == 'RGBA' else img.convert('RGBA')
+            # Farbliste in C (getcolors), danach Pixel per Binärsuche auf Palettenindizes abbilden
+            counted = rgba_img.getcolors(256)
+            if counted is None:
+                self._store(self._rgba, np.asarray(rgba_img), 'raw' + img.mode, None, None)
+                return
+            colors = np.sort(np.array([color for _, color in counted], dtype=np.uint8).view(np.uint32).reshape(-1))
+            packed = np.asarray(rgba_img).view(np.uint32).reshape(rgba_img.height, rgba_img.width)
+            indices = np.searchsorted(colors, packed).astype(np.uint8)
+            pid = self._palette_id((img.mode, colors.tobytes()), colors.view(np.uint8).reshape(-1, 4))
+            self._store(self._indexed, indices, img.mode, pid, None)
+
+    def append_tiles(self, sheet, tile_size, count):
+        # Die ersten count Kacheln (zeilenweise wie compose_sheet) eines RGBA-Sheets (h x w x 4)
+        # als Ansichten aufnehmen: das Sheet wird einmal gehalten, keine Kachel wird kopiert
+        self._bbox = False
+        if self.size is None:
+            self.size = tile_size
+        if tuple(tile_size) != tuple(self.size):
+            raise ValueError("Kachelgröße passt nicht zu den vorhandenen Bildern")
+        sheet = self._own_sheet(sheet)
+        source = len(self._sources)
+        self._sources.append(sheet)
+        tile_w, tile_h = tile_size
+        tiles_x = sheet.shape[1] // tile_w
+        for idx in range(count):
+            self._frames.append(('view', source, ((idx % tiles_x) * tile_w, (idx // tiles_x) * tile_h), None))
+
+    def _own_sheet(self, sheet, copy=False):
+        # Sheet in eigenen Speicher: Auslagerungsdatei bei memmap, sonst zusammenhängend im RAM
+        # (copy: auch dann kopieren, wenn es schon zusammenhängend vorliegt)
+        if self.backing == 'memmap':
+            file = tempfile.TemporaryFile(prefix="ossl2gif_", suffix=".sheet", dir=self.scratch_dir)
+            file.truncate(sheet.nbytes)
+            mapped = np.memmap(file, dtype=np.uint8, mode='r+', shape=sheet.shape)
+            mapped[:] = sheet
+            self._source_files.append(file)
+            return mapped
+        return np.array(sheet) if copy else np.ascontiguousarray(sheet)
+
+    def _tile(self, record):
+        # NumPy-Ansicht (h x w x 4) einer Sheet-Kachel
+        _, source, (x, y), _ = record
+        w, h = self.size
+        return self._sources[source][y:y + h, x:x + w]
+
+    def _store(self, buffer, pixels, kind, pid, transparency):
+        slot = buffer.alloc()
+        buffer.pixels[slot] = pixels
+        self._frames.append((kind, slot, pid, transparency))
+
+    def _expand(self, record):
+        # 'P', 'L' und 'rawRGBA' sind Ansichten auf den Puffer (kein Kopieren, auch bei memmap)
+        kind, slot, data, transparency = record
+        if kind == 'image':
+            return data
+        w, h = self.size
+        if kind == 'view':
+            # Bild direkt auf dem Sheet-Speicher, Zeilenabstand = Sheet-Breite (schreibgeschützt,
+            # Pillow kopiert erst beim Verändern)
+            sheet = self._sources[slot]
+            x, y = data
+            stride = sheet.shape[1] * 4
+            offset = y * stride + x * 4
+            if offset + stride * h > sheet.nbytes:
+                # Unterste Kachelzeile ab Spalte 1: Pillow verlangt stride * h Byte ab dem Anfang,
+                # das Sheet endet aber schon nach der letzten Kachelzeile -> diese Kachel kopieren
+                return Image.fromarray(self._tile(record), 'RGBA')
+            return Image.frombuffer('RGBA', (w, h), sheet.reshape(-1)[offset:], 'raw', 'RGBA', stride, 1)
+        if kind in ('rawRGB', 'rawRGBA'):
+            img = Image.frombuffer('RGBA', (w, h), self._rgba.pixels[slot], 'raw', 'RGBA', 0, 1)
+            return img if kind == 'rawRGBA' else img.convert('RGB')
+        indices = self._indexed.pixels[slot]
+        if kind == 'L':
+            return Image.frombuffer('L', (w, h), indices, 'raw', 'L', 0, 1)
+        if kind == 'P':
+            img = Image.frombuffer('P', (w, h), indices, 'raw', 'P', 0, 1)
+            mode, raw = self._palettes[data]
+            img.putpalette(raw, mode)
+            if transparency is not None:
+                img.info['transparency'] = transparency
+            return img
+        rgba = self._palettes[data][indices]
+        img = Image.fromarray(rgba, 'RGBA')
+        return img if kind == 'RGBA' else img.convert('RGB')
+
+    def _records(self, ids):
+        # Alle Bilder oder nur die Bildnummern ids (z.B. einer Timeline-Fassung)
+        return self._frames if ids is None else [self._frames[i] for i in ids]
+
+    def union_bbox(self, ids=None):
+        # Gemeinsamer Rahmen (links, oben, rechts, unten) der sichtbaren Pixel aller Bilder,
+        # None wenn alles transparent ist oder Bilder verschiedener Größe enthalten sind.
+        # Nur der Rahmen über alle Bilder wird zwischengespeichert
+        if ids is not None and set(ids) != set(range(len(self._frames))):
+            return self._compute_union_bbox([self._frames[i] for i in sorted(set(ids))])
+        if self._bbox is False or self._bbox[0] != len(self._frames):
+            # Momentaufnahme: lädt ein anderer Thread gerade weitere Bilder, gilt der Rahmen
+            # nur für die bis dahin vorhandenen und wird beim nächsten Aufruf erneuert
+            records = list(self._frames)
+            self._bbox = (len(records), self._compute_union_bbox(records))
+        return self._bbox[1]
+
+    def _compute_union_bbox(self, records):
+        if not records:
+            return None
+        w, h = self.size
+        full = (0, 0, w, h)
+        rows = np.zeros(h, dtype=bool)
+        cols = np.zeros(w, dtype=bool)
+        for record in records:
+            kind, slot, data, _ = record
+            if kind == 'image':
+                if data.size != self.size:
+                    return None
+                box = data.getbbox()
+                if box:
+                    cols[box[0]:box[2]] = True
+                    rows[box[1]:box[3]] = True
+                continue
+            if kind == 'rawRGBA':
+                mask = self._rgba.pixels[slot][..., 3] > 0
+            elif kind == 'view':
+                mask = self._tile(record)[..., 3] > 0
+            else:
+                visible = self._visible_lut(record)
+                if visible is None:
+                    return full
+                mask = visible[self._indexed.pixels[slot]]
+            # Zeilen/Spalten-Projektion der Sichtbarkeitsmaske, über alle Bilder ODER-verknüpft
+            rows |= mask.any(axis=1)
+            cols |= mask.any(axis=0)
+        if not rows.any():
+            return None
+        ys = np.flatnonzero(rows)
+        xs = np.flatnonzero(cols)
+        return int(xs[0]), int(ys[0]), int(xs[-1]) + 1, int(ys[-1]) + 1
+
+    def change_bbox(self, ids=None):
+        # Rahmen aller Pixel, die sich in irgendeinem Bild vom ersten unterscheiden;
+        # None = alle Bilder gleich (statisch), volles Bild bei verschiedenen Bildgrößen
+        records = self._records(ids)
+        if len(records) < 2:
+            return None
+        w, h = self.size
+        if any(kind == 'image' and data.size != self.size for kind, _, data, _ in records):
+            return 0, 0, w, h
+        rows = np.zeros(h, dtype=bool)
+        cols = np.zeros(w, dtype=bool)
+        ref = records[0]
+        ref_rgba = None
+        for record in records[1:]:
+            if record[0] == ref[0] and self._buffer(ref[0]) is self._indexed and record[2:] == ref[2:]:
+                # Gleiche Palette: Indizes direkt vergleichen (1 Byte/Pixel)
+                diff = self._indexed.pixels[record[1]] != self._indexed.pixels[ref[1]]
+            else:
+                if ref_rgba is None:
+                    ref_rgba = self._rgba_array(ref)
+                diff = (self._rgba_array(record) != ref_rgba).any(axis=2)
+            rows |= diff.any(axis=1)
+            cols |= diff.any(axis=0)
+        if not rows.any():
+            return None
+        ys = np.flatnonzero(rows)
+        xs = np.flatnonzero(cols)
+        return int(xs[0]), int(ys[0]), int(xs[-1]) + 1, int(ys[-1]) + 1
+
+    def _rgba_array(self, record):
+        # RGBA-Pixel eines Bildes; voll transparente Pixel gelten unabhängig von ihrer Farbe als gleich
+        rgba = np.array(self._expand(record).convert('RGBA'))
+        rgba[rgba[..., 3] == 0] = 0
+        return rgba
+
+    def _visible_lut(self, record):
+        # Sichtbarkeit je Palettenindex (256 Einträge); None = Bild ist überall deckend
+        kind, _, data, transparency = record
+        if kind == 'RGBA':
+            visible = np.zeros(256, dtype=bool)
+            alpha = self._palettes[data][:, 3]
+            visible[:len(alpha)] = alpha > 0
+            return visible
+        if kind != 'P':
+            return None
+        mode, raw = self._palettes[data]
+        visible = np.ones(256, dtype=bool)
+        if mode == 'RGBA':
+            alpha = np.frombuffer(raw, dtype=np.uint8)[3::4]
+            visible[:len(alpha)] = alpha > 0
+        elif isinstance(transparency, bytes):
+            alpha = np.frombuffer(transparency, dtype=np.uint8)
+            visible[:len(alpha)] = alpha > 0
+        elif transparency is not None:
+            visible[transparency] = False
+        else:
+            return None
+        return visible
+
+    def nbytes(self):
+        # Belegter Speicher: Puffer (bei memmap in der Auslagerungsdatei) + Paletten + Sonderfälle
+        return self._indexed.nbytes() + self._rgba.nbytes() + self.resident_nbytes()
+
+    def resident_nbytes(self):
+        # Was unabhängig von der Pufferart immer im RAM liegt: Paletten und Sonderfälle
+        total = 0
+        for pal in self._palettes:
+            total += len(pal[1]) if isinstance(pal, tuple) else pal.nbytes
+        for kind, _, data, _ in self._frames:
+            if kind == 'image':
+                w, h = data.size
+                total += w * h * len(data.getbands())
+        for sheet in self._sources:
+            if not isinstance(sheet, np.memmap):
+                total += sheet.nbytes
+        return total
+
+
+def _filename(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _encode_info(value):
+    # Transparenzangabe (Index, Bytes je Palettenindex oder RGB-Tupel) JSON-fähig machen
+    if isinstance(value, bytes):
+        return {'bytes': value.hex()}
+    if isinstance(value, tuple):
+        return {'tuple': list(value)}
+    return value
+
+
+def _decode_info(value):
+    if isinstance(value, dict):
+        return bytes.fromhex(value['bytes']) if 'bytes' in value else tuple(value['tuple'])
+    return value
@@ -0,0 +1,227 @@
+# OSSL2Gif - Golden-Image-Regressionstest für Sprite-Sheets und GIF-Export
+# Rendert eine feste Matrix von Einstellungen und vergleicht mit den Referenzen in golden/.
+#
+#   python golden.py --update              Referenzen (neu) erzeugen
+#   python golden.py                       exakter Vergleich (Pixel-Hash)
+#   python golden.py --tolerance 2         Abweichung bis 2 Stufen je Kanal erlauben
+#
+# Bei Abweichungen werden Ist-Bild und Differenzbild in --diff-dir abgelegt; Exit-Code 1.
+# Fälle "name@stream" prüfen den streifenweisen PNG-Export gegen die Referenz von "name".
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+from PIL import Image, ImageChops
+
+import core
+from benchmark import EFFECT_CASES, synthetic_gif
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+MANIFEST = "manifest.json"
+
+# Eingaben: (Name, Bilder, Breite, Höhe, transparent, Rand)
+INPUTS = [
+    ('alpha12', 12, 96, 80, True, 0),
+    ('opaque5', 5, 64, 64, False, 0),
+    # Transparenter Rand um die Bewegung: prüft das Zuschneiden bei Randlos
+    ('margin6', 6, 160, 120, True, 40),
+]
+
+ALL_EFFECTS = {
+    'grayscale': 1, 'sharpen': 1, 'sharpen_value': 4.0, 'blur': 1, 'blur_value': 1.5,
+    'transparency': 1, 'transparency_value': 0.7, 'colorintensity_active': 1, 'colorintensity': 0.3,
+}
+
+
+def sheet_matrix():
+    # (Fallname, Eingabe, Einstellungen für core.compose_sheet)
+    cases = []
+    for input_name, *_ in INPUTS:
+        for effect, overrides in EFFECT_CASES.items():
+            cases.append((f"sheet_{input_name}_{effect}", input_name, {'size': (256, 256), 'effects': overrides}))
+        cases.append((f"sheet_{input_name}_all", input_name, {'size': (256, 256), 'effects': ALL_EFFECTS}))
+        cases.append((f"sheet_{input_name}_borderless", input_name, {'size': (256, 256), 'borderless': True}))
+        cases.append((f"sheet_{input_name}_bg", input_name, {'size': (256, 256), 'bg_color': "#336699"}))
+        cases.append((f"sheet_{input_name}_wide", input_name, {'size': (300, 120)}))
+    return cases
+
+
+def gif_matrix():
+    cases = []
+    for input_name, *_ in INPUTS:
+        cases.append((f"gif_{input_name}_none", input_name, {'size': (48, 40), 'effects': {}}))
+        cases.append((f"gif_{input_name}_all", input_name, {'size': (48, 40), 'effects': ALL_EFFECTS}))
+    return cases
+
+
+def load_inputs(workdir):
+    frames = {}
+    for name, frame_count, width, height, transparent, margin in INPUTS:
+        path = os.path.join(workdir, f"golden_{name}.gif")
+        synthetic_gif(path, frame_count, width, height, transparent, seed=1, margin=margin)
+        image, frames[name], _ = core.load_frames(path)
+        image.close()
+    return frames
+
+
+def render_sheet(frames, params):
+    tex_w, tex_h = params['size']
+    effects = core.effect_settings(**params.get('effects', {}))
+    return core.compose_sheet(frames, tex_w, tex_h, effects, params.get('bg_color', "#00000000"), params.get('borderless', False))
+
+
+def render_sheet_streaming(frames, params):
+    # Streifenweise als PNG kodieren und wieder einlesen
+    buf = io.BytesIO()
+    effects = core.effect_settings(**params.get('effects', {}))
+    core.save_texture_streaming(frames, buf, *params['size'], effects, params.get('bg_color', "#00000000"), params.get('borderless', False))
+    img = Image.open(io.BytesIO(buf.getvalue()))
+    img.load()
+    return img
+
+
+def render_gif(frames, params):
+    width, height = params['size']
+    buf = io.BytesIO()
+    core.save_gif(frames, buf, width, height, core.effect_settings(**params.get('effects', {})), 40)
+    return buf.getvalue()
+
+
+def gif_frames_rgba(data):
+    img = Image.open(io.BytesIO(data))
+    frames = []
+    try:
+        while True:
+            frames.append(img.convert("RGBA"))
+            img.seek(len(frames))
+    except EOFError:
+        pass
+    return frames
+
+
+def pixel_hash(images):
+    # Hash über Größe und RGBA-Pixel, unabhängig vom Datei-Encoder
+    h = hashlib.sha256()
+    for img in images:
+        img = img.convert("RGBA")
+        h.update(f"{img.width}x{img.height};".encode())
+        h.update(img.tobytes())
+    return h.hexdigest()
+
+
+def max_difference(expected, actual):
+    # Größte Kanalabweichung zweier Bildlisten (None bei unterschiedlicher Größe/Anzahl)
+    if len(expected) != len(actual):
+        return None
+    worst = 0
+    for a, b in zip(expected, actual):
+        a = a.convert("RGBA")
+        b = b.convert("RGBA")
+        if a.size != b.size:
+            return None
+        extrema = ImageChops.difference(a, b).getextrema()
+        worst = max(worst, max(high for _, high in extrema))
+    return worst
+
+
+def write_diff(diff_dir, name, expected, actual):
+    # Ist-Bilder und verstärkte Differenzbilder ablegen
+    os.makedirs(diff_dir, exist_ok=True)
+    for idx, b in enumerate(actual):
+        suffix = f"_{idx}" if len(actual) > 1 else ""
+        b = b.convert("RGBA")
+        b.save(os.path.join(diff_dir, f"{name}{suffix}_actual.png"))
+        if idx < len(expected) and expected[idx].size == b.size:
+            diff = ImageChops.difference(expected[idx].convert("RGBA"), b)
+            # Alle Kanäle zusammenfassen und sichtbar machen
+            mask = diff.convert("RGB").point(lambda p: min(255, p * 16))
+            mask.save(os.path.join(diff_dir, f"{name}{suffix}_diff.png"))
+
+
+def render_all(workdir):
+    inputs = load_inputs(workdir)
+    outputs = {}
+    for name, input_name, params in sheet_matrix():
+        outputs[name] = ('png', render_sheet(inputs[input_name], params))
+        outputs[f"{name}@stream"] = ('png', render_sheet_streaming(inputs[input_name], params))
+    for name, input_name, params in gif_matrix():
+        outputs[name] = ('gif', render_gif(inputs[input_name], params))
+    return outputs
+
+
+def as_images(kind, value):
+    return [value] if kind == 'png' else gif_frames_rgba(value)
+
+
+def update(outputs, golden_dir):
+    os.makedirs(golden_dir, exist_ok=True)
+    manifest = {}
+    for name, (kind, value) in outputs.items():
+        if "@" in name:
+            continue
+        path = os.path.join(golden_dir, f"{name}.{kind}")
+        if kind == 'png':
+            value.save(path, format="PNG", optimize=True)
+        else:
+            with open(path, "wb") as f:
+                f.write(value)
+        manifest[name] = {'file': f"{name}.{kind}", 'sha256': pixel_hash(as_images(kind, value))}
+    with open(os.path.join(golden_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def check(outputs, golden_dir, tolerance, diff_dir, log=print):
+    with open(os.path.join(golden_dir, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    failures = []
+    for name, (kind, value) in outputs.items():
+        entry = manifest.get(name.split("@")[0])
+        if entry is None:
+            failures.append(name)
+            log(f"FEHLT    {name} (keine Referenz, --update ausführen)")
+            continue
+        actual = as_images(kind, value)
+        if pixel_hash(actual) == entry['sha256']:
+            continue
+        ref_path = os.path.join(golden_dir, entry['file'])
+        expected = [Image.open(ref_path).convert("RGBA")] if kind == 'png' else gif_frames_rgba(open(ref_path, "rb").read())
+        worst = max_difference(expected, actual)
+        if worst is not None and worst <= tolerance:
+            log(f"TOLERANZ {name} (max. Abweichung {worst})")
+            continue
+        failures.append(name)
+        log(f"FEHLER   {name} ({'Größe/Bildanzahl verschieden' if worst is None else f'max. Abweichung {worst}'})")
+        write_diff(diff_dir, name, expected, actual)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OSSL2Gif Golden-Image-Vergleich")
+    parser.add_argument("--update", action="store_true", help="Referenzen mit der aktuellen Implementierung neu erzeugen")
+    parser.add_argument("--tolerance", type=int, default=0, help="erlaubte Abweichung je Kanal (0 = exakt)")
+    parser.add_argument("--golden-dir", default=GOLDEN_DIR)
+    parser.add_argument("--diff-dir", default=os.path.join(tempfile.gettempdir(), "ossl2gif_golden_diff"))
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        outputs = render_all(workdir)
+    if args.update:
+        manifest = update(outputs, args.golden_dir)
+        print(f"{len(manifest)} Referenzen in {args.golden_dir} geschrieben.")
+        return 0
+    failures = check(outputs, args.golden_dir, args.tolerance, args.diff_dir)
+    if failures:
+        print(f"{len(failures)} von {len(outputs)} Fällen weichen ab; Differenzbilder in {args.diff_dir}")
+        return 1
+    print(f"Alle {len(outputs)} Fälle identisch.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+# OSSL2Gif - Verzögertes Importieren schwerer Module (Pillow, NumPy, ttkbootstrap)
+# Das Modul wird erst beim ersten Attributzugriff wirklich geladen; der Programmstart bleibt schnell.
+
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    # Untermodule (z.B. PIL.Image) auch am Elternpaket eintragen, wie es import tut
+    parent, _, child = name.rpartition('.')
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
+
+
+def module_available(name):
+    # Nur nachsehen, ob ein Modul installiert ist, ohne es zu laden
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
@@ -3,69 +3,112 @@
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from PIL import Image, ImageTk
+import functools
+import hashlib
 import math
+import os
+import sys
+import time
 from translations import tr
-
-try:
-    import ttkbootstrap as tb
-    THEME_AVAILABLE = True
-except ImportError:
-    tb = None
-    THEME_AVAILABLE = False
+from profiler import PROFILER
+from lazyimport import lazy_import, module_available
+from tasks import TaskRunner, Cancelled
+
+# Schwere Module erst bei der ersten Benutzung laden (schneller Programmstart)
+Image = lazy_import("PIL.Image")
+ImageTk = lazy_import("PIL.ImageTk")
+core = lazy_import("core")
+planner = lazy_import("planner")
+atlas = lazy_import("atlas")
+timeline = lazy_import("timeline")
+framestore = lazy_import("framestore")
+project = lazy_import("project")
+
+# ttkbootstrap nur suchen, nicht importieren; geladen wird beim ersten Zugriff
+THEME_AVAILABLE = module_available("ttkbootstrap")
+tb = lazy_import("ttkbootstrap") if THEME_AVAILABLE else None
+
+
+@functools.lru_cache(maxsize=None)
+def get_keyboard_layout():
+    # Tastaturlayout ermitteln; nur unter Windows möglich, sonst None
+    if sys.platform != 'win32':
+        return None
     import ctypes
+    user32 = ctypes.WinDLL('user32', use_last_error=True)
+    hWnd = user32.GetForegroundWindow()
+    thread_id = user32.GetWindowThreadProcessId(hWnd, 0)
+    klid = user32.GetKeyboardLayout(thread_id)
+    # Die unteren 16 Bit enthalten die Sprachkennung (LANGID)
+    lid = klid & 0xFFFF
+    # Sprachcode (z.B. 0x407 = Deutsch, 0x409 = Englisch)
+    lang_map = {
+        0x407: 'de',
+        0x409: 'en',
+        0x40c: 'fr',
+        0x410: 'it',
+        0x419: 'ru',
+        0x40a: 'es',
+        0x413: 'nl',
+        0x41d: 'se',
+        0x415: 'pl',
+        0x816: 'pt'
+        # Weitere Codes nach Bedarf ergänzen
+    }
+    return lang_map.get(lid, f'unknown({lid})')
+
+
+@functools.lru_cache(maxsize=None)
+def get_system_language():
+    # Systemweite Sprache ermitteln (z.B. 'de_DE'), ohne das veraltete locale.getdefaultlocale()
     import locale
-
-    def get_keyboard_layout():
-        # Windows-spezifisch: Tastaturlayout ermitteln
-        user32 = ctypes.WinDLL('user32', use_last_error=True)
-        hWnd = user32.GetForegroundWindow()
-        thread_id = user32.GetWindowThreadProcessId(hWnd, 0)
-        klid = user32.GetKeyboardLayout(thread_id)
-        # Die unteren 16 Bit enthalten die Sprachkennung (LANGID)
-        lid = klid & 0xFFFF
-        # Sprachcode (z.B. 0x407 = Deutsch, 0x409 = Englisch)
-        lang_map = {
-            0x407: 'de',
-            0x409: 'en',
-            0x40c: 'fr',
-            0x410: 'it',
-            0x419: 'ru',
-            0x40a: 'es',
-            0x413: 'nl',
-            0x41d: 'se',
-            0x415: 'pl',
-            0x816: 'pt'
-            # Weitere Codes nach Bedarf ergänzen
-        }
-        return lang_map.get(lid, f'unknown({lid})')
-
-    def get_system_language():
-        # Systemweite Sprache ermitteln
-        lang, _ = locale.getdefaultlocale()
-        return lang
-
-    # Voreinstellungen setzen
-    DEFAULT_KEYBOARD_LAYOUT = get_keyboard_layout()
-    DEFAULT_LANGUAGE = get_system_language()
-
-    print(f"Tastaturlayout erkannt: {DEFAULT_KEYBOARD_LAYOUT}")
-    print(f"Systemsprache erkannt: {DEFAULT_LANGUAGE}")
+    if sys.platform == 'win32':
+        import ctypes
+        return locale.windows_locale.get(ctypes.windll.kernel32.GetUserDefaultUILanguage())
+    for var in ('LC_ALL', 'LC_MESSAGES', 'LANG'):
+        value = os.environ.get(var)
+        if value and value not in ('C', 'POSIX'):
+            return value.split('.')[0]
+    return locale.getlocale()[0]
 
 LANGUAGES = ['de', 'en', 'fr', 'es', 'it', 'ru', 'nl', 'se', 'pl', 'pt']
 
+# Dateiauswahl beim Laden: GIF, animiertes WebP und APNG (meist als .png) sowie Texturen
+# name;X;Y;speed, die wieder in Einzelbilder zerlegt werden
+ANIMATION_FILETYPES = [("GIF/WebP/APNG", "*.gif *.webp *.png *.apng"), ("GIF", "*.gif"), ("WebP", "*.webp"), ("APNG", "*.png *.apng"),
+                       ("Textur name;X;Y;speed", "*;*;*;*.png *;*;*;*.jpg *;*;*;*.bmp")]
+# Beim Laden im Hintergrund: Textur-Vorschau höchstens alle n Sekunden neu aufbauen
+# (das Kachelraster ändert sich mit jedem Bild), die GIF-Vorschau erscheint sofort
+LOAD_PREVIEW_INTERVAL = 1.0
+PROJECT_FILETYPES = [("OSSL2Gif-Projekt", "*.ossl2gif")]
+
 class ModernApp:
     def __init__(self, root):
         self.root = root
         self.lang = 'de'
         self.gif_image = None
+        # Pfad der geladenen Animation (Texturname), auch nach dem Öffnen eines Projekts
+        self.source_file = None
         self.gif_frames = []
+        self.frame_durations = []
         self.texture_image = None
+        # Zuletzt aufgebautes Sheet als (Schlüssel, Bild), siehe _cached_sheet
+        self._sheet_cache = None
+        # Speicherplan (planner.Plan) und Dateikopf-Angaben des geladenen GIFs
+        self.plan = None
+        # Speicherbudget einmal je Laden ermitteln: freier RAM schwankt, der Plan soll es nicht
+        self.memory_budget = None
+        self.frame_info = None
         self.frame_count = 0
         self.current_frame = 0
         self.timer = None
         self.image_width = 2048
         self.image_height = 2048
+        # Laden und Exportieren im Hintergrund (höchstens eine Aufgabe gleichzeitig)
+        self.tasks = TaskRunner(root)
+        # Leeren angefordert, während eine Aufgabe lief: wird nach deren Ende nachgeholt
+        self._clear_pending = False
+        self._load_preview_at = 0.0
         self.root.title("OSSL2Gif")
         self.root.geometry("1500x1300")
         try:
@@ -111,8 +154,15 @@ class ModernApp:
         # --- Status-Gruppe ist die letzte Gruppe im Programmfenster ---
         self.status_group = ttk.LabelFrame(main, text=tr('status', self.lang) or "Status")
         self.status_group.pack(fill=tk.X, side=tk.BOTTOM, padx=10, pady=(12,8)) # Status Gruppe Gruppenpositionierung?
+        # Fortschrittsbalken und Abbrechen (auch Esc) nur, solange eine Hintergrundaufgabe läuft
+        self.task_frame = ttk.Frame(self.status_group)
+        self.task_progress = ttk.Progressbar(self.task_frame, length=200, mode="determinate")
+        self.task_progress.pack(side=tk.LEFT, padx=(0,4))
+        self.cancel_btn = ttk.Button(self.task_frame, text=tr('cancel', self.lang) or "Abbrechen", command=self.tasks.cancel)
+        self.cancel_btn.pack(side=tk.LEFT)
         self.status = ttk.Label(self.status_group, text=tr('ready', self.lang) or "Bereit", anchor="w")
         self.status.pack(fill=tk.X)
+        self.root.bind_all("<Escape>", lambda e: self.tasks.cancel())
 
         # --- Datei-Gruppe ist die vorletzte Gruppe im Programmfenster ---
         self.file_group = ttk.LabelFrame(main, text=tr('file', self.lang) or "Datei")
@@ -125,6 +175,21 @@ class ModernApp:
         self.export_format_var = tk.StringVar(value="PNG")
         self.export_format_combo = ttk.Combobox(export_format_frame, values=["PNG", "JPG", "BMP"], textvariable=self.export_format_var, width=5, state="readonly")
         self.export_format_combo.pack(side=tk.LEFT)
+        # Bildspeicher: RAM oder Auslagerungsdatei (memmap); Auto wählt nach Speicherbudget
+        frame_store_frame = ttk.Frame(self.file_group)
+        frame_store_frame.pack(side=tk.LEFT, padx=(0,15))
+        self.frame_store_label = ttk.Label(frame_store_frame, text=tr('frame_store', self.lang) or "Bildspeicher:")
+        self.frame_store_label.pack(side=tk.LEFT)
+        self.frame_store_var = tk.StringVar(value="Auto")
+        self.frame_store_combo = ttk.Combobox(frame_store_frame, values=["Auto", "RAM", "Memmap"], textvariable=self.frame_store_var, width=8, state="readonly")
+        self.frame_store_combo.pack(side=tk.LEFT)
+        # Zusätzliche Texturbreiten beim Speichern (z.B. "1024 512"), aus dem Sheet abgeleitet
+        texture_sizes_frame = ttk.Frame(self.file_group)
+        texture_sizes_frame.pack(side=tk.LEFT, padx=(0,15))
+        self.texture_sizes_label = ttk.Label(texture_sizes_frame, text=tr('texture_sizes', self.lang) or "Varianten:")
+        self.texture_sizes_label.pack(side=tk.LEFT)
+        self.texture_sizes_var = tk.StringVar(value="")
+        ttk.Entry(texture_sizes_frame, textvariable=self.texture_sizes_var, width=10).pack(side=tk.LEFT)
         # Datei-Buttons: Laden, Speichern, Exportieren, Clear
         if THEME_AVAILABLE and tb is not None:
             self.load_btn = tb.Button(self.file_group, text=tr('load_gif', self.lang) or "GIF laden", command=self.load_gif, bootstyle="success")
@@ -137,6 +202,15 @@ class ModernApp:
         self.save_texture_btn.pack(side=tk.LEFT, padx=2, pady=2)
         self.export_lsl_btn = ttk.Button(self.file_group, text=tr('export_lsl', self.lang) or "LSL exportieren", command=self.export_lsl)
         self.export_lsl_btn.pack(side=tk.LEFT, padx=2, pady=2)
+        self.export_static_btn = ttk.Button(self.file_group, text=tr('export_static', self.lang) or "Hintergrund trennen", command=self.export_static)
+        self.export_static_btn.pack(side=tk.LEFT, padx=2, pady=2)
+        self.export_atlas_btn = ttk.Button(self.file_group, text=tr('export_atlas', self.lang) or "Atlas erstellen", command=self.export_atlas)
+        self.export_atlas_btn.pack(side=tk.LEFT, padx=2, pady=2)
+        # Projekt: Arbeitsstand samt dekodierter Bilder und Sheet speichern bzw. sofort wieder öffnen
+        self.save_project_btn = ttk.Button(self.file_group, text=tr('save_project', self.lang) or "Projekt speichern", command=self.save_project)
+        self.save_project_btn.pack(side=tk.LEFT, padx=2, pady=2)
+        self.open_project_btn = ttk.Button(self.file_group, text=tr('open_project', self.lang) or "Projekt öffnen", command=self.open_project)
+        self.open_project_btn.pack(side=tk.LEFT, padx=2, pady=2)
         # Clear Button
         if THEME_AVAILABLE and tb is not None:
             style = tb.Style()
@@ -145,6 +219,12 @@ class ModernApp:
         else:
             self.clear_btn = tk.Button(self.file_group, text=tr('clear', self.lang) or "", command=self.clear_texture, bg="#e53935", fg="white", activebackground="#b71c1c", activeforeground="white")
         self.clear_btn.pack(side=tk.LEFT, padx=2, pady=2)
+        # Profiling: Stufenzeiten live im Status, Export als Chrome-Trace
+        self.profiling_var = tk.IntVar(value=1 if PROFILER.enabled else 0)
+        self.profiling_chk = ttk.Checkbutton(self.file_group, text=tr('profiling', self.lang) or "Profiling", variable=self.profiling_var, command=self.toggle_profiling)
+        self.profiling_chk.pack(side=tk.LEFT, padx=(15,2), pady=2)
+        self.export_trace_btn = ttk.Button(self.file_group, text=tr('export_trace', self.lang) or "Trace exportieren", command=self.export_trace)
+        self.export_trace_btn.pack(side=tk.LEFT, padx=2, pady=2)
 
         # --- Media Gruppe (vor Master Einstellungen) ---
         self.media_group = ttk.LabelFrame(main, text="Media")
@@ -240,6 +320,15 @@ class ModernApp:
         self.framerate_label.pack(side=tk.LEFT, padx=4, pady=4, ipady=6)
         self.framerate_spin = ttk.Spinbox(framerate_frame, from_=1, to=10000, increment=1, textvariable=self.framerate_var, width=6)
         self.framerate_spin.pack(side=tk.LEFT)
+        # Vorschauqualität: Auto = Entwurf beim Abspielen, sonst ausgewogen; Exporte immer Final
+        preview_quality_frame = ttk.Frame(master_row1)
+        preview_quality_frame.pack(side=tk.LEFT, padx=15)
+        self.preview_quality_label = ttk.Label(preview_quality_frame, text=tr('preview_quality', self.lang) or "Vorschau:", background="#d1c4e9", foreground="black", relief=tk.FLAT, borderwidth=1, width=12, anchor="center", font=("Segoe UI", 10))
+        self.preview_quality_label.pack(side=tk.LEFT, padx=4, pady=4, ipady=6)
+        self.preview_quality_var = tk.StringVar(value="Auto")
+        self.preview_quality_combo = ttk.Combobox(preview_quality_frame, values=["Auto", "Draft", "Balanced", "Final"], textvariable=self.preview_quality_var, width=9, state="readonly")
+        self.preview_quality_combo.pack(side=tk.LEFT)
+        self.preview_quality_combo.bind("<<ComboboxSelected>>", lambda e: self.update_previews())
         # Zeile 2
         master_row2 = ttk.Frame(self.master_group)
         master_row2.pack(fill=tk.X)
@@ -268,6 +357,18 @@ class ModernApp:
         self.frame_select_spin.pack(side=tk.LEFT, padx=2)
         self.add_frame_btn = ttk.Button(master_row2, text=tr('add_frame', self.lang) or "", command=self.add_selected_frame_to_texture)
         self.add_frame_btn.pack(side=tk.LEFT, padx=2)
+        # Ausgewähltes Bild verschieben, Bearbeitung rückgängig machen/wiederholen (Strg+Z / Strg+Y)
+        self.move_left_btn = ttk.Button(master_row2, text="◀", width=3, command=lambda: self.move_selected_frame(-1))
+        self.move_left_btn.pack(side=tk.LEFT, padx=2)
+        self.move_right_btn = ttk.Button(master_row2, text="▶", width=3, command=lambda: self.move_selected_frame(1))
+        self.move_right_btn.pack(side=tk.LEFT, padx=2)
+        self.undo_btn = ttk.Button(master_row2, text=tr('undo', self.lang) or "Rückgängig", command=self.undo)
+        self.undo_btn.pack(side=tk.LEFT, padx=2)
+        self.redo_btn = ttk.Button(master_row2, text=tr('redo', self.lang) or "Wiederholen", command=self.redo)
+        self.redo_btn.pack(side=tk.LEFT, padx=2)
+        self.root.bind_all("<Control-z>", lambda e: self.undo())
+        self.root.bind_all("<Control-y>", lambda e: self.redo())
+        self.root.bind_all("<Control-Shift-Z>", lambda e: self.redo())
 
         # Maximale Bildanzahl Spinbox
         maxframes_frame = ttk.Frame(master_row2)
@@ -299,7 +400,10 @@ class ModernApp:
         self.borderless_var.set(0)
         self.framerate_var.set(10)
         self.export_format_var.set("PNG")
+        # Max. Bilder ohne Kürzen zurücksetzen, die Bildfolge wird unten komplett wiederhergestellt
+        self._maxframes_changing = True
         self.maxframes_var.set(64)
+        self._maxframes_changing = False
         self.lang_var.set("de")
         # Effekte zurücksetzen
         for prefix in ("gif", "texture"):
@@ -315,44 +419,30 @@ class ModernApp:
             self.__dict__[f'{prefix}_colorintensity_active'].set(0)
         self.update_language()
         self.current_frame = 0
+        self._cancel_animation_timer()
         self.playing = False
-        # GIF und Textur neu laden, falls ein GIF geladen ist
-        if self.gif_image and hasattr(self.gif_image, 'filename'):
-            file = self.gif_image.filename
-            try:
-                self.gif_image = Image.open(file)
-                self.gif_frames = []
-                while True:
-                    self.gif_frames.append(self.gif_image.copy())
-                    self.gif_image.seek(len(self.gif_frames))
-            except EOFError:
-                pass
-            except Exception:
-                self.gif_frames = []
-            self.frame_count = len(self.gif_frames)
+        # Geladene Bildfolge ohne erneutes Dekodieren wiederherstellen (rückgängig machbar)
+        if hasattr(self.gif_frames, 'reset'):
+            self.gif_frames.reset()
             self.current_frame = 0
-            if self.gif_frames:
-                self.show_gif_frame()
+            self._frames_changed()
+        # GIF und Textur neu laden, falls das Laden zuvor fehlgeschlagen ist
+        elif self.gif_image and hasattr(self.gif_image, 'filename') and not self.tasks.busy:
+            self.open_animation(self.gif_image.filename)
         else:
             self.update_previews()
 
     def on_maxframes_changed(self, *args):
-        if hasattr(self, '_maxframes_changing') and self._maxframes_changing:
+        if hasattr(self, '_maxframes_changing') and self._maxframes_changing or self._loading():
             return
         self._maxframes_changing = True
         max_frames = self.maxframes_var.get()
         if hasattr(self, 'gif_frames') and len(self.gif_frames) > max_frames:
             removed = len(self.gif_frames) - max_frames
             if removed > 0:
-                self.gif_frames = self.gif_frames[:max_frames]
-                self.frame_count = len(self.gif_frames)
-                self.status.config(text=f"{removed} Bilder entfernt. Gesamt: {self.frame_count}")
-                value = self.frame_select_var.get()
-                self.frame_select_spin.destroy()
-                self.frame_select_spin = ttk.Spinbox(self.add_frame_btn.master, from_=0, to=max(0, self.frame_count-1), textvariable=self.frame_select_var, width=5, state="readonly")
-                self.frame_select_spin.pack(side=tk.LEFT, padx=2, before=self.add_frame_btn)
-                self.frame_select_var.set(min(value, self.frame_count-1))
-                self.update_previews()
+                # Kürzen ist nur eine neue Fassung der Bildfolge und lässt sich rückgängig machen
+                self.gif_frames.truncate(max_frames)
+                self._frames_changed(f"{removed} Bilder entfernt. Gesamt: {len(self.gif_frames)}")
         self._maxframes_changing = False
 
     def choose_bg_color(self, event=None):
@@ -370,6 +460,8 @@ class ModernApp:
 
     def add_selected_frame_to_texture(self):
         # Einzelbild am Ende der Textur hinzufügen
+        if self._loading():
+            return
         idx = self.frame_select_var.get()
         if not self.gif_frames or idx < 0 or idx >= len(self.gif_frames):
             messagebox.showerror("Fehler", "Ungültige Bildnummer.")
@@ -379,42 +471,130 @@ class ModernApp:
         if len(self.gif_frames) >= max_frames:
             messagebox.showerror("Fehler", f"Maximale Bildanzahl ({max_frames}) erreicht.")
             return
-        # Das ausgewählte Frame ans Ende der Textur-Liste anhängen
-        frame = self.gif_frames[idx].copy()
-        self.gif_frames.append(frame)
+        # Das ausgewählte Frame ans Ende der Bildfolge anhängen (Verweis, keine Pixelkopie)
+        self.gif_frames.duplicate(idx)
+        self._frames_changed(f"Bild {idx} hinzugefügt. Gesamt: {len(self.gif_frames)}")
+
+    def move_selected_frame(self, step):
+        # Ausgewähltes Bild um step Positionen verschieben; die Auswahl wandert mit
+        idx = self.frame_select_var.get()
+        if not self.gif_frames or not 0 <= idx < len(self.gif_frames) or self._loading():
+            return
+        target = min(max(idx + step, 0), len(self.gif_frames) - 1)
+        if self.gif_frames.move(idx, target):
+            self.frame_select_var.set(target)
+            self._frames_changed(f"Bild {idx} → {target}")
+
+    def undo(self):
+        if hasattr(self.gif_frames, 'undo') and not self._loading() and self.gif_frames.undo():
+            self._frames_changed()
+
+    def redo(self):
+        if hasattr(self.gif_frames, 'redo') and not self._loading() and self.gif_frames.redo():
+            self._frames_changed()
+
+    def _loading(self):
+        # Während des Ladens wächst die Bildfolge noch; Bearbeitungen erst danach
+        return self.tasks.running('load')
+
+    def _frames_changed(self, message=None):
+        # Nach jeder Änderung der Bildfolge: Verzögerungen, Zähler, Bildauswahl und Vorschau abgleichen
+        self.frame_durations = list(self.gif_frames.durations)
         self.frame_count = len(self.gif_frames)
-        # Spinbox updaten
+        self.current_frame = min(self.current_frame, max(0, self.frame_count - 1))
         # Spinbox immer neu erstellen und ersetzen (maximale Kompatibilität)
-        value = self.frame_select_var.get()
+        value = min(self.frame_select_var.get(), max(0, self.frame_count - 1))
         self.frame_select_spin.destroy()
         self.frame_select_spin = ttk.Spinbox(self.add_frame_btn.master, from_=0, to=max(0, self.frame_count-1), textvariable=self.frame_select_var, width=5, state="readonly")
         self.frame_select_spin.pack(side=tk.LEFT, padx=2, before=self.add_frame_btn)
         self.frame_select_var.set(value)
-        self.status.config(text=f"Bild {idx} hinzugefügt. Gesamt: {self.frame_count}")
+        if message:
+            self.status.config(text=message)
+        else:
+            self._show_plan_status()
         self.update_previews()
 
 
 
     def start_animation(self):
-        if not self.gif_frames:
+        if not self.gif_frames or self.playing:
             return
         self.playing = True
-        self._run_animation()
+        now = time.perf_counter()
+        # Absolute Präsentationszeit des nächsten Bildes (monotone Uhr)
+        self._next_due = now + self._frame_delay(self.current_frame)
+        self._fps_window_start = now
+        self._fps_presented = 0
+        self._fps_skipped = 0
+        self._schedule_animation(now)
+
+    def _frame_delay(self, idx):
+        # Echte Verzögerung des Einzelbildes aus dem GIF, sonst Framerate-Spinbox (ms/Bild)
+        if idx < len(self.frame_durations) and self.frame_durations[idx]:
+            return self.frame_durations[idx] / 1000.0
+        try:
+            delay = self.framerate_var.get()
+        except tk.TclError:
+            delay = 10
+        return max(1, delay) / 1000.0
+
+    def _schedule_animation(self, now):
+        wait_ms = max(0, math.ceil((self._next_due - now) * 1000))
+        self.timer = self.root.after(wait_ms, self._run_animation)
+
+    def _cancel_animation_timer(self):
+        if self.timer is not None:
+            try:
+                self.root.after_cancel(self.timer)
+            except Exception:
+                pass
+            self.timer = None
 
     def _run_animation(self):
+        self.timer = None
         if not self.playing or not self.gif_frames:
             return
-        self.current_frame = (self.current_frame + 1) % self.frame_count
-        self.show_gif_frame()
-        delay = self.framerate_var.get()
-        self.root.after(delay, self._run_animation)
+        now = time.perf_counter()
+        # Bild bestimmen, das jetzt sichtbar sein soll; verspätete Bilder werden übersprungen
+        frame = (self.current_frame + 1) % self.frame_count
+        due = self._next_due
+        skipped = 0
+        while due + self._frame_delay(frame) <= now:
+            due += self._frame_delay(frame)
+            frame = (frame + 1) % self.frame_count
+            skipped += 1
+            if skipped > self.frame_count:
+                # Weit zurückgefallen (z.B. Fenster verschoben): Zeitachse neu ausrichten
+                due = now
+                break
+        self.current_frame = frame
+        self._render_gif_preview()
+        self._next_due = due + self._frame_delay(frame)
+        self._fps_presented += 1
+        self._fps_skipped += skipped
+        self._update_playback_status(now)
+        self._schedule_animation(time.perf_counter())
+
+    def _update_playback_status(self, now):
+        elapsed = now - self._fps_window_start
+        if elapsed < 1.0:
+            return
+        total = sum(self._frame_delay(i) for i in range(self.frame_count))
+        target = self.frame_count / total if total > 0 else 0.0
+        achieved = self._fps_presented / elapsed
+        self.status.config(text=(tr('playback_fps', self.lang) or "").format(achieved=achieved, target=target, skipped=self._fps_skipped))
+        self._fps_window_start = now
+        self._fps_presented = 0
+        self._fps_skipped = 0
 
     def pause_animation(self):
+        self._cancel_animation_timer()
         self.playing = False
         # Play/Pause-Button immer auf "Abspielen" (Play) setzen, auch sprachabhängig
         self.play_btn.config(text=tr('play', self.lang) or "Play ▶")
 
     def stop_animation(self):
+        self._cancel_animation_timer()
         self.playing = False
         self.current_frame = 0
         self.show_gif_frame()
@@ -425,13 +605,13 @@ class ModernApp:
         if not self.gif_frames:
             return
         self.current_frame = (self.current_frame + 1) % self.frame_count
-        self.show_gif_frame()
+        self._render_gif_preview()
 
     def step_backward(self):
         if not self.gif_frames:
             return
         self.current_frame = (self.current_frame - 1) % self.frame_count
-        self.show_gif_frame()
+        self._render_gif_preview()
 
 
 
@@ -515,6 +695,10 @@ class ModernApp:
         self.save_gif_btn.config(text=tr('save_gif', l) or "")
         self.save_texture_btn.config(text=tr('save_texture', l) or "")
         self.export_lsl_btn.config(text=tr('export_lsl', l) or "")
+        self.export_static_btn.config(text=tr('export_static', l) or "")
+        self.export_atlas_btn.config(text=tr('export_atlas', l) or "")
+        self.save_project_btn.config(text=tr('save_project', l) or "")
+        self.open_project_btn.config(text=tr('open_project', l) or "")
         self.status.config(text=tr('ready', l) or "")
         # Gruppenüberschriften
         self.master_group.config(text=tr('master_settings', l) or "")
@@ -522,9 +706,14 @@ class ModernApp:
         self.status_group.config(text=tr('status', l) or "")
         # Buttons
         self.clear_btn.config(text=tr('clear', l) or "")
+        self.profiling_chk.config(text=tr('profiling', l) or "")
+        self.export_trace_btn.config(text=tr('export_trace', l) or "")
         self.borderless_chk.config(text=tr('borderless', l) or "")
         self.play_btn.config(text=tr('play', l) if not self.playing else tr('pause', l) or "")
         self.add_frame_btn.config(text=tr('add_frame', l) or "")
+        self.undo_btn.config(text=tr('undo', l) or "Rückgängig")
+        self.cancel_btn.config(text=tr('cancel', l) or "Abbrechen")
+        self.redo_btn.config(text=tr('redo', l) or "Wiederholen")
         # Effekte-Labels aktualisieren
         for prefix in ("gif", "texture"):
             panel = getattr(self, f"{prefix}_settings")
@@ -566,6 +755,9 @@ class ModernApp:
         # Neue Funktionen in Master Einstellungen
         self.framerate_label.config(text=tr('framerate', l) or "Framerate:")
         self.export_format_label.config(text=tr('export_format', l) or "Exportformat:")
+        self.frame_store_label.config(text=tr('frame_store', l) or "Bildspeicher:")
+        self.preview_quality_label.config(text=tr('preview_quality', l) or "Vorschau:")
+        self.texture_sizes_label.config(text=tr('texture_sizes', l) or "Varianten:")
         self.maxframes_label.config(text=tr('max_images', l) or "Max. Bilder:")
 
 
@@ -576,45 +768,285 @@ class ModernApp:
 
 
     def load_gif(self):
-        file = filedialog.askopenfilename(filetypes=[("GIF", "*.gif")])
+        if self.tasks.busy:
+            self.status.config(text=tr('task_busy', self.lang) or "")
+            return
+        file = filedialog.askopenfilename(filetypes=ANIMATION_FILETYPES)
         if not file:
             return
-        self.gif_image = Image.open(file)
-        self.gif_frames = []
+        self.open_animation(file)
+
+    def open_animation(self, file):
+        # Im Hintergrund dekodieren; die ersten Bilder erscheinen schon während des Ladens
         # Clear Textur-Vorschau
         self.texture_image = None
         self.texture_canvas.config(image="")
-        try:
-            while True:
-                self.gif_frames.append(self.gif_image.copy())
-                self.gif_image.seek(len(self.gif_frames))
-        except EOFError:
-            pass
-        self.frame_count = len(self.gif_frames)
         self.current_frame = 0
+        self._cancel_animation_timer()
         self.playing = False
         # Play/Pause-Button immer auf "Abspielen" (Play) setzen, auch sprachabhängig
         self.play_btn.config(text=tr('play', self.lang) or "Play ▶")
+        try:
+            store = self.load_frames(file)
+        except Exception as e:
+            messagebox.showerror("Fehler", str(e))
+            return
+        durations = []
+        self._load_preview_at = 0.0
+        self._start_task('load', core.load_frames, file, store, store.backing, None, durations,
+                         on_progress=lambda task: self._load_progress(durations),
+                         on_done=lambda task: self._load_finished(task.result[0], durations),
+                         on_error=lambda task: self._load_stopped(task, file, durations))
+
+    def load_frames(self, file):
+        # Vorherigen Bildspeicher (ggf. mit Auslagerungsdatei) freigeben, Speicherplan
+        # aus dem Dateikopf bestimmen und einen leeren Bildspeicher anlegen; dekodiert
+        # wird im Hintergrund (open_animation)
+        self.release_frames()
+        self.gif_image = None
+        self.source_file = file
+        self.frame_durations = []
+        self.frame_count = 0
+        self.memory_budget = None
+        self.frame_info = planner.probe(file)
+        self.update_plan({"RAM": 'memory', "Memmap": 'memmap'}.get(self.frame_store_var.get(), 'auto'))
+        store = framestore.FrameStore(self.plan.frame_store)
+        # Bearbeitungen (Hinzufügen, Verschieben, Kürzen) arbeiten auf Verweisen in den Bildspeicher
+        self.gif_frames = timeline.Timeline(store, [])
+        return store
+
+    def _load_progress(self, durations):
+        # Fertig dekodierte Bilder übernehmen (ein Bild zählt erst mit seiner Verzögerung)
+        loaded = len(self.gif_frames)
+        count = len(durations)
+        if count <= loaded:
+            return
+        self.gif_frames.extend(durations[loaded:count])
+        self.frame_durations = list(self.gif_frames.durations)
+        self.frame_count = len(self.gif_frames)
+        now = time.perf_counter()
+        if not loaded or now - self._load_preview_at >= LOAD_PREVIEW_INTERVAL:
+            self._load_preview_at = now
+            self.update_previews()
+
+    def _load_finished(self, image, durations):
+        self.gif_image = image
+        self._load_progress(durations)
+        layout = core.parse_texture_filename(image.filename)
+        if layout is not None and getattr(image, 'n_frames', 1) == 1:
+            # Importierte Textur: Geschwindigkeit aus dem Dateinamen übernehmen
+            self.framerate_var.set(max(1, round(layout[3])))
+        # Die Bilder liegen im Bildspeicher; die Datei nicht offen halten (unter Windows gesperrt),
+        # gebraucht wird danach nur noch gif_image.filename
+        image.close()
         # Max. Bilder automatisch auf Frame-Anzahl setzen
         self._maxframes_changing = True
         self.maxframes_var.set(self.frame_count)
         self._maxframes_changing = False
-        # Spinbox für Bildnummern-Auswahl updaten
-        # Spinbox immer neu erstellen und ersetzen (maximale Kompatibilität)
-        value = 0
-        self.frame_select_spin.destroy()
-        self.frame_select_spin = ttk.Spinbox(self.add_frame_btn.master, from_=0, to=max(0, self.frame_count-1), textvariable=self.frame_select_var, width=5, state="readonly")
-        self.frame_select_spin.pack(side=tk.LEFT, padx=2, before=self.add_frame_btn)
-        self.frame_select_var.set(value)
-        self.update_previews()
-        self.status.config(text=f"{tr('frame_count', self.lang)}: {self.frame_count}")
+        # Bildnummern-Auswahl, Vorschau und Speicherplan für die vollständige Bildfolge
+        self.frame_select_var.set(0)
+        self._frames_changed()
+        self._show_profile_status()
+
+    def _load_stopped(self, task, file, durations):
+        if task.cancelled and durations:
+            # Abgebrochen: die bis dahin dekodierten Bilder bleiben als Bildfolge erhalten
+            with Image.open(file) as image:
+                self._load_finished(image, durations)
+            self.status.config(text=(tr('load_cancelled', self.lang) or "").format(count=self.frame_count))
+            return
+        self.clear_texture()
+        if task.cancelled:
+            self.status.config(text=tr('task_cancelled', self.lang) or "")
+        else:
+            messagebox.showerror("Fehler", str(task.error))
+
+    def _start_task(self, name, func, *args, on_progress=None, on_done=None, on_error=None):
+        # func(*args, progress=...) im Hintergrund; Fortschritt im Status, Abbrechen per Button oder Esc.
+        # on_error erhält auch den Abbruch (task.cancelled), ohne on_error gibt es eine Meldung
+        if self.tasks.busy:
+            self.status.config(text=tr('task_busy', self.lang) or "")
+            return None
+        self.task_progress.config(value=0, maximum=1)
+        self.task_frame.pack(side=tk.RIGHT, before=self.status)
+
+        def progress(task):
+            self._show_task_progress(task)
+            if on_progress is not None:
+                on_progress(task)
+        return self.tasks.start(name, func, *args, on_progress=progress,
+                                on_done=lambda task: self._task_finished(task, on_done),
+                                on_error=lambda task: self._task_finished(task, on_error))
+
+    def _show_task_progress(self, task):
+        text = tr(f'task_{task.name}', self.lang) or task.name
+        if task.total:
+            self.task_progress.config(maximum=task.total, value=task.done)
+            text += f" {task.done}/{task.total}"
+        self.status.config(text=text)
+
+    def _task_finished(self, task, callback):
+        self.task_frame.pack_forget()
+        self.status.config(text=tr('ready', self.lang) or "")
+        if self._clear_pending and task.cancelled:
+            # Durch Leeren abgebrochen: Teilergebnis (z.B. halb geladene Bildfolge) verwerfen
+            callback = None
+        if callback is not None:
+            callback(task)
+        elif task.cancelled:
+            self.status.config(text=tr('task_cancelled', self.lang) or "")
+        elif task.error is not None:
+            messagebox.showerror("Fehler", str(task.error))
+        if self._clear_pending:
+            self.clear_texture()
+
+    def project_settings(self):
+        # Einstellungs-Schnappschuss für die Projektdatei (JSON)
+        return {
+            'source': self.source_file,
+            'frame_info': self.frame_info,
+            'width': self.width_var.get(),
+            'height': self.height_var.get(),
+            'bg_color': self.bg_color,
+            'bg_box_color': self.bg_box_color,
+            'borderless': self.borderless_var.get(),
+            'framerate': self.framerate_var.get(),
+            'export_format': self.export_format_var.get(),
+            'maxframes': self.maxframes_var.get(),
+            'preview_quality': self.preview_quality_var.get(),
+            'texture_sizes': self.texture_sizes_var.get(),
+            'current_frame': self.current_frame,
+            'effects': {prefix: self.effect_settings(prefix) for prefix in ("gif", "texture")},
+        }
+
+    def apply_project_settings(self, settings):
+        self.source_file = settings['source']
+        count, size, mode = settings['frame_info']
+        self.frame_info = (count, tuple(size), mode)
+        self.width_var.set(settings['width'])
+        self.height_var.set(settings['height'])
+        self.bg_color = settings['bg_color']
+        self.bg_box_color = settings['bg_box_color']
+        self.bg_color_box.config(bg=self.bg_box_color)
+        self.framerate_var.set(settings['framerate'])
+        self.export_format_var.set(settings['export_format'])
+        self.preview_quality_var.set(settings['preview_quality'])
+        self.texture_sizes_var.set(settings['texture_sizes'])
+        self._maxframes_changing = True
+        self.maxframes_var.set(settings['maxframes'])
+        self._maxframes_changing = False
+        for prefix, effects in settings['effects'].items():
+            for key, value in effects.items():
+                self.__dict__[f'{prefix}_{key}'].set(value)
+        self.current_frame = min(settings['current_frame'], max(0, len(self.gif_frames) - 1))
+        # Zuletzt: Randlos aktualisiert sofort die Vorschau (trace), dann mit allen Werten
+        self.borderless_var.set(settings['borderless'])
+
+    def save_project(self):
+        if not self.gif_frames:
+            messagebox.showerror("Fehler", "Kein GIF geladen.")
+            return
+        name = core.texture_basename(self.source_file)
+        file = filedialog.asksaveasfilename(defaultextension=project.EXTENSION, initialfile=name + project.EXTENSION, filetypes=PROJECT_FILETYPES)
+        if not file:
+            return
+        sheet = self._sheet_cache
+        if sheet is not None and self.gif_frames.store.reads_from(file):
+            # Speichern in die geöffnete Projektdatei: das Sheet daraus lösen (den Bildspeicher löst
+            # project.save_project), sonst hält es die Abbildung offen und die Datei ließe sich unter
+            # Windows nicht ersetzen
+            previous = sheet[1]
+            sheet = self._sheet_cache = (sheet[0], previous.copy())
+            if self.texture_image is previous:
+                self.texture_image = sheet[1]
+        # Stand jetzt festhalten (Tk nur hier), geschrieben wird im Hintergrund
+        self._start_task('save_project', project.save_project, file, self.project_settings(), self.gif_frames.store,
+                         self.gif_frames.state(), sheet,
+                         on_done=lambda task: self.status.config(text=tr('project_saved', self.lang) or ""))
+
+    def open_project(self):
+        # Ohne Dekodieren und Sheet-Aufbau: Bilder und Sheet werden aus der Datei abgebildet
+        if self.tasks.busy:
+            self.status.config(text=tr('task_busy', self.lang) or "")
+            return
+        file = filedialog.askopenfilename(filetypes=PROJECT_FILETYPES)
+        if not file:
+            return
+        start = time.perf_counter()
+        try:
+            opened = project.open_project(file)
+        except Exception as e:
+            messagebox.showerror("Fehler", str(e))
+            return
+        self.clear_texture()
+        self.play_btn.config(text=tr('play', self.lang) or "Play ▶")
+        self.gif_frames = opened['timeline']
+        self._sheet_cache = opened['sheet']
+        self.apply_project_settings(opened['settings'])
+        self.memory_budget = None
+        self.update_plan()
+        self._frames_changed()
+        self.status.config(text=(tr('project_opened', self.lang) or "").format(
+            frames=self.frame_count, ms=(time.perf_counter() - start) * 1000))
+
+    def _export_done(self, message):
+        self._show_profile_status()
+        messagebox.showinfo("Info", message)
+
+    def update_plan(self, frame_store=None):
+        # Plan für die aktuelle Texturgröße; der Bildspeicher bleibt nach dem Laden fest
+        if self.frame_info is None:
+            self.plan = None
+            return
+        if frame_store is None:
+            frame_store = self.gif_frames.backing if hasattr(self.gif_frames, 'backing') else 'auto'
+        frame_count, frame_size, mode = self.frame_info
+        frame_count = len(self.gif_frames) or frame_count
+        if self.memory_budget is None:
+            self.memory_budget = planner.memory_budget()
+        self.plan = planner.choose(frame_count, frame_size, mode, self.texture_size(), self.preview_size(), self.memory_budget,
+                                   frame_store=frame_store)
+
+    def _show_plan_status(self):
+        text = f"{tr('frame_count', self.lang)}: {self.frame_count} ({self.gif_frames.nbytes() / (1024 * 1024):.1f} MB)"
+        if self.plan is not None:
+            text += " · " + (tr('memory_plan', self.lang) or "").format(
+                store=tr(f'plan_{self.plan.frame_store}', self.lang), sheet=tr(f'plan_{self.plan.sheet}', self.lang),
+                peak=planner.format_bytes(self.plan.peak), budget=planner.format_bytes(self.plan.budget))
+            if not self.plan.fits():
+                text += " – " + tr('plan_over_budget', self.lang)
+        self.status.config(text=text)
+
+    def release_frames(self):
+        # Nur ohne laufende Aufgabe aufrufen: Laden/Exportieren liest oder füllt diesen Bildspeicher
+        # (Laden/Öffnen sind währenddessen gesperrt, clear_texture wartet auf das Ende)
+        self.task_frame.pack_forget()
+        if hasattr(self.gif_frames, 'close'):
+            self.gif_frames.close()
+        self.gif_frames = []
+        self._sheet_cache = None
+        core.TILE_CACHE.clear()
 
 
     def clear_texture(self):
+        if self.tasks.busy:
+            # Nicht im Tk-Thread auf die Aufgabe warten (Kodieren meldet keinen Fortschritt und
+            # wäre nicht abbrechbar): abbrechen und nach ihrem Ende leeren (_task_finished)
+            self._clear_pending = True
+            self.tasks.cancel()
+            self.status.config(text=tr('task_cancelling', self.lang) or "")
+            return
+        self._clear_pending = False
+        self._cancel_animation_timer()
+        self.playing = False
         self.texture_image = None
         self.texture_canvas.config(image="")
         self.gif_image = None
-        self.gif_frames = []
+        self.source_file = None
+        self.release_frames()
+        self.plan = None
+        self.frame_info = None
+        self.frame_durations = []
         self.frame_count = 0
         self.current_frame = 0
         self.gif_canvas.config(image="")
@@ -626,7 +1058,11 @@ class ModernApp:
             self.gif_canvas.config(image="")
             self.show_texture()
             return
-        frame = self.gif_frames[self.current_frame]
+        self._render_gif_preview()
+        self.show_texture()
+
+    def _render_gif_preview(self):
+        # Nur die GIF-Vorschau; die Textur hängt nicht vom aktuellen Bild ab
         # Canvas-Größe bestimmen
         self.gif_canvas.update_idletasks()
         canvas_w = self.gif_canvas.winfo_width()
@@ -640,112 +1076,123 @@ class ModernApp:
         max_h = min(canvas_h, texture_h) if texture_h > 10 else canvas_h
         if max_w < 10 or max_h < 10:
             max_w, max_h = 256, 256
-        frame = frame.resize((max_w, max_h), Image.Resampling.LANCZOS)
-        frame = self.apply_effects(frame, prefix="gif")
+        # Skalieren und Effekte über den Kachel-Cache: beim Abspielen in der Schleife wird jedes
+        # Bild nur einmal verarbeitet, solange Größe und Effekte gleich bleiben
+        frame = core.render_frame_tile(self.gif_frames, self.current_frame, max_w, max_h, self.effect_settings("gif"),
+                                       quality=self.preview_quality(moving=self.playing))
         img = ImageTk.PhotoImage(frame)
         self._gif_img_ref = img
         self.gif_canvas.config(image=img)
-        self.show_texture()
 
 
     def show_texture(self):
         if not self.gif_frames:
             self.texture_canvas.config(image="")
             return
-        import math, os
+        canvas_w, canvas_h = self.preview_size()
+        previous = self.plan.sheet if self.plan is not None else None
+        self.update_plan()
+        quality = self.preview_quality()
+        if (self.plan is not None and self.plan.streaming) or quality != 'final':
+            # Über Budget oder schnelle Vorschau: Sheet nur in Vorschaugröße aufbauen,
+            # das volle Sheet (immer Final) entsteht erst beim Speichern
+            tiles_x, tiles_y = core.grid_size(len(self.gif_frames))
+            sheet = self._cached_sheet((max(canvas_w, tiles_x), max(canvas_h, tiles_y)), quality)
+            self.texture_image = None
+        else:
+            sheet = self._cached_sheet(self.texture_size(), 'final')
+            self.texture_image = sheet
+        if self.plan is not None and self.plan.sheet != previous:
+            self._show_plan_status()
+        # Vorschau immer auf Canvas-Größe skalieren, unabhängig von tex_w/tex_h
+        with PROFILER.stage("preview") as st:
+            preview = core.resize(sheet, (canvas_w, canvas_h), quality)
+            st.add_image(preview)
+        img = ImageTk.PhotoImage(preview)
+        self._texture_img_ref = img
+        self.texture_canvas.config(image=img)
+        self._show_profile_status()
+
+
+    def texture_size(self):
         tex_w = self.width_var.get() if self.width_var.get() > 0 else 2048
         tex_h = self.height_var.get() if self.height_var.get() > 0 else 2048
-        frame_count = self.frame_count
-        tiles_x = math.ceil(math.sqrt(frame_count))
-        tiles_y = math.ceil(frame_count / tiles_x)
-        # Kachelgröße berechnen, damit alle Tiles in tex_w x tex_h passen
-        tile_w = tex_w // tiles_x
-        tile_h = tex_h // tiles_y
-        # Hintergrundfarbe übernehmen
-        from PIL import ImageColor
-        bg_rgba = (0,0,0,0)
-        try:
-            bg_rgba = ImageColor.getcolor(self.bg_color, "RGBA")
-        except Exception:
-            pass
-        sheet = Image.new("RGBA", (tex_w, tex_h), bg_rgba)
-        for idx, frame in enumerate(self.gif_frames):
-            tx = idx % tiles_x
-            ty = idx // tiles_x
-            f = frame.resize((tile_w, tile_h), Image.Resampling.LANCZOS)
-            f = self.apply_effects(f, prefix="texture")
-            x = tx * tile_w
-            y = ty * tile_h
-            sheet.paste(f, (x, y))
-        # Randlos: Transparente Ränder rechts/unten entfernen
-        if hasattr(self, 'borderless_var') and self.borderless_var.get():
-            bbox = sheet.getbbox()
-            if bbox:
-                sheet = sheet.crop(bbox)
-        self.texture_image = sheet
-        # Canvas-Größe bestimmen
+        return tex_w, tex_h
+
+    def texture_sizes(self):
+        # Variantenbreiten aus dem Eingabefeld, nur kleiner als die Texturbreite
+        tex_w = self.texture_size()[0]
+        sizes = [int(s) for s in self.texture_sizes_var.get().replace(',', ' ').split() if s.isdigit()]
+        return [s for s in sizes if 0 < s < tex_w]
+
+    def preview_size(self):
+        # Canvas-Größe der Textur-Vorschau
         self.texture_canvas.update_idletasks()
         canvas_w = self.texture_canvas.winfo_width()
         canvas_h = self.texture_canvas.winfo_height()
         if canvas_w < 10 or canvas_h < 10:
             canvas_w, canvas_h = 256, 256
-        # Vorschau immer auf Canvas-Größe skalieren, unabhängig von tex_w/tex_h
-        preview = sheet.resize((canvas_w, canvas_h), Image.Resampling.LANCZOS)
-        img = ImageTk.PhotoImage(preview)
-        self._texture_img_ref = img
-        self.texture_canvas.config(image=img)
+        return canvas_w, canvas_h
+
+    def preview_quality(self, moving=False):
+        # Resampling-Stufe der Vorschauen (core.QUALITIES)
+        choice = {"Draft": 'draft', "Balanced": 'balanced', "Final": 'final'}.get(self.preview_quality_var.get())
+        if choice:
+            return choice
+        return 'draft' if moving else 'balanced'
+
+    def _sheet_key(self, size, quality):
+        # Alles, wovon das Sheet abhängt: Bildfolge, Größe, Qualität, Effekt-Plan, Hintergrund, Randlos.
+        # Als Prüfsumme auch in Projektdateien verwendbar
+        borderless = bool(hasattr(self, 'borderless_var') and self.borderless_var.get())
+        key = (list(self.gif_frames.ids), list(size), quality, core.compile_plan(self.effect_settings("texture")).key,
+               self.bg_color, borderless)
+        return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+    def _cached_sheet(self, size, quality):
+        # Sheet nur neu aufbauen, wenn sich etwas geändert hat (Bildwechsel in der GIF-Vorschau,
+        # Sprachwechsel usw. brauchen es nicht); nach dem Öffnen eines Projekts kommt es aus der Datei
+        key = self._sheet_key(size, quality)
+        if self._sheet_cache is None or self._sheet_cache[0] != key:
+            self._sheet_cache = (key, self.compose_texture(size, quality))
+        return self._sheet_cache[1]
+
+    def compose_texture(self, size=None, quality='final'):
+        tex_w, tex_h = size or self.texture_size()
+        borderless = hasattr(self, 'borderless_var') and self.borderless_var.get()
+        return core.compose_sheet(self.gif_frames, tex_w, tex_h, self.effect_settings("texture"), self.bg_color, borderless,
+                                  quality=quality)
 
 
     def update_previews(self):
         self.show_gif_frame()
 
 
-    def apply_effects(self, img, prefix):
-        from PIL import ImageEnhance, ImageFilter
-        # Graustufen
-        if self.__dict__[f'{prefix}_grayscale'].get():
-            img = img.convert("L").convert("RGBA")
-        else:
-            if img.mode != "RGBA":
-                img = img.convert("RGBA")
-        # Schärfen
-        if self.__dict__[f'{prefix}_sharpen'].get():
-            factor = self.__dict__[f'{prefix}_sharpen_value'].get()
-            img = ImageEnhance.Sharpness(img).enhance(factor)
-        # Blur
-        if self.__dict__[f'{prefix}_blur'].get():
-            radius = self.__dict__[f'{prefix}_blur_value'].get()
-            if radius > 0:
-                img = img.filter(ImageFilter.GaussianBlur(radius))
-        # Transparenz
-        if self.__dict__[f'{prefix}_transparency'].get():
-            value = self.__dict__[f'{prefix}_transparency_value'].get()
-            # value: 0.0 (voll transparent) bis 1.0 (keine Änderung)
-            alpha = img.split()[-1].point(lambda p: int(p * value))
-            img.putalpha(alpha)
-
-        # Farbintensität (Pastell <-> Kräftig) nur wenn Checkbox aktiv
-        if self.__dict__[f'{prefix}_colorintensity_active'].get():
-            colorint = self.__dict__[f'{prefix}_colorintensity'].get()
-            # colorint: 0.0 = Pastell, 1.0 = Kräftig, 0.5 = neutral
-            if colorint != 0.5:
-                if colorint < 0.5:
-                    # Pastell: Interpolieren zu Weiß
-                    import numpy as np
-                    arr = np.array(img).astype(float)
-                    factor = colorint * 2  # 0.0...1.0
-                    arr[..., :3] = arr[..., :3] * factor + 255 * (1 - factor)
-                    if img.mode == "RGBA" or (arr.shape[-1] == 4):
-                        img = Image.fromarray(np.clip(arr, 0, 255).astype('uint8'), "RGBA")
-                    else:
-                        img = Image.fromarray(np.clip(arr, 0, 255).astype('uint8'), "RGB")
-                else:
-                    # Kräftig: Pillow-Optimierung
-                    from PIL import ImageEnhance
-                    # colorint 0.5...1.0 → Faktor 1.0...2.0
-                    factor = 1.0 + (colorint - 0.5) * 2
-                    img = ImageEnhance.Color(img).enhance(factor)
-        return img
+    def _show_profile_status(self):
+        # Live-Anzeige der Stufenzeiten, nur wenn Profiling aktiv ist
+        if PROFILER.enabled:
+            self.status.config(text=PROFILER.format_summary())
+
+    def toggle_profiling(self):
+        PROFILER.enabled = bool(self.profiling_var.get())
+        PROFILER.reset()
+        if not PROFILER.enabled:
+            self.status.config(text=tr('ready', self.lang) or "")
+
+    def export_trace(self):
+        file = filedialog.asksaveasfilename(defaultextension=".json", initialfile="ossl2gif_trace.json", filetypes=[("Chrome Trace", "*.json")])
+        if not file:
+            return
+        try:
+            PROFILER.export_chrome_trace(file)
+            messagebox.showinfo("Info", "Trace exportiert.")
+        except Exception as e:
+            messagebox.showerror("Fehler", str(e))
+
+
+    def effect_settings(self, prefix):
+        # Aktuelle Werte der Effekt-Variablen eines Panels als dict für core.apply_effects
+        return {key: self.__dict__[f'{prefix}_{key}'].get() for key in core.EFFECT_DEFAULTS}
 
 
     def save_gif(self):
@@ -755,82 +1202,184 @@ class ModernApp:
         file = filedialog.asksaveasfilename(defaultextension=".gif", filetypes=[("GIF", "*.gif")])
         if not file:
             return
-        # Speichere animiertes GIF mit Pillow
-        try:
-            frames = [self.apply_effects(f.resize((self.width_var.get(), self.height_var.get())), "gif") for f in self.gif_frames]
-            # Framerate aus Spinbox übernehmen (ms/Bild)
-            duration = self.framerate_var.get()
-            frames[0].save(file, save_all=True, append_images=frames[1:], loop=0, duration=duration)
-            messagebox.showinfo("Info", "GIF gespeichert.")
-        except Exception as e:
-            messagebox.showerror("Fehler", str(e))
+        # Speichere animiertes GIF mit Pillow im Hintergrund; Einstellungen jetzt lesen (Tk nur hier),
+        # die Bildfolge als feste Fassung, damit weiter bearbeitet werden kann
+        # Framerate aus Spinbox übernehmen (ms/Bild)
+        duration = self.framerate_var.get()
+        self._start_task('save_gif', core.save_gif, self.gif_frames.snapshot(), file, self.width_var.get(), self.height_var.get(),
+                         self.effect_settings("gif"), duration, on_done=lambda task: self._export_done("GIF gespeichert."))
 
 
     def save_texture(self):
-        if self.texture_image is None:
+        if self.texture_image is None and not self.gif_frames:
             messagebox.showerror("Fehler", "Keine Textur vorhanden.")
             return
-        name = "texture"
-        if self.gif_image and hasattr(self.gif_image, 'filename'):
-            import os
-            name = os.path.splitext(os.path.basename(self.gif_image.filename))[0]
-        frame_count = self.frame_count
-        tiles_x = math.ceil(math.sqrt(frame_count))
-        tiles_y = math.ceil(frame_count / tiles_x)
+        if self.plan is not None and self.plan.streaming and not core.can_stream_texture(self.export_format_var.get()):
+            # Über dem Budget entsteht das Sheet nur streifenweise, und das kann nur PNG
+            messagebox.showerror("Fehler", tr('plan_png_only', self.lang))
+            return
+        name = core.texture_basename(self.source_file)
+        tiles_x, tiles_y = core.grid_size(self.frame_count)
         # Geschwindigkeit aus Framerate übernehmen (ms/Bild als float mit Komma)
         speed_val = self.framerate_var.get()
-        # Format wie '10;0' für 10sec
-        speed = f"{speed_val};0"
         # Dateiendung und Filetype passend zum gewählten Exportformat
         ext = self.export_format_var.get().lower()
         defext = f".{ext}"
         filetypes = [(ext.upper(), f"*.{ext}") for ext in ["png", "jpg", "bmp"]]
-        file = filedialog.asksaveasfilename(defaultextension=defext, initialfile=f"{name};{tiles_x};{tiles_y};{speed}.{ext}", filetypes=filetypes)
+        file = filedialog.asksaveasfilename(defaultextension=defext, initialfile=core.texture_filename(name, tiles_x, tiles_y, speed_val, ext), filetypes=filetypes)
         if not file:
             return
-        # Exportformat aus Combobox übernehmen
-        fmt = self.export_format_var.get().upper()
-        if fmt == "JPG":
-            fmt = "JPEG"
-        try:
-            img = self.texture_image
-            if fmt == "JPEG":
-                img = img.convert("RGB")
-            img.save(file, format=fmt)
-            messagebox.showinfo("Info", "Textur gespeichert.")
-        except Exception as e:
-            messagebox.showerror("Fehler", str(e))
+        # Exportformat aus Combobox übernehmen; alle Einstellungen jetzt lesen, gerechnet wird im Hintergrund
+        fmt = self.export_format_var.get()
+        tex_w, tex_h = self.texture_size()
+        effects = self.effect_settings("texture")
+        bg_color = self.bg_color
+        borderless = hasattr(self, 'borderless_var') and self.borderless_var.get()
+        sizes = self.texture_sizes()
+        # Varianten heißen wie die gewählte Datei (name_BREITE;X;Y;...), nicht wie die Quelle
+        variant_name = core.texture_basename(file)
+        sheet = self.texture_image
+        frames = self.gif_frames.snapshot() if self.gif_frames else None
+        # Streifenweise nur, wenn das volle Sheet nicht ins Budget passt oder sehr groß ist (wie cli.py);
+        # sonst ist Aufbauen + Kodieren im Ganzen schneller
+        stream = ((self.plan is not None and self.plan.streaming) or tex_w * tex_h >= core.STREAM_MIN_PIXELS) \
+            and core.can_stream_texture(fmt)
+
+        def work(progress):
+            full = sheet
+            if full is None and stream:
+                # Volles Sheet als PNG Kachelreihe für Kachelreihe direkt in die Datei
+                try:
+                    core.save_texture_streaming(frames, file, tex_w, tex_h, effects, bg_color, borderless, progress)
+                except Cancelled:
+                    # Abgebrochen: keine halb geschriebene Textur liegen lassen
+                    try:
+                        os.remove(file)
+                    except OSError:
+                        pass
+                    raise
+            else:
+                if full is None:
+                    # Vorschau war kleiner oder nicht in Final-Qualität: volles Sheet hier aufbauen
+                    full = core.compose_sheet(frames, tex_w, tex_h, effects, bg_color, borderless, progress=progress,
+                                              quality='final')
+                core.save_texture(full, file, fmt)
+            if sizes:
+                # Varianten aus dem gespeicherten Sheet ableiten; nach Streaming nur die größte neu aufbauen
+                if full is None:
+                    full = core.compose_sheet(frames, max(sizes), round(tex_h * max(sizes) / tex_w), effects, bg_color, borderless,
+                                              progress=progress)
+                core.save_texture_variants(core.sheet_pyramid(full, sizes), os.path.dirname(file), variant_name, tiles_x, tiles_y,
+                                           speed_val, fmt)
+        self._start_task('save_texture', work, on_done=lambda task: self._export_done("Textur gespeichert."))
 
 
     def export_lsl(self):
         if not self.gif_frames:
             messagebox.showerror("Fehler", "Kein GIF geladen.")
             return
-        import math, os
-        frame_count = self.frame_count
-        tiles_x = math.ceil(math.sqrt(frame_count))
-        tiles_y = math.ceil(frame_count / tiles_x)
-        name = "texture"
-        if self.gif_image and hasattr(self.gif_image, 'filename'):
-            name = os.path.splitext(os.path.basename(self.gif_image.filename))[0]
+        tiles_x, tiles_y = core.grid_size(self.frame_count)
+        name = core.texture_basename(self.source_file)
         speed = 10.0
-        lsl = self.generate_lsl_script(name, tiles_x, tiles_y, speed)
+        with PROFILER.stage("lsl"):
+            lsl = self.generate_lsl_script(name, tiles_x, tiles_y, speed)
         file = filedialog.asksaveasfilename(defaultextension=".lsl", initialfile=f"{name}.lsl", filetypes=[("LSL", "*.lsl"), ("Text", "*.txt")])
         if not file:
             return
-        try:
+
+        def work(progress):
+            # Schreiben im Hintergrund (z.B. langsames Netzlaufwerk)
+            progress(0, 1)
             with open(file, "w", encoding="utf-8") as f:
                 f.write(lsl)
-            messagebox.showinfo("Info", "LSL-Skript exportiert.")
-        except Exception as e:
-            messagebox.showerror("Fehler", str(e))
+        self._start_task('export_lsl', work, on_done=lambda task: messagebox.showinfo("Info", "LSL-Skript exportiert."))
 
     # def generate_lsl_script(self, name, tiles_x, tiles_y, speed):
     #     return f'''// LSL Texture Animation Script\n// Generated by OSSL2Gif\n// Texture: {name};{tiles_x};{tiles_y};{speed}\n\ninteger animOn = TRUE;\nlist effects = [LOOP];\ninteger movement = 0;\ninteger face = ALL_SIDES;\ninteger sideX = {tiles_x};\ninteger sideY = {tiles_y};\nfloat start = 0.0;\nfloat length = 0.0;\nfloat speed = {speed};\n\ninitAnim() {{\n    if(animOn) {{\n        integer effectBits;\n        integer i;\n        for(i = 0; i < llGetListLength(effects); i++) {{\n            effectBits = (effectBits | llList2Integer(effects,i));\n        }}\n        integer params = (effectBits|movement);\n        llSetTextureAnim(ANIM_ON|params,face,sideX,sideY,start,length,speed);\n    }}\n    else {{\n        llSetTextureAnim(0,face,sideX,sideY,start,length,speed);\n    }}\n}}\n\nfetch() {{\n     string texture = llGetInventoryName(INVENTORY_TEXTURE,0);\n            llSetTexture(texture,face);\n            list data  = llParseString2List(texture,";",[]);\n            string X = llList2String(data,1);\n            string Y = llList2String(data,2);\n            string Z = llList2String(data,3);\n            sideX = (integer) X;\n            sideY = (integer) Y;\n            speed = (float) Z;\n            if (speed) \n                initAnim();\n}}\n\ndefault\n{{\n    state_entry()\n    {{\n        llSetTextureAnim(FALSE, face, 0, 0, 0.0, 0.0, 1.0);\n        fetch();\n    }}\n    changed(integer what)\n    {{\n        if (what & CHANGED_INVENTORY)\n        {{\n            fetch();\n        }}\n    }}\n}}\n'''
 
     def generate_lsl_script(self, name, tiles_x, tiles_y, speed):
-        length = tiles_x * tiles_y
-        return f'''// LSL Texture Animation Script\n// Generated by OSSL2Gif\n// Texture: {name};{tiles_x};{tiles_y};{speed}\n\ninteger animOn = TRUE;\nlist effects = [LOOP];\ninteger movement = 0;\ninteger face = ALL_SIDES;\ninteger sideX = {tiles_x};\ninteger sideY = {tiles_y};\nfloat start = 0.0;\nfloat length = {length};\nfloat speed = {speed};\n\ninitAnim() {{\n    if(animOn) {{\n        integer effectBits;\n        integer i;\n        for(i = 0; i < llGetListLength(effects); i++) {{\n            effectBits = (effectBits | llList2Integer(effects,i));\n        }}\n        integer params = (effectBits|movement);\n        llSetTextureAnim(ANIM_ON|params,face,sideX,sideY,start,length,speed);\n    }}\n    else {{\n        llSetTextureAnim(0,face,sideX,sideY,start,length,speed);\n    }}\n}}\n\nfetch() {{\n     string texture = llGetInventoryName(INVENTORY_TEXTURE,0);\n            llSetTexture(texture,face);\n            // llParseString2List braucht als Trennzeichen eine Liste!\n            list data  = llParseString2List(texture,[";"],[]);\n            string X = llList2String(data,1);\n            string Y = llList2String(data,2);\n            string Z = llList2String(data,3);\n            sideX = (integer) X;\n            sideY = (integer) Y;\n            speed = (float) Z;\n            length = (float)(sideX * sideY);\n            if (speed) \n                initAnim();\n}}\n\ndefault\n{{\n    state_entry()\n    {{\n        llSetTextureAnim(FALSE, face, 0, 0, 0.0, 0.0, 1.0);\n        fetch();\n    }}\n    changed(integer what)\n    {{\n        if (what & CHANGED_INVENTORY)\n        {{\n            fetch();\n        }}\n    }}\n}}\n'''
+        return core.generate_lsl_script(name, tiles_x, tiles_y, speed)
+
+    def export_atlas(self):
+        # Mehrere GIFs in eine Atlas-Textur packen; Bildgröße = Obergrenze, LSL-Skript daneben.
+        # Laden und Packen im Hintergrund, danach Dateiname (Raster steht dann fest), dann Kodieren
+        if self.tasks.busy:
+            self.status.config(text=tr('task_busy', self.lang) or "")
+            return
+        files = filedialog.askopenfilenames(filetypes=ANIMATION_FILETYPES)
+        if not files:
+            return
+        tex_w, tex_h = self.texture_size()
+        borderless = hasattr(self, 'borderless_var') and self.borderless_var.get()
+        effects = self.effect_settings("texture")
+        bg_color = self.bg_color
+
+        def work(progress):
+            animations = atlas.load_animations(files, progress)
+            return atlas.pack(animations, effects, bg_color, tex_w, tex_h, borderless, progress)
+        self._start_task('atlas', work, on_done=lambda task: self._save_atlas(task.result))
+
+    def _save_atlas(self, packed):
+        cols, rows = packed['grid']
+        ext = self.export_format_var.get().lower()
+        file = filedialog.asksaveasfilename(defaultextension=f".{ext}", initialfile=core.texture_filename("atlas", cols, rows, self.framerate_var.get(), ext),
+                                            filetypes=[(ext.upper(), f"*.{ext}")])
+        if not file:
+            return
+        name = os.path.basename(file).split(";")[0].rsplit(".", 1)[0] or "atlas"
+        speed_val = self.framerate_var.get()
+        fmt = self.export_format_var.get()
+
+        def work(progress):
+            # Kodieren meldet keinen Fortschritt (ein Schritt)
+            progress(0, 1)
+            return atlas.save_atlas(packed, os.path.dirname(file), name, speed_val, fmt)
+
+        def done(task):
+            atlas_w, atlas_h = packed['image'].size
+            self.status.config(text=(tr('atlas_status', self.lang) or "").format(
+                count=len(packed['entries']), frames=sum(e['length'] for e in packed['entries']), w=atlas_w, h=atlas_h, cols=cols, rows=rows))
+            self._show_profile_status()
+        self._start_task('save_atlas', work, on_done=done)
+
+    def export_static(self):
+        # Statischen Hintergrund abtrennen: Hintergrund-Textur, Sheet nur des bewegten
+        # Ausschnitts und Zwei-Prim-LSL-Skript in einen Ordner schreiben
+        if self.tasks.busy:
+            # Auch während des Ladens: die Bildfolge wächst dann noch
+            self.status.config(text=tr('task_busy', self.lang) or "")
+            return
+        if not self.gif_frames:
+            messagebox.showerror("Fehler", "Kein GIF geladen.")
+            return
+        outdir = filedialog.askdirectory()
+        if not outdir:
+            return
+        # Einstellungen und Bildfolge (feste Fassung) jetzt lesen, gerechnet wird im Hintergrund
+        tex_w, tex_h = self.texture_size()
+        effects = self.effect_settings("texture")
+        bg_color = self.bg_color
+        name = core.texture_basename(self.source_file)
+        speed_val = self.framerate_var.get()
+        fmt = self.export_format_var.get()
+        frames = self.gif_frames.snapshot()
+
+        def work(progress):
+            split = core.split_static(frames, tex_w, tex_h, effects, bg_color, progress)
+            core.save_static_split(split, outdir, name, speed_val, fmt)
+            return split
+        self._start_task('static', work, on_done=lambda task: self._static_done(task.result))
+
+    def _static_done(self, split):
+        if split['region'] is None:
+            self.status.config(text=tr('static_none', self.lang))
+        else:
+            left, top, right, bottom = split['region']
+            frame_w, frame_h = split['frame_size']
+            self.status.config(text=(tr('static_region', self.lang) or "").format(
+                w=right - left, h=bottom - top, fw=frame_w, fh=frame_h,
+                percent=100.0 * (right - left) * (bottom - top) / (frame_w * frame_h)))
+        self._show_profile_status()
 
 
 if __name__ == "__main__":
@@ -838,5 +1387,11 @@ if __name__ == "__main__":
         root = tb.Window(themename="superhero")
     else:
         root = tk.Tk()
+        # Voreinstellungen ermitteln (erst hier, nicht beim Import)
+        print(f"Tastaturlayout erkannt: {get_keyboard_layout()}")
+        print(f"Systemsprache erkannt: {get_system_language()}")
     app = ModernApp(root)
+    if "--startup-probe" in sys.argv:
+        # Startzeit messen (benchmark.py --startup): Fenster aufbauen und sofort beenden
+        root.after_idle(root.destroy)
     root.mainloop()
@@ -0,0 +1,155 @@
+# OSSL2Gif - Speicherbudget: Spitzenbedarf schätzen und Ausführungsstrategie wählen
+# Vor dem Dekodieren wird aus Bildanzahl und -größe abgeschätzt, was Einzelbilder, das
+# Sprite-Sheet (Image.new) und die Vorschau zusammen belegen. Passt das nicht ins Budget,
+# werden die Einzelbilder ausgelagert (memmap) und/oder die Textur-Vorschau verkleinert
+# aufgebaut; das volle Sheet entsteht dann erst beim Speichern.
+#
+# Budget: OSSL2GIF_MEMORY_BUDGET (z.B. "1500", "512M", "4G"; ohne Einheit MB),
+# sonst ein Anteil des freien Arbeitsspeichers.
+
+import math
+import os
+import sys
+
+from PIL import Image
+
+from lazyimport import lazy_import
+
+core = lazy_import("core")
+
+BUDGET_ENV = "OSSL2GIF_MEMORY_BUDGET"
+# Anteil des freien Arbeitsspeichers, wenn kein Budget gesetzt ist
+BUDGET_FRACTION = 0.75
+# Annahme, wenn der freie Speicher nicht ermittelt werden kann
+FALLBACK_MEMORY = 4 * 1024 ** 3
+UNITS = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+# Byte je Pixel im FrameStore: Palette/Graustufen als Index, sonst schlimmstenfalls RGBA
+STORE_BYTES_PER_PIXEL = {'P': 1, 'L': 1}
+
+FRAME_STORES = ('auto', 'memory', 'memmap')
+
+
+def parse_size(text):
+    # "512M" -> 536870912; Zahl ohne Einheit = MB
+    text = str(text).strip().upper().rstrip('B')
+    if text and text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(float(text) * UNITS['M'])
+
+
+def available_memory():
+    # Freier Arbeitsspeicher in Byte (None, wenn unbekannt)
+    if sys.platform.startswith("win"):
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                        ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                        ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                        ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                        ('ullAvailExtendedVirtual', ctypes.c_ulonglong)]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(status)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys
+        return None
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def memory_budget():
+    value = os.environ.get(BUDGET_ENV)
+    if value:
+        return parse_size(value)
+    return int((available_memory() or FALLBACK_MEMORY) * BUDGET_FRACTION)
+
+
+def probe(source):
+    # Nur den Dateikopf lesen: (Bildanzahl, (Breite, Höhe), Modus)
+    with Image.open(source) as img:
+        layout = core.parse_texture_filename(source) if isinstance(source, str) else None
+        if layout is not None and getattr(img, 'n_frames', 1) == 1:
+            # Importiertes Sprite-Sheet: Kacheln als Einzelbilder (RGBA-Ansichten)
+            _, tiles_x, tiles_y, _ = layout
+            return tiles_x * tiles_y, (img.width // tiles_x, img.height // tiles_y), 'RGBA'
+        return getattr(img, 'n_frames', 1), img.size, img.mode
+
+
+def estimate(frame_count, frame_size, mode, tex_size, preview_size):
+    # Geschätzter Bedarf in Byte je Posten (volles Sheet, Einzelbilder im RAM)
+    w, h = frame_size
+    tex_w, tex_h = tex_size
+    # Kachelraster wie core.grid_size
+    tiles_x = max(1, math.ceil(math.sqrt(frame_count)))
+    tiles_y = max(1, math.ceil(frame_count / tiles_x))
+    tile_bytes = (tex_w // tiles_x) * (tex_h // tiles_y) * 4
+    return {
+        'frames': frame_count * w * h * STORE_BYTES_PER_PIXEL.get(mode, 4),
+        # Dekodiertes Bild + eine ausgepackte RGBA-Ansicht
+        'decode': w * h * 8,
+        # Image.new-Sheet + verkleinerte Kachel + Effekt-Kopie
+        'sheet': tex_w * tex_h * 4 + 2 * tile_bytes,
+        # Verkleinertes Sheet + PhotoImage
+        'preview': preview_size[0] * preview_size[1] * 8,
+    }
+
+
+class Plan:
+    def __init__(self, frame_store, sheet, estimate, budget):
+        self.frame_store = frame_store      # 'memory' oder 'memmap'
+        self.sheet = sheet                  # 'full' oder 'streaming' (Vorschau verkleinert, Sheet erst beim Speichern)
+        self.estimate = estimate
+        self.budget = budget
+
+    @property
+    def streaming(self):
+        return self.sheet == 'streaming'
+
+    @property
+    def peak(self):
+        # Spitzenbedarf des gewählten Plans
+        e = self.estimate
+        frames = e['frames'] if self.frame_store == 'memory' else 0
+        sheet = e['sheet'] if self.sheet == 'full' else e['preview']
+        return frames + e['decode'] + sheet + e['preview']
+
+    def fits(self):
+        return self.peak <= self.budget
+
+
+def choose(frame_count, frame_size, mode, tex_size, preview_size, budget=None, frame_store='auto'):
+    # Einfachster Plan, der ins Budget passt: erst Bilder auslagern, dann Sheet streamen
+    if budget is None:
+        budget = memory_budget()
+    e = estimate(frame_count, frame_size, mode, tex_size, preview_size)
+    stores = ['memory', 'memmap'] if frame_store == 'auto' else [frame_store]
+    plan = None
+    for sheet in ('full', 'streaming'):
+        for store in stores:
+            plan = Plan(store, sheet, e, budget)
+            if plan.fits():
+                return plan
+    # Passt gar nicht: sparsamster Plan, der Status zeigt die Überschreitung
+    return plan
+
+
+def plan_file(source, tex_size, preview_size, budget=None, frame_store='auto'):
+    frame_count, frame_size, mode = probe(source)
+    return choose(frame_count, frame_size, mode, tex_size, preview_size, budget, frame_store)
+
+
+def format_bytes(value):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if value < 1024 or unit == 'GB':
+            return f"{value:.0f} {unit}" if unit == 'B' else f"{value:.1f} {unit}"
+        value /= 1024
@@ -0,0 +1,128 @@
+# OSSL2Gif - Inkrementeller PNG-Encoder
+# Nimmt ein Bild streifenweise entgegen (z.B. eine Kachelreihe des Sprite-Sheets) und schreibt
+# gefilterte, mit zlib komprimierte IDAT-Daten sofort in die Datei. Im Speicher liegt damit
+# nur der aktuelle Streifen, nie das ganze Bild.
+# Zeilenfilter wie bei libpng/Pillow adaptiv je Zeile (None/Sub/Up/Average/Paeth).
+
+import struct
+import zlib
+
+from lazyimport import lazy_import
+
+np = lazy_import("numpy")
+
+SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# PNG-Farbtyp und Byte je Pixel
+COLOR_TYPES = {'RGB': (2, 3), 'RGBA': (6, 4)}
+# Zeilen je Filterblock: begrenzt die Zwischenpuffer auf einige MB
+FILTER_BLOCK_BYTES = 1 << 20
+IDAT_SIZE = 1 << 16
+
+
+class PNGStreamWriter:
+    def __init__(self, file, width, height, mode="RGBA", compress_level=6):
+        if mode not in COLOR_TYPES:
+            raise ValueError(f"PNG-Streaming unterstützt nur RGB/RGBA, nicht {mode}")
+        self.width = width
+        self.height = height
+        self.mode = mode
+        color_type, self.bpp = COLOR_TYPES[mode]
+        self.stride = width * self.bpp
+        self._own = isinstance(file, str)
+        self._file = open(file, "wb") if self._own else file
+        self._zlib = zlib.compressobj(compress_level)
+        self._pending = []
+        self._pending_size = 0
+        self._prev = np.zeros(self.stride, dtype=np.uint8)
+        self.rows_written = 0
+        self._file.write(SIGNATURE)
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._own:
+            self._file.close()
+
+    def _chunk(self, kind, data):
+        self._file.write(struct.pack(">I", len(data)))
+        self._file.write(kind)
+        self._file.write(data)
+        self._file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)) & 0xFFFFFFFF))
+
+    def _emit(self, data, flush=False):
+        # Komprimierte Daten in IDAT-Blöcken üblicher Größe schreiben
+        if data:
+            self._pending.append(data)
+            self._pending_size += len(data)
+        if self._pending_size >= IDAT_SIZE or (flush and self._pending_size):
+            self._chunk(b"IDAT", b"".join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+
+    def write(self, strip):
+        # strip: PIL-Bild (Breite = width) oder uint8-Array (Zeilen x Breite x Kanäle)
+        is_image = hasattr(strip, 'mode')
+        if is_image and strip.mode != self.mode:
+            strip = strip.convert(self.mode)
+        height = strip.height if is_image else len(strip)
+        if self.rows_written + height > self.height:
+            raise ValueError("Mehr Zeilen als im PNG-Kopf angegeben")
+        block = max(1, FILTER_BLOCK_BYTES // self.stride)
+        for start in range(0, height, block):
+            # Bilder blockweise auspacken, damit keine Kopie des ganzen Streifens entsteht
+            if is_image:
+                rows = np.asarray(strip.crop((0, start, self.width, min(height, start + block))))
+            else:
+                rows = strip[start:start + block]
+            rows = rows.reshape(-1, self.stride)
+            self._emit(self._zlib.compress(filter_rows(rows, self._prev, self.bpp).tobytes()))
+            self._prev = rows[-1].copy()
+        self.rows_written += height
+
+    def close(self):
+        if self.rows_written != self.height:
+            raise ValueError(f"PNG unvollständig: {self.rows_written} von {self.height} Zeilen")
+        self._emit(self._zlib.flush(), flush=True)
+        self._chunk(b"IEND", b"")
+        if self._own:
+            self._file.close()
+
+
+def filter_rows(rows, prev, bpp):
+    # Alle fünf PNG-Filter vektorisiert berechnen (Byte-Arithmetik modulo 256) und je Zeile
+    # den mit der kleinsten Summe der Beträge als vorzeichenbehaftete Bytes wählen;
+    # Ergebnis mit Filterbyte vorn
+    count, stride = rows.shape
+    above = np.empty_like(rows)
+    above[0] = prev
+    above[1:] = rows[:-1]
+    left = np.zeros_like(rows)
+    left[:, bpp:] = rows[:, :-bpp]
+    upleft = np.zeros_like(rows)
+    upleft[:, bpp:] = above[:, :-bpp]
+    candidates = np.empty((5, count, stride), dtype=np.uint8)
+    candidates[0] = rows
+    np.subtract(rows, left, out=candidates[1])
+    np.subtract(rows, above, out=candidates[2])
+    # Average ohne Überlauf: floor((left + above) / 2)
+    np.subtract(rows, (left >> 1) + (above >> 1) + (left & above & 1), out=candidates[3])
+    a = left.astype(np.int16)
+    b = above.astype(np.int16)
+    c = upleft.astype(np.int16)
+    pa = np.abs(b - c)
+    pb = np.abs(a - c)
+    pc = np.abs(a + b - 2 * c)
+    np.subtract(rows, np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, above, upleft)), out=candidates[4])
+    # Kosten je Byte = Betrag als vorzeichenbehafteter Wert; über eine Tabelle, denn
+    # np.abs(int8) bleibt bei 0x80 auf -128 stehen statt 128 zu liefern
+    values = np.arange(256)
+    cost = np.minimum(values, 256 - values).astype(np.uint8)[candidates].sum(axis=2, dtype=np.int32)
+    best = cost.argmin(axis=0)
+    out = np.empty((count, stride + 1), dtype=np.uint8)
+    out[:, 0] = best
+    out[:, 1:] = candidates[best, np.arange(count)]
+    return out
@@ -0,0 +1,125 @@
+# OSSL2Gif - Stufen-Profiling für die Konvertierungs-Pipeline
+# Misst pro Stufe (decode, resize, effects, paste, crop, encode, ...) Wandzeit, Aufrufe und erzeugte Bytes.
+# Ausgeschaltet kostet ein Messpunkt nur einen Methodenaufruf und einen leeren Kontextmanager.
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add_bytes(self, n):
+        pass
+
+    def add_image(self, img):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'start', 'nbytes')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.nbytes = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._record(self.name, self.start, time.perf_counter(), self.nbytes)
+        return False
+
+    def add_bytes(self, n):
+        self.nbytes += n
+
+    def add_image(self, img):
+        self.nbytes += image_nbytes(img)
+
+
+def image_nbytes(img):
+    # Speicherbedarf eines PIL-Bildes (Breite x Höhe x Kanäle)
+    if img is None:
+        return 0
+    w, h = img.size
+    return w * h * len(img.getbands())
+
+
+class Profiler:
+    def __init__(self, enabled=False, max_events=200000):
+        self.enabled = enabled
+        self.stats = {}
+        self.events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def _record(self, name, start, end, nbytes):
+        with self._lock:
+            entry = self.stats.get(name)
+            if entry is None:
+                entry = self.stats[name] = [0, 0.0, 0]
+            entry[0] += 1
+            entry[1] += end - start
+            entry[2] += nbytes
+            self.events.append((name, start, end, nbytes, threading.get_ident()))
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+            self.events.clear()
+            self._origin = time.perf_counter()
+
+    def summary(self):
+        # {Stufe: {'calls': n, 'seconds': s, 'bytes': b}} sortiert nach Zeitanteil
+        with self._lock:
+            items = sorted(self.stats.items(), key=lambda kv: kv[1][1], reverse=True)
+            return {name: {'calls': calls, 'seconds': secs, 'bytes': nbytes} for name, (calls, secs, nbytes) in items}
+
+    def format_summary(self, limit=6):
+        parts = []
+        for name, s in list(self.summary().items())[:limit]:
+            parts.append(f"{name} {s['calls']}x {s['seconds'] * 1000:.0f} ms {s['bytes'] / (1024 * 1024):.1f} MB")
+        return " | ".join(parts)
+
+    def export_chrome_trace(self, path):
+        # Chrome-Trace-Format (chrome://tracing, Perfetto): "X"-Events in Mikrosekunden
+        with self._lock:
+            events = list(self.events)
+            origin = self._origin
+        pid = os.getpid()
+        trace = [{
+            'name': name,
+            'cat': 'pipeline',
+            'ph': 'X',
+            'ts': (start - origin) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': pid,
+            'tid': tid,
+            'args': {'bytes': nbytes},
+        } for name, start, end, nbytes, tid in events]
+        data = {'traceEvents': trace, 'displayTimeUnit': 'ms', 'otherData': {'summary': self.summary()}}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+
+# Globale Instanz; OSSL2GIF_PROFILE=1 schaltet das Profiling schon beim Start ein
+PROFILER = Profiler(enabled=os.environ.get('OSSL2GIF_PROFILE') == '1')
@@ -0,0 +1,126 @@
+# OSSL2Gif - Projektdatei (.ossl2gif)
+# Hält den Arbeitsstand fest: Einstellungen, die bearbeitete Bildfolge samt Rückgängig-Historie,
+# die dekodierten Einzelbilder (Palettenindizes wie im FrameStore) und das zuletzt aufgebaute
+# Sheet. Beim Öffnen wird nichts dekodiert und nichts neu gerechnet: die Datei wird per
+# NumPy-memmap abgebildet, Bildspeicher und Sheet zeigen direkt in die Abbildung.
+#
+# Aufbau (Blöcke wie bei PNG, Zahlen little-endian):
+#   Signatur  MAGIC (16 Byte)
+#   Block     Typ (4 Byte ASCII), CRC-32 der Nutzdaten, Länge (8 Byte), Nutzdaten.
+#             Füllbytes vor dem Kopf sorgen dafür, dass Nutzdaten auf ALIGN-Grenzen beginnen
+#   META      JSON: Version, Einstellungen, Bildfolge, Bildspeicher, Form der Arrays, Sheet
+#   FRAM      ein uint8-Array des Bildspeichers je Block, Reihenfolge wie meta['arrays']
+#   SHET      zwischengespeichertes Sheet (RGBA, Höhe x Breite x 4), optional
+#   IEND      Ende
+# Unbekannte Blöcke werden übersprungen; geprüft wird beim Öffnen nur die CRC von META,
+# die großen Blöcke würden sonst komplett gelesen.
+
+import json
+import os
+import struct
+import zlib
+
+from PIL import Image
+from lazyimport import lazy_import
+from framestore import FrameStore
+from timeline import Timeline
+
+np = lazy_import("numpy")
+
+MAGIC = b"\x89OSSL2GIF-PROJ\r\n"
+VERSION = 1
+EXTENSION = ".ossl2gif"
+HEADER = struct.Struct("<4sIQ")
+ALIGN = 64
+
+
+def _write_chunk(f, kind, payload):
+    payload = memoryview(payload).cast('B')
+    f.write(b"\0" * (-(f.tell() + HEADER.size) % ALIGN))
+    f.write(HEADER.pack(kind, zlib.crc32(payload), payload.nbytes))
+    f.write(payload)
+
+
+def _read_chunks(data):
+    # (Typ, Beginn der Nutzdaten, Länge, CRC) aller Blöcke; liest nur die Köpfe
+    chunks = []
+    pos = len(MAGIC)
+    while True:
+        pos += -(pos + HEADER.size) % ALIGN
+        if pos + HEADER.size > len(data):
+            raise ValueError("Projektdatei ist unvollständig")
+        kind, crc, length = HEADER.unpack(bytes(data[pos:pos + HEADER.size]))
+        start = pos + HEADER.size
+        if start + length > len(data):
+            raise ValueError("Projektdatei ist unvollständig")
+        if kind == b"IEND":
+            return chunks
+        chunks.append((kind, start, length, crc))
+        pos = start + length
+
+
+def save_project(path, settings, store, timeline_state, sheet=None, progress=None):
+    # sheet: (Schlüssel, RGBA-Bild) oder None; progress(fertig, gesamt) je Block.
+    # Erst in eine temporäre Datei, dann ersetzen: ein Abbruch lässt die alte Datei stehen.
+    # Wird das geöffnete Projekt in seine eigene Datei gespeichert, löst sich der Bildspeicher
+    # vorher von der Abbildung (store.detach), denn unter Windows lässt sich eine abgebildete
+    # Datei nicht ersetzen; ein Sheet aus dieser Datei muss der Aufrufer ebenso kopiert übergeben
+    store_state, arrays = store.export_state()
+    meta = {'version': VERSION, 'settings': settings, 'timeline': timeline_state, 'store': store_state,
+            'arrays': [list(a.shape) for a in arrays],
+            'sheet': None if sheet is None else {'key': sheet[0], 'size': list(sheet[1].size)}}
+    total = len(arrays) + (sheet is not None)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            _write_chunk(f, b"META", json.dumps(meta, separators=(",", ":")).encode("utf-8"))
+            for idx, array in enumerate(arrays):
+                _write_chunk(f, b"FRAM", array)
+                if progress is not None:
+                    progress(idx + 1, total)
+            if sheet is not None:
+                _write_chunk(f, b"SHET", np.asarray(sheet[1].convert("RGBA")))
+                if progress is not None:
+                    progress(total, total)
+            _write_chunk(f, b"IEND", b"")
+        if store.reads_from(path):
+            store.detach()
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+def open_project(path):
+    # Liefert {'settings', 'timeline', 'sheet': (Schlüssel, Bild) oder None}; der Bildspeicher
+    # der Bildfolge liest direkt aus der Datei (backing 'memmap')
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Keine OSSL2Gif-Projektdatei")
+    chunks = _read_chunks(data)
+    if not chunks or chunks[0][0] != b"META":
+        raise ValueError("Projektdatei ohne META-Block")
+    _, start, length, crc = chunks[0]
+    raw = bytes(data[start:start + length])
+    if zlib.crc32(raw) != crc:
+        raise ValueError("Projektdatei ist beschädigt (META)")
+    meta = json.loads(raw)
+    if meta['version'] > VERSION:
+        raise ValueError(f"Projektdatei aus einer neueren Version ({meta['version']})")
+    blocks = [(start, length) for kind, start, length, _ in chunks if kind == b"FRAM"]
+    if len(blocks) != len(meta['arrays']):
+        raise ValueError("Projektdatei ist unvollständig")
+    arrays = [data[start:start + length].reshape(shape) for (start, length), shape in zip(blocks, meta['arrays'])]
+    store = FrameStore.from_state(meta['store'], arrays)
+    sheet = None
+    shet = [(start, length) for kind, start, length, _ in chunks if kind == b"SHET"]
+    if meta['sheet'] is not None and shet:
+        w, h = meta['sheet']['size']
+        start, length = shet[0]
+        sheet = (meta['sheet']['key'], Image.frombuffer("RGBA", (w, h), data[start:start + length], "raw", "RGBA", 0, 1))
+    return {'settings': meta['settings'], 'timeline': Timeline.from_state(store, meta['timeline']), 'sheet': sheet}
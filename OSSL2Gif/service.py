@@ -0,0 +1,353 @@
+# OSSL2Gif - Lokaler HTTP-Dienst: GIF hochladen, Textur + LSL-Skript abholen
+#
+#   python service.py --port 8765 --workers 2
+#   curl --data-binary @fire.gif "http://127.0.0.1:8765/jobs?name=fire&size=1024x1024&set=grayscale=1&wait=1"
+#   curl -o "fire;4;4;10;0.png" http://127.0.0.1:8765/jobs/<id>/texture
+#
+# Schnittstelle (JSON, nur Standardbibliothek, asyncio):
+#   POST /jobs?name=&size=BxH&format=&framerate=&bg=&borderless=1&set=EFFEKT=WERT&wait=1
+#        Rumpf = GIF-Datei. Antwort 202 mit Auftrag (mit wait=1: 200 nach Abschluss).
+#        Gleicher Inhalt + gleiche Einstellungen -> derselbe Auftrag (läuft nur einmal).
+#   GET  /jobs/<id>          Status, Raster, Zeiten je Schritt, LSL-Text
+#   GET  /jobs/<id>/texture  Textur (blockweise gestreamt)
+#   GET  /jobs/<id>/lsl      LSL-Skript (generate_lsl_script)
+#   GET  /health             Warteschlange und laufende Aufträge
+#
+# Die Umwandlung (cli.convert_file) läuft in einem Prozess-Pool mit --workers Prozessen;
+# die Warteschlange ist auf --queue Aufträge begrenzt (sonst 503). Abgeschlossene Aufträge
+# samt Ordner werden nach --keep Minuten bzw. ab --max-jobs Aufträgen (älteste zuerst) gelöscht,
+# fehlgeschlagene behalten nur ihren Status.
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import parse_qs, urlsplit
+
+import cli
+
+MAX_HEADER = 64 * 1024
+CHUNK = 1 << 16
+STATUS_TEXT = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               409: "Conflict", 411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error",
+               503: "Service Unavailable"}
+MEDIA_TYPES = {'.png': "image/png", '.jpg': "image/jpeg", '.bmp': "image/bmp"}
+# Aufbewahrung abgeschlossener Aufträge (s) und Prüfintervall (s)
+KEEP = 3600
+SWEEP_INTERVAL = 60
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def run_job(source, outdir, settings):
+    # Läuft im Arbeitsprozess
+    result = cli.convert_file(source, outdir, settings)
+    with open(result['lsl'], encoding="utf-8") as f:
+        result['lsl_text'] = f.read()
+    return result
+
+
+def settings_from_query(query):
+    # Abfrageparameter -> Einstellungen wie cli.py
+    def first(key, default=None):
+        return query.get(key, [default])[0]
+
+    settings = {'lsl': 1, 'gif': 0, 'split_static': 0}
+    try:
+        if 'size' in query:
+            width, height = (int(v) for v in first('size').lower().split('x'))
+            settings['width'], settings['height'] = width, height
+        if 'format' in query:
+            settings['export_format'] = first('format').upper()
+        if 'framerate' in query:
+            settings['framerate'] = int(first('framerate'))
+        if 'bg' in query:
+            settings['bg_color'] = first('bg')
+        if 'borderless' in query:
+            settings['borderless'] = int(first('borderless'))
+        settings['effects'] = cli.parse_assignments(query.get('set'))
+    except (ValueError, argparse.ArgumentTypeError) as e:
+        raise HTTPError(400, f"Ungültige Einstellung: {e}")
+    if settings.get('export_format', "PNG") not in ("PNG", "JPG", "BMP"):
+        raise HTTPError(400, "format: PNG, JPG oder BMP")
+    if not 0 < settings.get('width', 1) <= 8192 or not 0 < settings.get('height', 1) <= 8192:
+        raise HTTPError(400, "size: höchstens 8192x8192")
+    return cli.merge_settings(settings)
+
+
+class Job:
+    def __init__(self, key, name, source, outdir, settings):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.name = name
+        self.source = source
+        self.outdir = outdir
+        self.settings = settings
+        self.status = 'queued'
+        self.created = time.monotonic()
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.error = None
+        self.done = asyncio.Event()
+
+    def describe(self):
+        info = {'id': self.id, 'name': self.name, 'status': self.status}
+        if self.started is not None:
+            info['queue_ms'] = round((self.started - self.created) * 1000)
+        if self.finished is not None:
+            info['total_ms'] = round((self.finished - self.created) * 1000)
+        if self.result:
+            r = self.result
+            info.update({'frames': r['frames'], 'tiles': r['tiles'], 'fps': r['fps'], 'frame_store': r['frame_store'],
+                         'timings_ms': {k: round(v * 1000, 1) for k, v in r['timings'].items()},
+                         'texture_name': os.path.splitext(os.path.basename(r['texture']))[0],
+                         'texture_url': f"/jobs/{self.id}/texture", 'lsl_url': f"/jobs/{self.id}/lsl",
+                         'lsl': r['lsl_text']})
+        if self.error:
+            info['error'] = self.error
+        return info
+
+
+class Service:
+    def __init__(self, workdir, workers=2, queue_size=32, max_upload=64 * 1024 * 1024, keep=KEEP, max_jobs=256):
+        self.workdir = workdir
+        self.workers = max(1, workers)
+        self.max_upload = max_upload
+        self.keep = keep
+        self.max_jobs = max(1, max_jobs)
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.jobs = {}          # id -> Job
+        self.by_key = {}        # Inhalt+Einstellungen -> Job (Doppelte zusammenfassen)
+        self.pool = None
+        self.runners = []
+
+    async def start(self, host, port):
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.runners = [asyncio.create_task(self.runner()) for _ in range(self.workers)]
+        self.runners.append(asyncio.create_task(self.sweeper()))
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER)
+
+    async def close(self):
+        for task in self.runners:
+            task.cancel()
+        await asyncio.gather(*self.runners, return_exceptions=True)
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    async def runner(self):
+        # Je Prozess ein Abholer: so viele Aufträge laufen gleichzeitig wie Prozesse
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            job.status = 'running'
+            job.started = time.monotonic()
+            pool = self.pool
+            try:
+                job.result = await loop.run_in_executor(pool, run_job, job.source, job.outdir, job.settings)
+                job.status = 'done'
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool) and self.pool is pool:
+                    # Ein Arbeitsprozess ist abgestürzt (z.B. Speichermangel): der Pool nimmt
+                    # nichts mehr an, für die folgenden Aufträge einen neuen anlegen
+                    self.pool = ProcessPoolExecutor(max_workers=self.workers)
+                    pool.shutdown(wait=False, cancel_futures=True)
+                job.status = 'failed'
+                job.error = str(e) or type(e).__name__
+                # Fehlgeschlagenes darf erneut eingereicht werden; Ordner wird nicht mehr gebraucht
+                self.by_key.pop(job.key, None)
+                shutil.rmtree(job.outdir, ignore_errors=True)
+            finally:
+                job.finished = time.monotonic()
+                job.done.set()
+                self.queue.task_done()
+            self.evict()
+
+    async def sweeper(self):
+        while True:
+            await asyncio.sleep(min(SWEEP_INTERVAL, self.keep))
+            self.evict()
+
+    def evict(self, room=0):
+        # Abgeschlossene Aufträge nach Ablauf von keep bzw. über max_jobs (älteste zuerst) vergessen;
+        # room: Platz für so viele neue Aufträge schaffen
+        finished = sorted((j for j in self.jobs.values() if j.finished is not None), key=lambda j: j.finished)
+        excess = len(self.jobs) + room - self.max_jobs
+        now = time.monotonic()
+        for job in finished:
+            if excess <= 0 and now - job.finished < self.keep:
+                break
+            del self.jobs[job.id]
+            if self.by_key.get(job.key) is job:
+                del self.by_key[job.key]
+            shutil.rmtree(job.outdir, ignore_errors=True)
+            excess -= 1
+
+    def submit(self, body, query):
+        if not body:
+            raise HTTPError(400, "Leerer Rumpf, GIF erwartet")
+        settings = settings_from_query(query)
+        name = re.sub(r"[^\w.-]", "_", query.get('name', ["animation"])[0])[:64] or "animation"
+        key = hashlib.sha256(json.dumps([name, settings], sort_keys=True).encode("utf-8") + body).hexdigest()
+        job = self.by_key.get(key)
+        if job is not None:
+            return job
+        self.evict(room=1)
+        jobdir = tempfile.mkdtemp(prefix="job_", dir=self.workdir)
+        source = os.path.join(jobdir, f"{name}.gif")
+        with open(source, "wb") as f:
+            f.write(body)
+        job = Job(key, name, source, jobdir, settings)
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            shutil.rmtree(jobdir, ignore_errors=True)
+            raise HTTPError(503, "Warteschlange voll")
+        self.jobs[job.id] = job
+        self.by_key[key] = job
+        return job
+
+    def job(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise HTTPError(404, "Unbekannter Auftrag")
+        return job
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                method, path, query, body = await self.read_request(reader)
+                await self.route(writer, method, path, query, body)
+            except HTTPError as e:
+                await self.send_json(writer, e.status, {'error': str(e)})
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+                await self.send_json(writer, 400, {'error': "Ungültige Anfrage"})
+            except Exception as e:
+                await self.send_json(writer, 500, {'error': str(e)})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+        body = b""
+        if method == "POST":
+            if 'content-length' not in headers:
+                raise HTTPError(411, "Content-Length fehlt")
+            length = int(headers['content-length'])
+            if length > self.max_upload:
+                raise HTTPError(413, f"Höchstens {self.max_upload} Byte")
+            body = await reader.readexactly(length)
+        url = urlsplit(target)
+        return method, url.path.rstrip("/") or "/", parse_qs(url.query), body
+
+    async def route(self, writer, method, path, query, body):
+        parts = path.strip("/").split("/")
+        if parts == ["health"] and method == "GET":
+            await self.send_json(writer, 200, {'queued': self.queue.qsize(), 'workers': self.workers,
+                                               'running': sum(j.status == 'running' for j in self.jobs.values()),
+                                               'jobs': len(self.jobs)})
+        elif parts == ["jobs"] and method == "POST":
+            job = self.submit(body, query)
+            if query.get('wait', ["0"])[0] not in ("", "0"):
+                await job.done.wait()
+                await self.send_json(writer, 200 if job.status == 'done' else 500, job.describe())
+            else:
+                await self.send_json(writer, 202, job.describe())
+        elif len(parts) == 2 and parts[0] == "jobs" and method == "GET":
+            await self.send_json(writer, 200, self.job(parts[1]).describe())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] in ("texture", "lsl") and method == "GET":
+            job = self.job(parts[1])
+            if job.status != 'done':
+                raise HTTPError(409, f"Auftrag {job.status}")
+            if parts[2] == "lsl":
+                await self.send(writer, 200, job.result['lsl_text'].encode("utf-8"), "text/plain; charset=utf-8")
+            else:
+                await self.send_file(writer, job.result['texture'])
+        elif parts[0] in ("health", "jobs"):
+            raise HTTPError(405, "Methode nicht erlaubt")
+        else:
+            raise HTTPError(404, "Unbekannter Pfad")
+
+    async def send_head(self, writer, status, length, content_type, extra=""):
+        writer.write((f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\nContent-Type: {content_type}\r\n"
+                      f"Content-Length: {length}\r\n{extra}Connection: close\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+    async def send(self, writer, status, data, content_type):
+        await self.send_head(writer, status, len(data), content_type)
+        writer.write(data)
+        await writer.drain()
+
+    async def send_json(self, writer, status, payload):
+        await self.send(writer, status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+    async def send_file(self, writer, path):
+        # Blockweise senden: große Texturen liegen nie ganz im Speicher
+        filename = os.path.basename(path)
+        await self.send_head(writer, 200, os.path.getsize(path), MEDIA_TYPES.get(os.path.splitext(path)[1].lower(), "application/octet-stream"),
+                             f"Content-Disposition: attachment; filename*=UTF-8''{filename.replace(';', '%3B')}\r\n")
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(CHUNK), b""):
+                writer.write(block)
+                await writer.drain()
+
+
+async def serve(args):
+    workdir = args.workdir or tempfile.mkdtemp(prefix="ossl2gif_service_")
+    os.makedirs(workdir, exist_ok=True)
+    service = Service(workdir, args.workers, args.queue, args.max_upload * 1024 * 1024, args.keep * 60, args.max_jobs)
+    server = await service.start(args.host, args.port)
+    print(f"OSSL2Gif-Dienst auf http://{args.host}:{args.port} ({service.workers} Prozesse, Arbeitsordner {workdir})", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="OSSL2Gif als lokaler HTTP-Dienst")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=max(1, min(4, (os.cpu_count() or 2) // 2)),
+                        help="gleichzeitige Umwandlungen (Prozesse)")
+    parser.add_argument("--queue", type=int, default=32, help="maximale Anzahl wartender Aufträge")
+    parser.add_argument("--max-upload", type=int, default=64, help="maximale GIF-Größe in MB")
+    parser.add_argument("--keep", type=float, default=KEEP / 60, help="abgeschlossene Aufträge so viele Minuten aufbewahren")
+    parser.add_argument("--max-jobs", type=int, default=256, help="höchstens so viele Aufträge aufbewahren (älteste zuerst gelöscht)")
+    parser.add_argument("--workdir", help="Ordner für hochgeladene GIFs und Ergebnisse (Standard: temporär)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
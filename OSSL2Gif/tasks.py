@@ -0,0 +1,109 @@
+# OSSL2Gif - Hintergrundaufgaben für die GUI
+# Laden und Exportieren laufen in einem eigenen Thread, damit das Fenster bedienbar bleibt.
+# Tk darf nur aus dem Hauptthread benutzt werden: der Thread schreibt Fortschritt und Ergebnis
+# nur in die Aufgabe, die GUI fragt sie per after() ab und ruft dort ihre Rückmeldungen auf.
+# Abbrechen setzt ein Ereignis; die Aufgabe prüft es bei jeder Fortschrittsmeldung (je Bild
+# bzw. Kachel) und endet dann mit Cancelled. Bis dahin Fertiges bleibt erhalten (Teilergebnis).
+
+import threading
+import time
+
+# Abfrageintervall der GUI in ms
+POLL_MS = 100
+
+
+class Cancelled(Exception):
+    pass
+
+
+class Task:
+    def __init__(self, name, func, *args):
+        self.name = name
+        self.done = 0
+        self.total = 0
+        self.result = None
+        self.error = None
+        self.started = time.perf_counter()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(func, args), name=f"ossl2gif-{name}", daemon=True)
+
+    def _run(self, func, args):
+        try:
+            self.result = func(*args, progress=self.progress)
+        except Exception as e:
+            # Auch Cancelled: die GUI entscheidet, was mit dem Teilergebnis passiert
+            self.error = e
+
+    def progress(self, done, total):
+        # Aus dem Arbeits-Thread: Stand merken, bei gewünschtem Abbruch hier aussteigen
+        self.done, self.total = done, total
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return isinstance(self.error, Cancelled)
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+class TaskRunner:
+    # Höchstens eine Aufgabe gleichzeitig: Laden und Exporte teilen sich den Bildspeicher
+    def __init__(self, root, poll_ms=POLL_MS):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.task = None
+        self._callbacks = (None, None, None)
+        self._timer = None
+
+    @property
+    def busy(self):
+        return self.task is not None
+
+    def running(self, name):
+        return self.task is not None and self.task.name == name
+
+    def start(self, name, func, *args, on_progress=None, on_done=None, on_error=None):
+        # func(*args, progress=...) läuft im Thread; on_progress/on_done/on_error(task) im Tk-Thread
+        if self.busy:
+            return None
+        self.task = Task(name, func, *args)
+        self._callbacks = (on_progress, on_done, on_error)
+        self.task.start()
+        self._timer = self.root.after(self.poll_ms, self._poll)
+        return self.task
+
+    def cancel(self):
+        # Kehrt sofort zurück; die Aufgabe endet bei ihrer nächsten Fortschrittsmeldung und
+        # meldet sich dann wie gewohnt über on_error (task.cancelled) bzw. on_done
+        if self.task is not None:
+            self.task.cancel()
+
+    def _poll(self):
+        task = self.task
+        on_progress, on_done, on_error = self._callbacks
+        if task.running:
+            if on_progress is not None:
+                on_progress(task)
+            self._timer = self.root.after(self.poll_ms, self._poll)
+            return
+        self.task = None
+        self._timer = None
+        # Letzten Stand noch melden, dann Ergebnis oder Fehler/Abbruch
+        if on_progress is not None:
+            on_progress(task)
+        callback = on_done if task.error is None else on_error
+        if callback is not None:
+            callback(task)
@@ -0,0 +1,75 @@
+# OSSL2Gif - Tests des Textur-Atlas (atlas.py)
+#
+#   python -m unittest test_atlas
+
+import os
+import tempfile
+import unittest
+
+from PIL import Image
+
+import atlas
+import core
+
+
+def solid_frames(colors, size=(32, 32)):
+    return [Image.new("RGBA", size, color + (255,)) for color in colors]
+
+
+class PlanGridTest(unittest.TestCase):
+    def test_original_size(self):
+        self.assertEqual(atlas.plan_grid(4, (64, 64)), (2, 2, 128, 128))
+        self.assertEqual(atlas.plan_grid(1, (100, 50)), (1, 1, 128, 64))
+
+    def test_cap_rounded_to_power_of_two(self):
+        # Obergrenze 1000 -> 512: Zellen werden kleiner, die Textur bleibt eine Zweierpotenz
+        self.assertEqual(atlas.plan_grid(16, (256, 256), 1000, 1000), (4, 4, 512, 512))
+        cols, rows, atlas_w, atlas_h = atlas.plan_grid(5, (300, 200), 1000, 700)
+        self.assertEqual((atlas_w, atlas_h), (512, 512))
+        self.assertGreaterEqual(cols * rows, 5)
+
+    def test_too_many_frames(self):
+        with self.assertRaises(ValueError):
+            atlas.plan_grid(10, (1, 1), 2, 2)
+
+
+class PackTest(unittest.TestCase):
+    def test_entries_and_cells(self):
+        red = solid_frames([(200, 0, 0), (150, 0, 0), (100, 0, 0)])
+        blue = solid_frames([(0, 0, 200), (0, 0, 150)])
+        calls = []
+        result = atlas.pack([("red", red, [100] * 3), ("blue", blue, [50] * 2)], core.effect_settings(),
+                            progress=lambda *a: calls.append(a))
+        self.assertEqual(calls, [(i, 5) for i in range(1, 6)])
+        self.assertEqual([(e['name'], e['start'], e['length']) for e in result['entries']],
+                         [("red", 0, 3), ("blue", 3, 2)])
+        self.assertEqual([e['fps'] for e in result['entries']], [core.animation_fps([100] * 3), core.animation_fps([50] * 2)])
+        cols, rows = result['grid']
+        cell_w, cell_h = result['cell']
+        self.assertEqual((cols * rows, cell_w), (6, 32))
+        self.assertLessEqual(rows * cell_h, result['image'].height)
+        # Jede Zelle trägt die Farbe ihres Bildes, fortlaufend über beide Animationen
+        for cell, frame in enumerate(red + blue):
+            center = ((cell % cols) * cell_w + cell_w // 2, (cell // cols) * cell_h + cell_h // 2)
+            self.assertEqual(result['image'].getpixel(center), frame.getpixel((0, 0)), f"Zelle {cell}")
+
+    def test_empty(self):
+        with self.assertRaises(ValueError):
+            atlas.pack([], core.effect_settings())
+
+    def test_save_atlas(self):
+        result = atlas.pack([("red", solid_frames([(200, 0, 0)] * 2), [100] * 2),
+                             ("blue", solid_frames([(0, 0, 200)] * 2), [100] * 2)], core.effect_settings())
+        with tempfile.TemporaryDirectory(prefix="ossl2gif_test_") as tmp:
+            paths = atlas.save_atlas(result, tmp, "set", 10, "PNG", {"blue": {"link": 5, "face": 2}})
+            self.assertEqual(sorted(os.listdir(tmp)), ["set.lsl", "set;2;2;10;0.png", "set_controller.lsl"])
+            with open(paths['lsl'], encoding="utf-8") as f:
+                self.assertIn('"red", 0, 2, 10.0,\n    "blue", 2, 2, 10.0', f.read())
+            with open(paths['controller'], encoding="utf-8") as f:
+                script = f.read()
+            self.assertIn('2, ALL_SIDES, "set;2;2;10;0", 2, 2, 0, 2, 10.0', script)
+            self.assertIn('5, 2, "set;2;2;10;0", 2, 2, 2, 2, 10.0', script)
+
+
+if __name__ == "__main__":
+    unittest.main()
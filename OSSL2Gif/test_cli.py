@@ -0,0 +1,107 @@
+# OSSL2Gif - Tests der Kommandozeile (cli.py) mit kleinen Test-GIFs in einem temporären Ordner
+#
+#   python -m unittest test_cli
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from PIL import Image
+
+import cli
+
+
+def write_gif(path, frame_count=4, size=(64, 48), color=(240, 200, 10)):
+    # Fester Hintergrund, ein Quadrat wandert diagonal durch den Ausschnitt (20, 10, 36, 26)
+    frames = []
+    for i in range(frame_count):
+        img = Image.new("RGB", size, (30, 90, 160))
+        img.paste(color, (20 + 4 * i, 10 + 4 * i, 24 + 4 * i, 14 + 4 * i))
+        frames.append(img)
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=100, loop=0)
+    return path
+
+
+class CliTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory(prefix="ossl2gif_test_")
+        self.addCleanup(self.tmp.cleanup)
+        self.outdir = os.path.join(self.tmp.name, "out")
+
+    def gif(self, name, **kwargs):
+        return write_gif(os.path.join(self.tmp.name, f"{name}.gif"), **kwargs)
+
+    def run_main(self, *argv):
+        # (Exit-Code, stdout, stderr)
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            status = cli.main(["-o", self.outdir, "--size", "256", "256", *argv])
+        return status, out.getvalue(), err.getvalue()
+
+    def test_split_static(self):
+        status, _, err = self.run_main(self.gif("fire"), "--split-static")
+        self.assertEqual((status, err), (0, ""))
+        self.assertEqual(sorted(os.listdir(self.outdir)), ["fire.lsl", "fire;2;2;10;0.png", "fire_anim;2;2;10;0.png",
+                                                           "fire_base.png", "fire_static.lsl"])
+        result = cli.convert_file(self.gif("fire"), self.outdir, {'split_static': 1})
+        self.assertEqual(result['region'], (20, 10, 36, 26))
+        self.assertEqual(set(result['static']), {'base', 'sheet', 'lsl'})
+
+    def test_atlas(self):
+        # --size ist die Obergrenze (200 -> 128); ein Atlas statt einer Textur je Eingabe
+        inputs = [self.gif("fire"), self.gif("smoke", frame_count=3, color=(90, 90, 90))]
+        status, out, err = self.run_main(*inputs, "--atlas", "set", "--size", "200", "200")
+        self.assertEqual((status, err), (0, ""))
+        self.assertIn("(2 Animationen, 7 Bilder, ", out)
+        self.assertEqual(sorted(os.listdir(self.outdir)), ["set.lsl", "set;2;4;10;0.png", "set_controller.lsl"])
+        with Image.open(os.path.join(self.outdir, "set;2;4;10;0.png")) as img:
+            self.assertEqual(img.size, (128, 128))
+        with open(os.path.join(self.outdir, "set.lsl"), encoding="utf-8") as f:
+            self.assertIn('"fire", 0, 4, 10.0,\n    "smoke", 4, 3, 10.0', f.read())
+
+    def test_sizes(self):
+        # Je Breite eine Datei, Höhe im Verhältnis von --size; ausgegeben wird die größte
+        status, out, err = self.run_main(self.gif("fire"), "--size", "256", "128", "--sizes", "256", "64", "512")
+        self.assertEqual((status, err), (0, ""))
+        self.assertEqual(sorted(os.listdir(self.outdir)),
+                         ["fire.lsl", "fire_256;2;2;10;0.png", "fire_512;2;2;10;0.png", "fire_64;2;2;10;0.png"])
+        self.assertIn("fire_512;2;2;10;0.png", out)
+        for width, height in ((512, 256), (256, 128), (64, 32)):
+            with Image.open(os.path.join(self.outdir, f"fire_{width};2;2;10;0.png")) as img:
+                self.assertEqual(img.size, (width, height))
+
+    def test_controller(self):
+        # --controller ist ein Schalter: beide Eingaben werden umgewandelt, statt eines Skripts je
+        # Prim ein Controller; --links legt smoke fest, fire bekommt den ersten freien Link
+        links = os.path.join(self.tmp.name, "links.json")
+        with open(links, "w", encoding="utf-8") as f:
+            json.dump({"smoke": {"link": 2, "face": 1}}, f)
+        status, out, err = self.run_main("--controller", self.gif("fire"), self.gif("smoke", frame_count=3), "--links", links)
+        self.assertEqual((status, err), (0, ""))
+        self.assertEqual(sorted(os.listdir(self.outdir)), ["controller.lsl", "fire;2;2;10;0.png", "smoke;2;2;10;0.png"])
+        self.assertTrue(out.rstrip().endswith("controller.lsl"))
+        with open(os.path.join(self.outdir, "controller.lsl"), encoding="utf-8") as f:
+            script = f.read()
+        self.assertIn('3, ALL_SIDES, "fire;2;2;10;0", 2, 2, 0, 4, 10.0', script)
+        self.assertIn('2, 1, "smoke;2;2;10;0", 2, 2, 0, 3, 10.0', script)
+
+    def test_parse_assignments(self):
+        self.assertEqual(cli.parse_assignments(["blur=1", "blur_value=2.5"]), {'blur': 1, 'blur_value': 2.5})
+        self.assertEqual(cli.parse_assignments(None), {})
+        for value in ("blur", "blur=x", "blur_value=1.2.3"):
+            with self.subTest(value=value), self.assertRaises(argparse.ArgumentTypeError):
+                cli.parse_assignments([value])
+
+    def test_invalid_setting_is_usage_error(self):
+        with self.assertRaises(SystemExit) as cm:
+            self.run_main(self.gif("fire"), "--set", "blur=x")
+        self.assertEqual(cm.exception.code, 2)
+        self.assertFalse(os.path.exists(self.outdir))
+
+
+if __name__ == "__main__":
+    unittest.main()
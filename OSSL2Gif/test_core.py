@@ -0,0 +1,176 @@
+# OSSL2Gif - Tests der Bildverarbeitung (core.py) ohne GUI
+#
+#   python -m unittest test_core
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+import core
+from framestore import FrameStore
+from timeline import Timeline
+
+# Bewegtes Quadrat innerhalb dieses Ausschnitts (links, oben, rechts, unten)
+MOVING_BOX = (20, 10, 36, 26)
+
+
+def moving_frames(frame_count=4, size=(64, 48)):
+    # Fester Hintergrund, ein Quadrat wandert innerhalb von MOVING_BOX
+    frames = []
+    for i in range(frame_count):
+        img = Image.new("RGBA", size, (30, 90, 160, 255))
+        img.paste((240, 200, 10, 255), (20 + 4 * i, 10 + 4 * i, 24 + 4 * i, 14 + 4 * i))
+        frames.append(img)
+    return frames
+
+
+class TextureFilenameTest(unittest.TestCase):
+    def test_parse(self):
+        cases = {
+            "fire;4;2;10;0.png": ("fire", 4, 2, 10.0),
+            os.path.join("out", "fire;4;2;10.png"): ("fire", 4, 2, 10.0),
+            "fire;4;2;12,5;0.jpg": ("fire", 4, 2, 12.5),
+            "my;fire;1;3;7.5;0.png": ("my;fire", 1, 3, 7.5),
+            "fire_512;8;8;40;0.png": ("fire_512", 8, 8, 40.0),
+        }
+        for path, expected in cases.items():
+            with self.subTest(path=path):
+                self.assertEqual(core.parse_texture_filename(path), expected)
+        for path in ("fire.gif", "fire;0;2;10;0.png", "fire;4;2.png", "fire;4;2;fast;0.png", "fire;4;2;10;x.png"):
+            with self.subTest(path=path):
+                self.assertIsNone(core.parse_texture_filename(path))
+
+    def test_basename(self):
+        self.assertEqual(core.texture_basename(None), "texture")
+        self.assertEqual(core.texture_basename(os.path.join("in", "fire.gif")), "fire")
+        self.assertEqual(core.texture_basename("fire_512;2;2;10;0.png"), "fire_512")
+
+    def test_load_sheet_by_name(self):
+        # Exportierte Textur wieder laden: Raster und Geschwindigkeit aus dem Dateinamen
+        frames = moving_frames(3)
+        sheet = core.compose_sheet(frames, 128, 96, core.effect_settings())
+        with tempfile.TemporaryDirectory(prefix="ossl2gif_test_") as tmp:
+            path = os.path.join(tmp, core.texture_filename("fire", 2, 2, 25, "png"))
+            core.save_texture(sheet, path, "PNG")
+            image, loaded, durations = core.load_frames(path)
+            image.close()
+            # Leere vierte Kachel zählt nicht mit
+            self.assertEqual((len(loaded), durations), (3, [25] * 3))
+            for frame, original in zip(loaded, frames):
+                np.testing.assert_array_equal(np.asarray(frame.convert("RGBA")), np.asarray(original))
+            loaded.close()
+            path = os.path.join(tmp, core.texture_filename("fire", 200, 2, 25, "png"))
+            core.save_texture(sheet, path, "PNG")
+            with self.assertRaises(ValueError):
+                core.load_frames(path)
+
+
+class SplitStaticTest(unittest.TestCase):
+    def test_region_and_sizes(self):
+        effects = core.effect_settings()
+        split = core.split_static(moving_frames(), 1024, 1024, effects)
+        self.assertEqual(split['region'], MOVING_BOX)
+        self.assertEqual(split['frame_size'], (64, 48))
+        self.assertEqual(split['tiles'], (2, 2))
+        # Hintergrund in Bildgröße auf Zweierpotenz, Sheet nur so groß wie 2x2 Ausschnitte
+        self.assertEqual(split['base'].size, (64, 64))
+        self.assertEqual(split['sheet'].size, (32, 32))
+        # Die Obergrenze gilt für beide Texturen
+        small = core.split_static(moving_frames(), 16, 16, effects)
+        self.assertEqual((small['base'].size, small['sheet'].size), ((16, 16), (16, 16)))
+
+    def test_progress_per_tile(self):
+        calls = []
+        core.split_static(moving_frames(), 1024, 1024, core.effect_settings(), progress=lambda *a: calls.append(a))
+        self.assertEqual(calls[-1], (4, 4))
+
+    def test_static_animation(self):
+        # Keine Änderung: nur der Hintergrund, kein Sheet und kein Skript
+        frames = [moving_frames(1)[0]] * 3
+        split = core.split_static(frames, 1024, 1024, core.effect_settings())
+        self.assertEqual((split['region'], split['sheet'], split['tiles']), (None, None, None))
+        with tempfile.TemporaryDirectory(prefix="ossl2gif_test_") as tmp:
+            paths = core.save_static_split(split, tmp, "still", 10, "PNG")
+            self.assertEqual(list(paths), ['base'])
+            self.assertEqual(os.listdir(tmp), ["still_base.png"])
+
+    def test_save_static_split(self):
+        split = core.split_static(moving_frames(), 1024, 1024, core.effect_settings())
+        with tempfile.TemporaryDirectory(prefix="ossl2gif_test_") as tmp:
+            paths = core.save_static_split(split, tmp, "fire", 10, "PNG")
+            self.assertEqual(sorted(os.listdir(tmp)), ["fire_anim;2;2;10;0.png", "fire_base.png", "fire_static.lsl"])
+            with Image.open(paths['sheet']) as img:
+                self.assertEqual(img.size, (32, 32))
+                # Erste Kachel = Ausschnitt des ersten Bildes
+                tile = np.asarray(img.convert("RGBA"))[:16, :16]
+            self.assertTrue((tile[:4, :4] == (240, 200, 10, 255)).all())
+            self.assertTrue((tile[8:, 8:] == (30, 90, 160, 255)).all())
+            with open(paths['lsl'], encoding="utf-8") as f:
+                script = f.read()
+            self.assertIn('string base = "fire_base";', script)
+            self.assertIn("float regionX = 0.312500;", script)
+
+
+class SheetPyramidTest(unittest.TestCase):
+    def test_sizes(self):
+        sheet = Image.new("RGBA", (256, 128), (10, 20, 30, 255))
+        levels = core.sheet_pyramid(sheet, [64, 256, 100, 128, 512, 128])
+        # Breiten über dem Sheet fallen weg, Seitenverhältnis bleibt, auch bei krummen Breiten
+        self.assertEqual({w: img.size for w, img in levels.items()},
+                         {256: (256, 128), 128: (128, 64), 100: (100, 50), 64: (64, 32)})
+        self.assertIs(levels[256], sheet)
+        for img in levels.values():
+            self.assertEqual(img.getcolors(), [(img.width * img.height, (10, 20, 30, 255))])
+
+    def test_save_variants(self):
+        levels = core.sheet_pyramid(Image.new("RGBA", (256, 256)), [256, 64])
+        with tempfile.TemporaryDirectory(prefix="ossl2gif_test_") as tmp:
+            paths = core.save_texture_variants(levels, tmp, "fire", 2, 2, 10, "PNG")
+            self.assertEqual({w: os.path.basename(p) for w, p in paths.items()},
+                             {256: "fire_256;2;2;10;0.png", 64: "fire_64;2;2;10;0.png"})
+            with Image.open(paths[64]) as img:
+                self.assertEqual(img.size, (64, 64))
+
+
+class ResizeQualityTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.noise = Image.fromarray(rng.integers(0, 256, (90, 120, 4), dtype=np.uint8), "RGBA")
+
+    def test_target_size(self):
+        for quality in core.QUALITIES:
+            with self.subTest(quality=quality):
+                self.assertEqual(core.resize(self.noise, (37, 21), quality).size, (37, 21))
+                self.assertEqual(core.resize(self.noise, (37, 21), quality, box=(10, 5, 90, 60)).size, (37, 21))
+                self.assertEqual(core.resize(self.noise, (200, 150), quality).size, (200, 150))
+        with self.assertRaises(ValueError):
+            core.resize(self.noise, (37, 21), 'fast')
+
+    def test_draft_is_nearest(self):
+        # Ganzzahlige Verkleinerung eines Blockbildes: draft trifft die Blockfarben exakt
+        blocks = self.noise.resize((12, 9), Image.Resampling.NEAREST).resize((120, 90), Image.Resampling.NEAREST)
+        self.assertEqual(core.resize(blocks, (12, 9), 'draft').tobytes(), blocks.resize((12, 9), Image.Resampling.NEAREST).tobytes())
+        self.assertEqual(core.resize(self.noise, (40, 30)).tobytes(),
+                         self.noise.resize((40, 30), Image.Resampling.LANCZOS).tobytes())
+
+    def test_compose_sheet_default_final(self):
+        # Vorschau und Export teilen den Kachel-Cache; Stufen dürfen sich nicht vermischen
+        store = FrameStore()
+        frames = [self.noise.rotate(90 * i) for i in range(4)]
+        for frame in frames:
+            store.append(frame)
+        timeline = Timeline(store, [10] * 4)
+        effects = core.effect_settings()
+        draft = core.compose_sheet(timeline, 64, 64, effects, quality='draft')
+        final = core.compose_sheet(timeline, 64, 64, effects)
+        expected = core.compose_sheet(frames, 64, 64, effects, quality='final')
+        self.assertEqual(final.tobytes(), expected.tobytes())
+        self.assertNotEqual(draft.tobytes(), final.tobytes())
+        self.assertEqual(core.compose_sheet(timeline, 64, 64, effects, quality='draft').tobytes(), draft.tobytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
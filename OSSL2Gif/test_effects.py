@@ -0,0 +1,99 @@
+# OSSL2Gif - Tests des Effekt-Plans und des Kachel-Caches (effects.py)
+#
+#   python -m unittest test_effects
+
+import unittest
+
+import numpy as np
+from PIL import Image, ImageEnhance, ImageFilter
+
+import core
+from effects import TileCache, compile_plan
+
+
+def noise(size=(24, 16), seed=0):
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, (size[1], size[0], 4), dtype=np.uint8), "RGBA")
+
+
+class EffectPlanTest(unittest.TestCase):
+    def test_no_ops_are_skipped(self):
+        default = compile_plan(core.effect_settings())
+        self.assertTrue(default.identity)
+        # Eingeschaltet, aber ohne Wirkung
+        neutral = compile_plan(core.effect_settings(sharpen=1, sharpen_value=1.0, blur=1, blur_value=0, transparency=1,
+                                                    transparency_value=1.0, colorintensity_active=1, colorintensity=0.5))
+        self.assertTrue(neutral.identity)
+        self.assertEqual(neutral.key, default.key)
+        img = noise()
+        self.assertEqual(default(img).tobytes(), img.tobytes())
+        self.assertEqual(default(img.convert("RGB")).mode, "RGBA")
+
+    def test_same_effect_same_key(self):
+        # Abgeschaltete Effekte mit anderen Werten: gleiche Wirkung, gleicher Plan
+        plan = compile_plan(core.effect_settings(blur=1, blur_value=1.5))
+        self.assertIs(compile_plan(core.effect_settings(blur=1, blur_value=1.5)), plan)
+        self.assertEqual(compile_plan(core.effect_settings(blur=1, blur_value=1.5, sharpen_value=9.0)).key, plan.key)
+        self.assertNotEqual(compile_plan(core.effect_settings(blur=1, blur_value=2.0)).key, plan.key)
+
+    def test_fused_tables(self):
+        # Transparenz und Pastell werden ein einziger Tabellenschritt
+        settings = core.effect_settings(transparency=1, transparency_value=0.6, colorintensity_active=1, colorintensity=0.2)
+        plan = compile_plan(settings)
+        self.assertEqual([name for name, _ in plan.steps], ['point'])
+        img = noise()
+        pixels = np.asarray(img).astype(np.float64)
+        expected = np.empty_like(pixels)
+        expected[..., :3] = np.clip(pixels[..., :3] * 0.4 + 255 * 0.6, 0, 255)
+        expected[..., 3] = pixels[..., 3] * 0.6
+        np.testing.assert_array_equal(np.asarray(plan(img)), expected.astype(np.uint8))
+
+    def test_step_order(self):
+        settings = core.effect_settings(sharpen=1, sharpen_value=3.0, blur=1, blur_value=1.0, transparency=1,
+                                        transparency_value=0.5, colorintensity_active=1, colorintensity=0.8)
+        plan = compile_plan(settings)
+        self.assertEqual([name for name, _ in plan.steps], ['sharpen', 'blur', 'point', 'color'])
+        img = noise()
+        expected = ImageEnhance.Sharpness(img).enhance(3.0).filter(ImageFilter.GaussianBlur(1.0))
+        expected = expected.point(list(range(256)) * 3 + [int(p * 0.5) for p in range(256)])
+        expected = ImageEnhance.Color(expected).enhance(1.6)
+        self.assertEqual(plan(img).tobytes(), expected.tobytes())
+
+    def test_grayscale(self):
+        plan = compile_plan(core.effect_settings(grayscale=1))
+        self.assertFalse(plan.identity)
+        result = np.asarray(plan(noise()))
+        # Graustufen verwerfen den Alphakanal
+        self.assertTrue((result[..., 3] == 255).all())
+        self.assertTrue((result[..., 0] == result[..., 2]).all())
+
+
+class TileCacheTest(unittest.TestCase):
+    def test_lru_by_bytes(self):
+        # RGBA 8x8 = 256 Byte: drei passen
+        cache = TileCache(max_bytes=3 * 256)
+        tiles = {key: Image.new("RGBA", (8, 8)) for key in "abcd"}
+        for key in "abc":
+            cache.put(key, tiles[key])
+        self.assertIs(cache.get("a"), tiles["a"])
+        cache.put("d", tiles["d"])
+        # "b" war am längsten unbenutzt
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual([cache.get(key) is not None for key in "acd"], [True, True, True])
+        self.assertEqual((cache.nbytes, cache.hits, cache.misses), (3 * 256, 4, 1))
+
+    def test_replace_and_oversize(self):
+        cache = TileCache(max_bytes=1000)
+        cache.put("a", Image.new("RGBA", (8, 8)))
+        cache.put("a", Image.new("L", (8, 8)))
+        self.assertEqual(cache.nbytes, 64)
+        # Größer als der ganze Cache: nicht aufnehmen, nichts verdrängen
+        cache.put("big", Image.new("RGBA", (32, 32)))
+        self.assertIsNone(cache.get("big"))
+        self.assertEqual(cache.get("a").mode, "L")
+        cache.clear()
+        self.assertEqual((cache.nbytes, cache.get("a")), (0, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+# OSSL2Gif - Tests des Bildspeichers für importierte Sprite-Sheets ('view'-Bilder)
+#
+#   python -m unittest test_framestore
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+import core
+import project
+from framestore import FrameStore
+from timeline import Timeline
+
+
+def make_sheet(tiles_x, tiles_y, tile_size):
+    # Jede Kachel in eigener Farbe, damit vertauschte oder verschobene Kacheln auffallen
+    tile_w, tile_h = tile_size
+    sheet = np.zeros((tiles_y * tile_h, tiles_x * tile_w, 4), dtype=np.uint8)
+    for idx in range(tiles_x * tiles_y):
+        y, x = divmod(idx, tiles_x)
+        sheet[y * tile_h:(y + 1) * tile_h, x * tile_w:(x + 1) * tile_w] = (idx * 15, 255 - idx * 15, x * 60, 255)
+        # Ein Pixel am rechten unteren Rand jeder Kachel
+        sheet[(y + 1) * tile_h - 1, (x + 1) * tile_w - 1] = (1, 2, 3, 4)
+    return sheet
+
+
+def palette_image(size=(16, 8), seed=0):
+    rng = np.random.default_rng(seed)
+    img = Image.fromarray(rng.integers(0, 4, (size[1], size[0]), dtype=np.uint8), 'P')
+    img.putpalette([255, 0, 0, 0, 255, 0, 0, 0, 255, 9, 9, 9] + [0] * 756)
+    img.info['transparency'] = 3
+    return img
+
+
+class FrameStoreTest(unittest.TestCase):
+    def test_palette_frames_are_indices(self):
+        # Palettenbilder: 1 Byte je Pixel im gemeinsamen Puffer, gleiche Palette nur einmal
+        store = FrameStore()
+        frames = [palette_image(seed=i) for i in range(3)]
+        for img in frames:
+            store.append(img)
+        self.assertEqual(store._indexed.pixels[:store._indexed.next_slot].shape, (3, 8, 16))
+        self.assertIsNone(store._rgba.pixels)
+        self.assertEqual(len(store._palettes), 1)
+        for img, stored in zip(frames, store):
+            self.assertEqual(stored.mode, 'P')
+            self.assertEqual(stored.info['transparency'], 3)
+            np.testing.assert_array_equal(np.asarray(stored), np.asarray(img))
+            self.assertEqual(stored.convert('RGBA').tobytes(), img.convert('RGBA').tobytes())
+
+    def test_modes_roundtrip(self):
+        rng = np.random.default_rng(1)
+        few = Image.fromarray(rng.integers(0, 2, (16, 32, 3), dtype=np.uint8) * 200, 'RGB')
+        many = Image.fromarray(rng.integers(0, 256, (16, 32, 4), dtype=np.uint8), 'RGBA')
+        gray = Image.fromarray(rng.integers(0, 256, (16, 32), dtype=np.uint8), 'L')
+        odd = Image.new('RGBA', (5, 5), (1, 2, 3, 4))
+        store = FrameStore()
+        for img in (few, many, gray, odd):
+            store.append(img)
+        # Wenige Farben als Index, viele Farben roh, abweichende Größe als eigenes Bild
+        self.assertEqual([record[0] for record in store._frames], ['RGB', 'rawRGBA', 'L', 'image'])
+        for img, stored in zip((few, many, gray, odd), store):
+            self.assertEqual((stored.mode, stored.size), (img.mode, img.size))
+            self.assertEqual(stored.tobytes(), img.tobytes())
+
+    def test_truncate_keeps_handed_out_frames(self):
+        store = FrameStore()
+        for i in range(3):
+            store.append(palette_image(seed=i))
+        view = store[2]
+        before = view.tobytes()
+        store.truncate(2)
+        store.append(palette_image(seed=7))
+        self.assertEqual(len(store), 3)
+        self.assertEqual(view.tobytes(), before)
+        self.assertEqual(store[2].tobytes(), palette_image(seed=7).tobytes())
+
+
+class SheetViewTest(unittest.TestCase):
+    def check_tiles(self, frames, sheet, tiles_x, tile_size):
+        tile_w, tile_h = tile_size
+        for idx in range(len(frames)):
+            y, x = divmod(idx, tiles_x)
+            expected = sheet[y * tile_h:(y + 1) * tile_h, x * tile_w:(x + 1) * tile_w]
+            np.testing.assert_array_equal(np.asarray(frames[idx]), expected, err_msg=f"Kachel {idx}")
+
+    def test_evenly_divisible_sheet(self):
+        # 4x4 Kacheln ohne Rest: die letzte Kachelzeile endet mit dem Sheet (Kacheln 13-15)
+        sheet = make_sheet(4, 4, (16, 8))
+        for backing in ('memory', 'memmap'):
+            with self.subTest(backing=backing):
+                _, frames, durations = core.load_sheet(Image.fromarray(sheet, 'RGBA'), 4, 4, 10, backing=backing)
+                self.assertEqual((len(frames), durations), (16, [10] * 16))
+                self.check_tiles(frames, sheet, 4, (16, 8))
+                self.assertEqual(frames.union_bbox(), (0, 0, 16, 8))
+                self.assertEqual(frames.change_bbox(), (0, 0, 16, 8))
+                frames.close()
+
+    def test_incomplete_last_row(self):
+        sheet = make_sheet(4, 4, (16, 8))
+        sheet[24:, 16:] = 0
+        _, frames, _ = core.load_sheet(Image.fromarray(sheet, 'RGBA'), 4, 4, 10)
+        self.assertEqual(len(frames), 13)
+        self.check_tiles(frames, sheet, 4, (16, 8))
+
+    def test_project_roundtrip(self):
+        sheet = make_sheet(4, 4, (16, 8))
+        _, frames, _ = core.load_sheet(Image.fromarray(sheet, 'RGBA'), 4, 4, 10)
+        with tempfile.TemporaryDirectory(prefix="ossl2gif_test_") as tmp:
+            path = os.path.join(tmp, "sheet" + project.EXTENSION)
+            project.save_project(path, {}, frames, Timeline(frames, [10] * 16).state())
+            timeline = project.open_project(path)['timeline']
+            self.check_tiles(timeline, sheet, 4, (16, 8))
+            timeline.close()
+            del timeline
+
+    def test_save_over_open_project(self):
+        # Speichern in die Datei, aus der der Bildspeicher gerade liest: vorher lösen, dann ersetzen
+        sheet = make_sheet(4, 4, (16, 8))
+        _, frames, _ = core.load_sheet(Image.fromarray(sheet, 'RGBA'), 4, 4, 10)
+        frames.append(Image.new('P', (16, 8), 3))
+        with tempfile.TemporaryDirectory(prefix="ossl2gif_test_") as tmp:
+            path = os.path.join(tmp, "sheet" + project.EXTENSION)
+            project.save_project(path, {}, frames, Timeline(frames, [10] * 17).state())
+            timeline = project.open_project(path)['timeline']
+            store = timeline.store
+            self.assertTrue(store.reads_from(path))
+            project.save_project(path, {'saved': 2}, store, timeline.state())
+            self.assertFalse(store.reads_from(path))
+            arrays = [store._indexed.pixels, store._rgba.pixels] + store._sources
+            self.assertFalse(any(isinstance(a, np.memmap) and a.filename == os.path.abspath(path) for a in arrays))
+            self.check_tiles(timeline[:16], sheet, 4, (16, 8))
+            self.assertEqual(timeline[16].getpixel((0, 0)), 3)
+            store.close()
+            reopened = project.open_project(path)
+            self.check_tiles(reopened['timeline'][:16], sheet, 4, (16, 8))
+            self.assertEqual(reopened['settings'], {'saved': 2})
+            reopened['timeline'].close()
+            del reopened
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+# OSSL2Gif - Tests des inkrementellen PNG-Encoders (pngstream.py)
+#
+#   python -m unittest test_pngstream
+
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+import core
+import pngstream
+from benchmark import synthetic_gif
+from pngstream import PNGStreamWriter
+
+
+def decode(data):
+    with Image.open(io.BytesIO(data)) as img:
+        img.load()
+        return img.mode, np.asarray(img)
+
+
+class PNGStreamWriterTest(unittest.TestCase):
+    def test_strips_roundtrip(self):
+        # Zufallspixel und glatte Verläufe, damit alle fünf Zeilenfilter vorkommen
+        rng = np.random.default_rng(0)
+        gradient = np.add.outer(np.arange(37), np.arange(53)).astype(np.uint8)
+        for mode, channels in (('RGBA', 4), ('RGB', 3)):
+            with self.subTest(mode=mode):
+                pixels = rng.integers(0, 256, (37, 53, channels), dtype=np.uint8)
+                pixels[20:] = gradient[20:, :, None]
+                buf = io.BytesIO()
+                with PNGStreamWriter(buf, 53, 37, mode) as writer:
+                    # Ungleich hohe Streifen, gemischt als Array und als PIL-Bild
+                    writer.write(pixels[:5])
+                    writer.write(Image.fromarray(pixels[5:20], mode))
+                    writer.write(pixels[20:])
+                self.assertEqual(decode(buf.getvalue())[0], mode)
+                np.testing.assert_array_equal(decode(buf.getvalue())[1], pixels)
+
+    def test_small_filter_blocks_and_idat_chunks(self):
+        # Filterblöcke über Streifengrenzen hinweg und mehrere IDAT-Blöcke
+        rng = np.random.default_rng(1)
+        pixels = rng.integers(0, 256, (64, 128, 4), dtype=np.uint8)
+        old = pngstream.FILTER_BLOCK_BYTES, pngstream.IDAT_SIZE
+        pngstream.FILTER_BLOCK_BYTES, pngstream.IDAT_SIZE = 3 * 128 * 4, 4096
+        try:
+            buf = io.BytesIO()
+            with PNGStreamWriter(buf, 128, 64) as writer:
+                for start in range(0, 64, 10):
+                    writer.write(pixels[start:start + 10])
+        finally:
+            pngstream.FILTER_BLOCK_BYTES, pngstream.IDAT_SIZE = old
+        self.assertGreater(buf.getvalue().count(b"IDAT"), 1)
+        np.testing.assert_array_equal(decode(buf.getvalue())[1], pixels)
+
+    def test_row_count_is_checked(self):
+        pixels = np.zeros((4, 8, 4), dtype=np.uint8)
+        writer = PNGStreamWriter(io.BytesIO(), 8, 6)
+        writer.write(pixels)
+        with self.assertRaises(ValueError):
+            writer.write(pixels)
+        with self.assertRaises(ValueError):
+            writer.close()
+        with self.assertRaises(ValueError):
+            PNGStreamWriter(io.BytesIO(), 8, 6, "P")
+
+    def test_path_is_closed_on_error(self):
+        with tempfile.TemporaryDirectory(prefix="ossl2gif_test_") as tmp:
+            path = os.path.join(tmp, "broken.png")
+            with self.assertRaises(RuntimeError):
+                with PNGStreamWriter(path, 8, 6) as writer:
+                    raise RuntimeError("Abbruch")
+            self.assertTrue(writer._file.closed)
+
+
+class StreamingTextureTest(unittest.TestCase):
+    def test_matches_compose_sheet(self):
+        # Nicht durch die Kachelzahl teilbare Größe und Randlos: pixelgleich mit compose_sheet
+        with tempfile.TemporaryDirectory(prefix="ossl2gif_test_") as tmp:
+            path = os.path.join(tmp, "anim.gif")
+            synthetic_gif(path, 7, 60, 50, True, seed=2, margin=10)
+            image, frames, _ = core.load_frames(path)
+            image.close()
+        effects = core.effect_settings(grayscale=1)
+        for borderless in (False, True):
+            with self.subTest(borderless=borderless):
+                buf = io.BytesIO()
+                core.save_texture_streaming(frames, buf, 301, 130, effects, "#336699", borderless)
+                expected = core.compose_sheet(frames, 301, 130, effects, "#336699", borderless)
+                mode, pixels = decode(buf.getvalue())
+                self.assertEqual(mode, 'RGBA')
+                np.testing.assert_array_equal(pixels, np.asarray(expected.convert('RGBA')))
+
+
+if __name__ == "__main__":
+    unittest.main()
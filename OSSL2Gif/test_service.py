@@ -0,0 +1,109 @@
+# OSSL2Gif - Test des HTTP-Dienstes (service.py) über einen freien Port auf localhost
+#
+#   python -m unittest test_service
+
+import asyncio
+import io
+import json
+import os
+import tempfile
+import unittest
+import urllib.error
+import urllib.request
+
+from PIL import Image
+
+import service
+
+
+def make_gif(frame_count=4, size=(32, 32), shift=0):
+    frames = [Image.new("RGB", size, ((i * 60 + shift) % 256, 80, 200 - i * 40)) for i in range(frame_count)]
+    buffer = io.BytesIO()
+    frames[0].save(buffer, format="GIF", save_all=True, append_images=frames[1:], duration=100, loop=0)
+    return buffer.getvalue()
+
+
+def request(url, body=None):
+    # (Status, Kopfzeilen, Rumpf); auch bei Fehlerstatus
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=body, method="POST" if body is not None else "GET"), timeout=60) as r:
+            return r.status, r.headers, r.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+class ServiceTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory(prefix="ossl2gif_test_")
+        self.service = service.Service(self.tmp.name, workers=1, max_jobs=2)
+        self.server = await self.service.start("127.0.0.1", 0)
+        self.base = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.service.close()
+        self.tmp.cleanup()
+
+    async def call(self, path, body=None):
+        return await asyncio.to_thread(request, self.base + path, body)
+
+    async def post(self, body, name="fire"):
+        status, _, data = await self.call(f"/jobs?name={name}&size=128x128&wait=1", body)
+        return status, json.loads(data)
+
+    async def test_convert_and_download(self):
+        status, job = await self.post(make_gif())
+        self.assertEqual(status, 200)
+        self.assertEqual(job['status'], 'done')
+        self.assertEqual((job['frames'], job['tiles']), (4, [2, 2]))
+        self.assertEqual(job['texture_name'], "fire;2;2;10;0")
+
+        status, headers, data = await self.call(job['texture_url'])
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Content-Type'], "image/png")
+        with Image.open(io.BytesIO(data)) as img:
+            self.assertEqual(img.size, (128, 128))
+
+        status, _, data = await self.call(job['lsl_url'])
+        self.assertEqual(status, 200)
+        self.assertEqual(data.decode("utf-8"), job['lsl'])
+
+        status, _, data = await self.call(f"/jobs/{job['id']}")
+        self.assertEqual((status, json.loads(data)['status']), (200, 'done'))
+
+    async def test_duplicate_is_one_job(self):
+        gif = make_gif()
+        _, first = await self.post(gif)
+        _, second = await self.post(gif)
+        self.assertEqual(first['id'], second['id'])
+        _, other = await self.post(gif, name="other")
+        self.assertNotEqual(first['id'], other['id'])
+
+    async def test_invalid_upload(self):
+        status, job = await self.post(b"kein gif")
+        self.assertEqual((status, job['status']), (500, 'failed'))
+        # Ordner des fehlgeschlagenen Auftrags ist weg, Status bleibt abrufbar
+        self.assertEqual(os.listdir(self.tmp.name), [])
+        status, _, _ = await self.call(f"/jobs/{job['id']}/texture")
+        self.assertEqual(status, 409)
+        status, _, _ = await self.call("/jobs/unbekannt")
+        self.assertEqual(status, 404)
+
+    async def test_old_jobs_are_evicted(self):
+        ids = [(await self.post(make_gif(shift=i)))[1]['id'] for i in range(3)]
+        # max_jobs=2: der älteste Auftrag ist samt Ordner gelöscht
+        self.assertEqual(sorted(self.service.jobs), sorted(ids[1:]))
+        self.assertEqual(len(self.service.by_key), 2)
+        self.assertEqual(len(os.listdir(self.tmp.name)), 2)
+        status, _, _ = await self.call(f"/jobs/{ids[0]}/texture")
+        self.assertEqual(status, 404)
+
+        # Nach Ablauf der Aufbewahrungszeit ist alles weg
+        self.service.keep = 0
+        self.service.evict()
+        self.assertEqual((self.service.jobs, self.service.by_key, os.listdir(self.tmp.name)), ({}, {}, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+# OSSL2Gif - Tests der Bildfolge mit Rückgängig/Wiederholen (timeline.py)
+#
+#   python -m unittest test_timeline
+
+import unittest
+
+from PIL import Image
+
+from framestore import FrameStore
+from timeline import Timeline
+
+
+def make_timeline(count=4, history=10):
+    store = FrameStore()
+    for i in range(count):
+        store.append(Image.new("P", (8, 8), i))
+    return Timeline(store, [10 * (i + 1) for i in range(count)], history)
+
+
+def colors(timeline):
+    return [frame.getpixel((0, 0)) for frame in timeline]
+
+
+class TimelineTest(unittest.TestCase):
+    def test_duplicate_undo_redo(self):
+        timeline = make_timeline()
+        self.assertFalse(timeline.can_undo or timeline.can_redo)
+        self.assertTrue(timeline.duplicate(1))
+        self.assertEqual((colors(timeline), timeline.durations), ([0, 1, 2, 3, 1], (10, 20, 30, 40, 20)))
+        # Duplikat ist derselbe Verweis: gleiche Kennung für den Kachel-Cache, keine neuen Pixel
+        self.assertEqual(timeline.frame_key(4), timeline.frame_key(1))
+        self.assertEqual(len(timeline.store), 4)
+        self.assertTrue(timeline.undo())
+        self.assertEqual((colors(timeline), timeline.durations), ([0, 1, 2, 3], (10, 20, 30, 40)))
+        self.assertFalse(timeline.undo())
+        self.assertTrue(timeline.redo())
+        self.assertEqual(colors(timeline), [0, 1, 2, 3, 1])
+        self.assertFalse(timeline.redo())
+
+    def test_move_truncate_reset(self):
+        timeline = make_timeline()
+        timeline.move(0, 3)
+        self.assertEqual((colors(timeline), timeline.durations), ([1, 2, 3, 0], (20, 30, 40, 10)))
+        timeline.truncate(2)
+        self.assertEqual(colors(timeline), [1, 2])
+        # Unveränderte Fassung erzeugt keinen Historieneintrag
+        self.assertFalse(timeline.truncate(5))
+        timeline.reset()
+        self.assertEqual(colors(timeline), [0, 1, 2, 3])
+        timeline.undo()
+        self.assertEqual(colors(timeline), [1, 2])
+        # Neue Bearbeitung verwirft den Wiederholen-Stapel
+        timeline.undo()
+        self.assertTrue(timeline.can_redo)
+        timeline.duplicate(0)
+        self.assertFalse(timeline.can_redo)
+        self.assertEqual(colors(timeline), [1, 2, 3, 0, 1])
+
+    def test_history_limit(self):
+        timeline = make_timeline(history=3)
+        for _ in range(5):
+            timeline.duplicate(0)
+        while timeline.undo():
+            pass
+        self.assertEqual(len(timeline), 6)
+        # Ohne Historie (z.B. Schnappschuss) wird nichts aufbewahrt
+        snapshot = timeline.snapshot()
+        snapshot.duplicate(0)
+        self.assertFalse(snapshot.can_undo)
+
+    def test_snapshot_is_independent(self):
+        timeline = make_timeline()
+        snapshot = timeline.snapshot()
+        timeline.duplicate(0)
+        timeline.move(0, 2)
+        self.assertEqual(colors(snapshot), [0, 1, 2, 3])
+        self.assertIs(snapshot.store, timeline.store)
+
+    def test_extend_grows_base(self):
+        timeline = make_timeline(2)
+        timeline.store.append(Image.new("P", (8, 8), 7))
+        timeline.extend([70])
+        self.assertEqual(colors(timeline), [0, 1, 7])
+        self.assertFalse(timeline.can_undo)
+        timeline.truncate(1)
+        timeline.reset()
+        self.assertEqual(colors(timeline), [0, 1, 7])
+
+    def test_state_roundtrip(self):
+        timeline = make_timeline()
+        timeline.duplicate(2)
+        timeline.move(4, 0)
+        timeline.undo()
+        restored = Timeline.from_state(timeline.store, timeline.state())
+        self.assertEqual((restored.ids, restored.durations), (timeline.ids, timeline.durations))
+        restored.redo()
+        self.assertEqual(colors(restored), [2, 0, 1, 2, 3])
+        restored.reset()
+        self.assertEqual(colors(restored), [0, 1, 2, 3])
+        # Historie wird auf das Limit gekürzt
+        self.assertEqual(len(Timeline.from_state(timeline.store, timeline.state(), history=0).state()['undo']), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+# OSSL2Gif - Tests des überwachten Ordners (watch.py) mit gestellter Uhr
+#
+#   python -m unittest test_watch
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor, wait
+from unittest import mock
+
+import watch
+from test_cli import write_gif
+
+
+class WatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory(prefix="ossl2gif_test_")
+        self.addCleanup(self.tmp.cleanup)
+        self.indir = os.path.join(self.tmp.name, "in")
+        self.outdir = os.path.join(self.tmp.name, "out")
+        os.makedirs(self.indir)
+        os.makedirs(self.outdir)
+        self.now = 0.0
+        patcher = mock.patch.object(watch.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.watcher = self.make_watcher()
+
+    def make_watcher(self):
+        return watch.Watcher(self.indir, self.outdir, {'width': 128, 'height': 128}, workers=1, settle=2.0)
+
+    def poll_at(self, now):
+        self.now = now
+        self.watcher.poll()
+        return [path for path, _ in self.watcher.queue]
+
+    def convert(self):
+        # Warteschlange im Thread-Pool abarbeiten und Ergebnisse übernehmen
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            self.watcher.dispatch(pool)
+            wait(list(self.watcher.running))
+            self.watcher.collect()
+
+    def touch(self, path, step):
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + step * 1_000_000_000))
+
+    def test_settle_then_convert(self):
+        path = write_gif(os.path.join(self.indir, "fire.gif"))
+        self.assertEqual(self.poll_at(0.0), [])
+        self.assertEqual(self.poll_at(1.0), [])
+        # Datei wird noch geschrieben: Signatur ändert sich, die Wartezeit beginnt neu
+        self.touch(path, 1)
+        self.assertEqual(self.poll_at(2.5), [])
+        self.assertEqual(self.poll_at(4.0), [])
+        self.assertEqual(self.poll_at(4.5), [path])
+        # Schon in der Warteschlange: nicht doppelt einreihen
+        self.assertEqual(self.poll_at(5.0), [path])
+        self.convert()
+        entry = self.watcher.state[path]
+        self.assertEqual(os.path.basename(entry['texture']), "fire;2;2;10;0.png")
+        self.assertTrue(os.path.exists(entry['texture']))
+        self.assertEqual(self.poll_at(10.0), [])
+        # Stand liegt im Ausgabeordner und überlebt einen Neustart
+        self.watcher = self.make_watcher()
+        self.assertEqual(self.poll_at(20.0), [])
+        self.assertEqual(self.poll_at(30.0), [])
+
+    def test_unchanged_content_is_skipped(self):
+        path = write_gif(os.path.join(self.indir, "fire.gif"))
+        self.poll_at(0.0)
+        self.poll_at(3.0)
+        self.convert()
+        converted = self.watcher.state[path]['converted']
+        # Nur berührt: Digest gleich, keine erneute Umwandlung, neue Signatur gemerkt
+        self.touch(path, 5)
+        self.poll_at(10.0)
+        with self.assertLogs(watch.log, "INFO") as logs:
+            self.assertEqual(self.poll_at(13.0), [])
+        self.assertIn("event=unchanged file=fire.gif", logs.output[0])
+        self.assertEqual(self.watcher.state[path]['signature'][1], os.stat(path).st_mtime_ns)
+        self.assertEqual(self.watcher.state[path]['converted'], converted)
+        # Neuer Inhalt wird wieder umgewandelt
+        write_gif(path, frame_count=6)
+        self.poll_at(20.0)
+        self.assertEqual(self.poll_at(23.0), [path])
+        self.convert()
+        self.assertEqual(os.path.basename(self.watcher.state[path]['texture']), "fire;3;2;10;0.png")
+
+    def test_changed_settings_convert_again(self):
+        path = write_gif(os.path.join(self.indir, "fire.gif"))
+        self.poll_at(0.0)
+        self.poll_at(3.0)
+        self.convert()
+        self.watcher = watch.Watcher(self.indir, self.outdir, {'width': 64, 'height': 64}, workers=1, settle=2.0)
+        # Datei unverändert, aber andere Einstellungen: neu umwandeln
+        self.poll_at(10.0)
+        self.assertEqual(self.poll_at(13.0), [path])
+        self.convert()
+        self.assertEqual(self.poll_at(20.0), [])
+
+    def test_failed_and_removed(self):
+        path = os.path.join(self.indir, "broken.gif")
+        with open(path, "wb") as f:
+            f.write(b"kein gif")
+        self.poll_at(0.0)
+        self.poll_at(3.0)
+        with self.assertLogs(watch.log, "ERROR"):
+            self.convert()
+        self.assertIn('error', self.watcher.state[path])
+        # Fehler gemerkt: keine Dauerschleife
+        self.assertEqual(self.poll_at(10.0), [])
+        os.remove(path)
+        with self.assertLogs(watch.log, "INFO") as logs:
+            self.poll_at(11.0)
+        self.assertIn("event=removed file=broken.gif", logs.output[0])
+        self.assertEqual((self.watcher.state, self.watcher.seen), ({}, {}))
+        self.assertEqual(watch.load_state(self.watcher.state_path), {})
+
+    def test_format_fields(self):
+        self.assertEqual(watch.format_fields(event="failed", file="my fire.gif", error="", frames=3),
+                         'event=failed file="my fire.gif" error="" frames=3')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+# OSSL2Gif - Bildfolge mit Rückgängig/Wiederholen
+# Die Pixel liegen genau einmal im FrameStore; eine Bildfolge ist nur ein Tupel von Bildnummern
+# (Verweise in den Speicher) plus Verzögerungen. Duplizieren, Verschieben und Kürzen erzeugen
+# eine neue Fassung dieses Tupels, kopieren aber keine Pixel; alle Fassungen der Historie teilen
+# sich dieselben Bilder. Die Historie kostet daher nur wenige Byte je Bild und Fassung, und
+# Zurücksetzen braucht kein erneutes Dekodieren.
+
+HISTORY = 100
+
+
+class Timeline:
+    def __init__(self, store, durations, history=HISTORY, ids=None):
+        self.store = store
+        self.history = history
+        # Ausgangsfassung wie geladen (für Zurücksetzen)
+        self._base = (tuple(range(len(store))) if ids is None else tuple(ids), tuple(durations))
+        self.ids, self.durations = self._base
+        self._undo = []
+        self._redo = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __bool__(self):
+        return bool(self.ids)
+
+    def __iter__(self):
+        for fid in self.ids:
+            yield self.store[fid]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self.store[fid] for fid in self.ids[idx]]
+        return self.store[self.ids[idx]]
+
+    def frame_key(self, idx):
+        # Gleiche Bildnummer = gleiche Pixel, auch über Duplikate und alle Fassungen hinweg
+        return (self.store.token, self.ids[idx])
+
+    @property
+    def backing(self):
+        return self.store.backing
+
+    def nbytes(self):
+        return self.store.nbytes()
+
+    def close(self):
+        self._undo = []
+        self._redo = []
+        self.store.close()
+
+    def union_bbox(self):
+        return self.store.union_bbox(self.ids)
+
+    def change_bbox(self):
+        return self.store.change_bbox(self.ids)
+
+    def state(self):
+        # JSON-fähiger Stand für Projektdateien: Ausgangsfassung, aktuelle Fassung und Historie
+        def pack(version):
+            return [list(version[0]), list(version[1])]
+        return {'base': pack(self._base), 'current': pack((self.ids, self.durations)),
+                'undo': [pack(v) for v in self._undo], 'redo': [pack(v) for v in self._redo]}
+
+    @classmethod
+    def from_state(cls, store, state, history=HISTORY):
+        def unpack(version):
+            return tuple(version[0]), tuple(version[1])
+        timeline = cls(store, state['base'][1], history, state['base'][0])
+        timeline.ids, timeline.durations = unpack(state['current'])
+        timeline._undo = [unpack(v) for v in state['undo']][-history:] if history else []
+        timeline._redo = [unpack(v) for v in state['redo']]
+        return timeline
+
+    def snapshot(self):
+        # Feste Kopie der aktuellen Fassung ohne Historie, z.B. für einen Export im Hintergrund,
+        # während hier weiter bearbeitet wird (teilt den Bildspeicher, kopiert keine Pixel)
+        return Timeline(self.store, self.durations, 0, self.ids)
+
+    def extend(self, durations):
+        # Beim Laden im Hintergrund nachgelieferte Bilder anhängen; die Ausgangsfassung wächst
+        # mit, eine neue Fassung in der Historie entsteht nicht
+        start = len(self._base[0])
+        ids = tuple(range(start, start + len(durations)))
+        durations = tuple(durations)
+        self._base = (self._base[0] + ids, self._base[1] + durations)
+        self.ids, self.durations = self.ids + ids, self.durations + durations
+
+    def _commit(self, ids, durations):
+        # Neue Fassung; die bisherige wandert auf den Rückgängig-Stapel
+        ids, durations = tuple(ids), tuple(durations)
+        if ids == self.ids and durations == self.durations:
+            return False
+        # history=0 (Schnappschuss): keine Historie; [:-0] wäre leer und löschte nichts
+        self._undo.append((self.ids, self.durations))
+        del self._undo[:max(0, len(self._undo) - self.history)]
+        self._redo = []
+        self.ids, self.durations = ids, durations
+        return True
+
+    def duplicate(self, idx):
+        # Bild idx am Ende noch einmal anhängen (gleicher Verweis, keine Kopie)
+        return self._commit(self.ids + (self.ids[idx],), self.durations + (self.durations[idx],))
+
+    def move(self, idx, target):
+        # Bild idx an Position target verschieben
+        ids, durations = list(self.ids), list(self.durations)
+        ids.insert(target, ids.pop(idx))
+        durations.insert(target, durations.pop(idx))
+        return self._commit(ids, durations)
+
+    def truncate(self, count):
+        # Nur die ersten count Bilder behalten (Max. Bilder); rückgängig machbar
+        return self._commit(self.ids[:count], self.durations[:count])
+
+    def reset(self):
+        # Zurück zur geladenen Bildfolge; ebenfalls rückgängig machbar
+        return self._commit(*self._base)
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self):
+        if not self._undo:
+            return False
+        self._redo.append((self.ids, self.durations))
+        self.ids, self.durations = self._undo.pop()
+        return True
+
+    def redo(self):
+        if not self._redo:
+            return False
+        self._undo.append((self.ids, self.durations))
+        self.ids, self.durations = self._redo.pop()
+        return True
@@ -35,6 +35,43 @@ translations = {
             'status': 'Status',
             'file': 'Bestand',
             'master_settings': 'Hoofdinstellingen',
+            'playback_fps': 'Afspelen: {achieved:.1f} / {target:.1f} fps ({skipped} overgeslagen)',
+            'profiling': 'Profilering',
+            'export_trace': 'Trace exporteren',
+            'frame_store': 'Beeldopslag:',
+            'memory_plan': 'Geheugenplan: {store}, {sheet} (ca. {peak} van {budget})',
+            'plan_memory': 'beelden in RAM',
+            'plan_memmap': 'beelden uitbesteed (memmap)',
+            'plan_full': 'volledig sheet',
+            'plan_streaming': 'sheet pas bij opslaan',
+            'plan_over_budget': 'budget overschreden!',
+            'export_static': 'Achtergrond scheiden',
+            'static_region': 'Bewegend deel: {w}x{h} van {fw}x{fh} ({percent:.0f}% van het beeld)',
+            'static_none': 'Geen beweging gevonden: alleen achtergrond opgeslagen',
+            'export_atlas': 'Atlas maken',
+            'atlas_status': 'Atlas: {count} animaties, {frames} beelden in {w}x{h} ({cols}x{rows} cellen)',
+            'texture_sizes': 'Varianten:',
+            'undo': 'Ongedaan maken',
+            'redo': 'Opnieuw',
+            'preview_quality': 'Voorbeeld:',
+            'cancel': 'Annuleren',
+            'task_busy': 'Even wachten, er loopt nog een taak (Esc annuleert)',
+            'task_cancelled': 'Geannuleerd',
+            'load_cancelled': 'Laden geannuleerd – {count} beelden behouden',
+            'task_load': 'Laden',
+            'task_save_gif': 'GIF opslaan',
+            'task_save_texture': 'Textuur opslaan',
+            'task_export_lsl': 'LSL exporteren',
+            'save_project': 'Project opslaan',
+            'open_project': 'Project openen',
+            'task_save_project': 'Project opslaan',
+            'project_saved': 'Project opgeslagen',
+            'project_opened': 'Project geopend: {frames} beelden in {ms:.0f} ms',
+            'plan_png_only': 'De textuur past niet in het geheugenbudget. Boven het budget kan alleen als PNG (rij voor rij) worden opgeslagen; kies PNG of verklein de afbeelding.',
+            'task_cancelling': 'Taak wordt afgebroken, daarna wordt alles gewist …',
+            'task_atlas': 'Atlas samenstellen',
+            'task_save_atlas': 'Atlas opslaan',
+            'task_static': 'Statische achtergrond scheiden',
         },
         'se': {
             'bg_color': 'Bakgrundsfärg',
@@ -71,6 +108,43 @@ translations = {
             'status': 'Status',
             'file': 'Fil',
             'master_settings': 'Huvudinställningar',
+            'playback_fps': 'Uppspelning: {achieved:.1f} / {target:.1f} fps ({skipped} överhoppade)',
+            'profiling': 'Profilering',
+            'export_trace': 'Exportera spårning',
+            'frame_store': 'Bildlager:',
+            'memory_plan': 'Minnesplan: {store}, {sheet} (ca. {peak} av {budget})',
+            'plan_memory': 'bilder i RAM',
+            'plan_memmap': 'bilder utlagrade (memmap)',
+            'plan_full': 'fullständigt ark',
+            'plan_streaming': 'ark först vid sparande',
+            'plan_over_budget': 'budget överskriden!',
+            'export_static': 'Separera bakgrund',
+            'static_region': 'Rörlig del: {w}x{h} av {fw}x{fh} ({percent:.0f}% av bilden)',
+            'static_none': 'Ingen rörelse hittades: endast bakgrund sparad',
+            'export_atlas': 'Skapa atlas',
+            'atlas_status': 'Atlas: {count} animationer, {frames} bilder i {w}x{h} ({cols}x{rows} celler)',
+            'texture_sizes': 'Varianter:',
+            'undo': 'Ångra',
+            'redo': 'Gör om',
+            'preview_quality': 'Förhandsvisning:',
+            'cancel': 'Avbryt',
+            'task_busy': 'Vänta, en uppgift körs fortfarande (Esc avbryter)',
+            'task_cancelled': 'Avbrutet',
+            'load_cancelled': 'Inläsning avbruten – {count} bilder behållna',
+            'task_load': 'Läser in',
+            'task_save_gif': 'Sparar GIF',
+            'task_save_texture': 'Sparar textur',
+            'task_export_lsl': 'Exporterar LSL',
+            'save_project': 'Spara projekt',
+            'open_project': 'Öppna projekt',
+            'task_save_project': 'Sparar projekt',
+            'project_saved': 'Projekt sparat',
+            'project_opened': 'Projekt öppnat: {frames} bilder på {ms:.0f} ms',
+            'plan_png_only': 'Texturen ryms inte i minnesbudgeten. Över budgeten kan den bara sparas som PNG (rad för rad); välj PNG eller minska storleken.',
+            'task_cancelling': 'Uppgiften avbryts, sedan rensas allt …',
+            'task_atlas': 'Bygger atlas',
+            'task_save_atlas': 'Sparar atlas',
+            'task_static': 'Separerar statisk bakgrund',
         },
         'pl': {
             'bg_color': 'Kolor tła',
@@ -107,6 +181,43 @@ translations = {
             'status': 'Status',
             'file': 'Plik',
             'master_settings': 'Ustawienia główne',
+            'playback_fps': 'Odtwarzanie: {achieved:.1f} / {target:.1f} kl/s ({skipped} pominięto)',
+            'profiling': 'Profilowanie',
+            'export_trace': 'Eksportuj ślad',
+            'frame_store': 'Magazyn klatek:',
+            'memory_plan': 'Plan pamięci: {store}, {sheet} (ok. {peak} z {budget})',
+            'plan_memory': 'klatki w RAM',
+            'plan_memmap': 'klatki na dysku (memmap)',
+            'plan_full': 'pełny arkusz',
+            'plan_streaming': 'arkusz dopiero przy zapisie',
+            'plan_over_budget': 'przekroczono budżet!',
+            'export_static': 'Oddziel tło',
+            'static_region': 'Ruchomy obszar: {w}x{h} z {fw}x{fh} ({percent:.0f}% obrazu)',
+            'static_none': 'Nie znaleziono ruchu: zapisano tylko tło',
+            'export_atlas': 'Utwórz atlas',
+            'atlas_status': 'Atlas: {count} animacji, {frames} klatek w {w}x{h} ({cols}x{rows} komórek)',
+            'texture_sizes': 'Warianty:',
+            'undo': 'Cofnij',
+            'redo': 'Ponów',
+            'preview_quality': 'Podgląd:',
+            'cancel': 'Anuluj',
+            'task_busy': 'Proszę czekać, zadanie jest w toku (Esc anuluje)',
+            'task_cancelled': 'Anulowano',
+            'load_cancelled': 'Wczytywanie anulowane – zachowano {count} klatek',
+            'task_load': 'Wczytywanie',
+            'task_save_gif': 'Zapisywanie GIF',
+            'task_save_texture': 'Zapisywanie tekstury',
+            'task_export_lsl': 'Eksport LSL',
+            'save_project': 'Zapisz projekt',
+            'open_project': 'Otwórz projekt',
+            'task_save_project': 'Zapisywanie projektu',
+            'project_saved': 'Projekt zapisany',
+            'project_opened': 'Projekt otwarty: {frames} klatek w {ms:.0f} ms',
+            'plan_png_only': 'Tekstura nie mieści się w budżecie pamięci. Powyżej budżetu można zapisać tylko jako PNG (rząd po rzędzie); wybierz PNG lub zmniejsz rozmiar.',
+            'task_cancelling': 'Przerywanie zadania, potem wszystko zostanie wyczyszczone …',
+            'task_atlas': 'Tworzenie atlasu',
+            'task_save_atlas': 'Zapisywanie atlasu',
+            'task_static': 'Oddzielanie statycznego tła',
         },
         'pt': {
             'bg_color': 'Cor de fundo',
@@ -143,6 +254,43 @@ translations = {
             'status': 'Status',
             'file': 'Arquivo',
             'master_settings': 'Configurações principais',
+            'playback_fps': 'Reprodução: {achieved:.1f} / {target:.1f} fps ({skipped} ignorados)',
+            'profiling': 'Perfilagem',
+            'export_trace': 'Exportar rastreio',
+            'frame_store': 'Armazenamento de quadros:',
+            'memory_plan': 'Plano de memória: {store}, {sheet} (cerca de {peak} de {budget})',
+            'plan_memory': 'quadros na RAM',
+            'plan_memmap': 'quadros em disco (memmap)',
+            'plan_full': 'folha completa',
+            'plan_streaming': 'folha só ao salvar',
+            'plan_over_budget': 'orçamento excedido!',
+            'export_static': 'Separar fundo',
+            'static_region': 'Área animada: {w}x{h} de {fw}x{fh} ({percent:.0f}% da imagem)',
+            'static_none': 'Nenhum movimento encontrado: apenas o fundo foi salvo',
+            'export_atlas': 'Criar atlas',
+            'atlas_status': 'Atlas: {count} animações, {frames} quadros em {w}x{h} ({cols}x{rows} células)',
+            'texture_sizes': 'Variantes:',
+            'undo': 'Desfazer',
+            'redo': 'Refazer',
+            'preview_quality': 'Pré-visualização:',
+            'cancel': 'Cancelar',
+            'task_busy': 'Aguarde, uma tarefa ainda está em execução (Esc cancela)',
+            'task_cancelled': 'Cancelado',
+            'load_cancelled': 'Carregamento cancelado – {count} quadros mantidos',
+            'task_load': 'Carregando',
+            'task_save_gif': 'Salvando GIF',
+            'task_save_texture': 'Salvando textura',
+            'task_export_lsl': 'Exportando LSL',
+            'save_project': 'Salvar projeto',
+            'open_project': 'Abrir projeto',
+            'task_save_project': 'Salvando projeto',
+            'project_saved': 'Projeto salvo',
+            'project_opened': 'Projeto aberto: {frames} quadros em {ms:.0f} ms',
+            'plan_png_only': 'A textura não cabe no orçamento de memória. Acima do orçamento só pode ser salva como PNG (fila a fila); escolha PNG ou reduza o tamanho.',
+            'task_cancelling': 'A cancelar a tarefa, depois tudo será limpo …',
+            'task_atlas': 'A montar atlas',
+            'task_save_atlas': 'A guardar atlas',
+            'task_static': 'A separar fundo estático',
         },
         'it': {
             'bg_color': 'Colore sfondo',
@@ -179,6 +327,43 @@ translations = {
             'status': 'Stato',
             'file': 'File',
             'master_settings': 'Impostazioni principali',
+            'playback_fps': 'Riproduzione: {achieved:.1f} / {target:.1f} fps ({skipped} saltati)',
+            'profiling': 'Profilazione',
+            'export_trace': 'Esporta traccia',
+            'frame_store': 'Archivio fotogrammi:',
+            'memory_plan': 'Piano memoria: {store}, {sheet} (circa {peak} di {budget})',
+            'plan_memory': 'fotogrammi in RAM',
+            'plan_memmap': 'fotogrammi su disco (memmap)',
+            'plan_full': 'foglio completo',
+            'plan_streaming': 'foglio solo al salvataggio',
+            'plan_over_budget': 'budget superato!',
+            'export_static': 'Separa sfondo',
+            'static_region': 'Area animata: {w}x{h} di {fw}x{fh} ({percent:.0f}% dell\'immagine)',
+            'static_none': 'Nessun movimento trovato: salvato solo lo sfondo',
+            'export_atlas': 'Crea atlante',
+            'atlas_status': 'Atlante: {count} animazioni, {frames} fotogrammi in {w}x{h} ({cols}x{rows} celle)',
+            'texture_sizes': 'Varianti:',
+            'undo': 'Annulla',
+            'redo': 'Ripeti',
+            'preview_quality': 'Anteprima:',
+            'cancel': 'Annulla',
+            'task_busy': 'Attendere, un\'operazione è ancora in corso (Esc annulla)',
+            'task_cancelled': 'Annullato',
+            'load_cancelled': 'Caricamento annullato – {count} fotogrammi mantenuti',
+            'task_load': 'Caricamento',
+            'task_save_gif': 'Salvataggio GIF',
+            'task_save_texture': 'Salvataggio texture',
+            'task_export_lsl': 'Esportazione LSL',
+            'save_project': 'Salva progetto',
+            'open_project': 'Apri progetto',
+            'task_save_project': 'Salvataggio progetto',
+            'project_saved': 'Progetto salvato',
+            'project_opened': 'Progetto aperto: {frames} fotogrammi in {ms:.0f} ms',
+            'plan_png_only': 'La texture supera il budget di memoria. Oltre il budget può essere salvata solo come PNG (riga per riga); scegli PNG o riduci la dimensione.',
+            'task_cancelling': 'Annullamento dell\'attività, poi tutto verrà cancellato …',
+            'task_atlas': 'Composizione atlante',
+            'task_save_atlas': 'Salvataggio atlante',
+            'task_static': 'Separazione sfondo statico',
         },
         'ru': {
             'bg_color': 'Цвет фона',
@@ -215,6 +400,43 @@ translations = {
             'status': 'Статус',
             'file': 'Файл',
             'master_settings': 'Основные настройки',
+            'playback_fps': 'Воспроизведение: {achieved:.1f} / {target:.1f} к/с ({skipped} пропущено)',
+            'profiling': 'Профилирование',
+            'export_trace': 'Экспорт трассировки',
+            'frame_store': 'Хранилище кадров:',
+            'memory_plan': 'План памяти: {store}, {sheet} (около {peak} из {budget})',
+            'plan_memory': 'кадры в ОЗУ',
+            'plan_memmap': 'кадры на диске (memmap)',
+            'plan_full': 'полный лист',
+            'plan_streaming': 'лист только при сохранении',
+            'plan_over_budget': 'бюджет превышен!',
+            'export_static': 'Отделить фон',
+            'static_region': 'Движущаяся область: {w}x{h} из {fw}x{fh} ({percent:.0f}% изображения)',
+            'static_none': 'Движение не найдено: сохранён только фон',
+            'export_atlas': 'Создать атлас',
+            'atlas_status': 'Атлас: {count} анимаций, {frames} кадров в {w}x{h} ({cols}x{rows} ячеек)',
+            'texture_sizes': 'Варианты:',
+            'undo': 'Отменить',
+            'redo': 'Повторить',
+            'preview_quality': 'Просмотр:',
+            'cancel': 'Отмена',
+            'task_busy': 'Подождите, задача ещё выполняется (Esc — отмена)',
+            'task_cancelled': 'Отменено',
+            'load_cancelled': 'Загрузка отменена – сохранено кадров: {count}',
+            'task_load': 'Загрузка',
+            'task_save_gif': 'Сохранение GIF',
+            'task_save_texture': 'Сохранение текстуры',
+            'task_export_lsl': 'Экспорт LSL',
+            'save_project': 'Сохранить проект',
+            'open_project': 'Открыть проект',
+            'task_save_project': 'Сохранение проекта',
+            'project_saved': 'Проект сохранён',
+            'project_opened': 'Проект открыт: кадров {frames} за {ms:.0f} мс',
+            'plan_png_only': 'Текстура не помещается в бюджет памяти. Сверх бюджета её можно сохранить только как PNG (по рядам); выберите PNG или уменьшите размер.',
+            'task_cancelling': 'Задача прерывается, затем всё будет очищено …',
+            'task_atlas': 'Сборка атласа',
+            'task_save_atlas': 'Сохранение атласа',
+            'task_static': 'Отделение статичного фона',
         },
     'de': {
         'bg_color': 'Hintergrundfarbe',
@@ -251,6 +473,43 @@ translations = {
         'status': 'Status',
         'file': 'Datei',
         'master_settings': 'Master Einstellungen',
+        'playback_fps': 'Wiedergabe: {achieved:.1f} / {target:.1f} fps ({skipped} übersprungen)',
+        'profiling': 'Profiling',
+        'export_trace': 'Trace exportieren',
+        'frame_store': 'Bildspeicher:',
+        'memory_plan': 'Speicherplan: {store}, {sheet} (ca. {peak} von {budget})',
+        'plan_memory': 'Bilder im RAM',
+        'plan_memmap': 'Bilder ausgelagert (memmap)',
+        'plan_full': 'volles Sheet',
+        'plan_streaming': 'Sheet erst beim Speichern',
+        'plan_over_budget': 'Budget überschritten!',
+        'export_static': 'Hintergrund trennen',
+        'static_region': 'Bewegter Ausschnitt: {w}x{h} von {fw}x{fh} ({percent:.0f}% des Bildes)',
+        'static_none': 'Keine Bewegung gefunden: nur Hintergrund gespeichert',
+        'export_atlas': 'Atlas erstellen',
+        'atlas_status': 'Atlas: {count} Animationen, {frames} Bilder in {w}x{h} ({cols}x{rows} Zellen)',
+        'texture_sizes': 'Varianten:',
+        'undo': 'Rückgängig',
+        'redo': 'Wiederholen',
+        'preview_quality': 'Vorschau:',
+        'cancel': 'Abbrechen',
+        'task_busy': 'Bitte warten, eine Aufgabe läuft noch (Esc bricht ab)',
+        'task_cancelled': 'Abgebrochen',
+        'load_cancelled': 'Laden abgebrochen – {count} Bilder übernommen',
+        'task_load': 'Laden',
+        'task_save_gif': 'GIF speichern',
+        'task_save_texture': 'Textur speichern',
+        'task_export_lsl': 'LSL exportieren',
+        'save_project': 'Projekt speichern',
+        'open_project': 'Projekt öffnen',
+        'task_save_project': 'Projekt speichern',
+        'project_saved': 'Projekt gespeichert',
+        'project_opened': 'Projekt geöffnet: {frames} Bilder in {ms:.0f} ms',
+        'plan_png_only': 'Die Textur passt nicht ins Speicherbudget. Über dem Budget kann nur als PNG (Kachelreihe für Kachelreihe) gespeichert werden; bitte PNG wählen oder die Bildgröße verkleinern.',
+        'task_cancelling': 'Aufgabe wird abgebrochen, danach wird geleert …',
+        'task_atlas': 'Atlas packen',
+        'task_save_atlas': 'Atlas speichern',
+        'task_static': 'Statischen Hintergrund abtrennen',
     },
     'en': {
         'bg_color': 'Background Color',
@@ -287,6 +546,43 @@ translations = {
         'status': 'Status',
         'file': 'File',
         'master_settings': 'Master Settings',
+        'playback_fps': 'Playback: {achieved:.1f} / {target:.1f} fps ({skipped} skipped)',
+        'profiling': 'Profiling',
+        'export_trace': 'Export trace',
+        'frame_store': 'Frame store:',
+        'memory_plan': 'Memory plan: {store}, {sheet} (approx. {peak} of {budget})',
+        'plan_memory': 'frames in RAM',
+        'plan_memmap': 'frames on disk (memmap)',
+        'plan_full': 'full sheet',
+        'plan_streaming': 'sheet only on save',
+        'plan_over_budget': 'budget exceeded!',
+        'export_static': 'Split background',
+        'static_region': 'Moving region: {w}x{h} of {fw}x{fh} ({percent:.0f}% of the image)',
+        'static_none': 'No motion found: saved background only',
+        'export_atlas': 'Create atlas',
+        'atlas_status': 'Atlas: {count} animations, {frames} frames in {w}x{h} ({cols}x{rows} cells)',
+        'texture_sizes': 'Variants:',
+        'undo': 'Undo',
+        'redo': 'Redo',
+        'preview_quality': 'Preview:',
+        'cancel': 'Cancel',
+        'task_busy': 'Please wait, a task is still running (Esc cancels)',
+        'task_cancelled': 'Cancelled',
+        'load_cancelled': 'Loading cancelled – {count} frames kept',
+        'task_load': 'Loading',
+        'task_save_gif': 'Saving GIF',
+        'task_save_texture': 'Saving texture',
+        'task_export_lsl': 'Exporting LSL',
+        'save_project': 'Save project',
+        'open_project': 'Open project',
+        'task_save_project': 'Saving project',
+        'project_saved': 'Project saved',
+        'project_opened': 'Project opened: {frames} frames in {ms:.0f} ms',
+        'plan_png_only': 'The texture does not fit the memory budget. Over budget it can only be saved as PNG (row by row of tiles); choose PNG or reduce the image size.',
+        'task_cancelling': 'Cancelling the task, clearing afterwards …',
+        'task_atlas': 'Packing atlas',
+        'task_save_atlas': 'Saving atlas',
+        'task_static': 'Splitting static background',
     },
     'fr': {
         'gif_preview': 'Aperçu GIF',
@@ -323,6 +619,43 @@ translations = {
         'status': 'Statut',
         'file': 'Fichier',
         'master_settings': 'Paramètres principaux',
+        'playback_fps': 'Lecture : {achieved:.1f} / {target:.1f} ips ({skipped} ignorées)',
+        'profiling': 'Profilage',
+        'export_trace': 'Exporter la trace',
+        'frame_store': 'Stockage des images :',
+        'memory_plan': 'Plan mémoire : {store}, {sheet} (env. {peak} sur {budget})',
+        'plan_memory': 'images en RAM',
+        'plan_memmap': 'images sur disque (memmap)',
+        'plan_full': 'feuille complète',
+        'plan_streaming': 'feuille à l\'enregistrement',
+        'plan_over_budget': 'budget dépassé !',
+        'export_static': 'Séparer l\'arrière-plan',
+        'static_region': 'Zone animée : {w}x{h} sur {fw}x{fh} ({percent:.0f}% de l\'image)',
+        'static_none': 'Aucun mouvement trouvé : arrière-plan seul enregistré',
+        'export_atlas': 'Créer un atlas',
+        'atlas_status': 'Atlas : {count} animations, {frames} images dans {w}x{h} ({cols}x{rows} cellules)',
+        'texture_sizes': 'Variantes :',
+        'undo': 'Annuler',
+        'redo': 'Rétablir',
+        'preview_quality': 'Aperçu :',
+        'cancel': 'Annuler',
+        'task_busy': 'Veuillez patienter, une tâche est en cours (Échap pour annuler)',
+        'task_cancelled': 'Annulé',
+        'load_cancelled': 'Chargement annulé – {count} images conservées',
+        'task_load': 'Chargement',
+        'task_save_gif': 'Enregistrement du GIF',
+        'task_save_texture': 'Enregistrement de la texture',
+        'task_export_lsl': 'Export LSL',
+        'save_project': 'Enregistrer le projet',
+        'open_project': 'Ouvrir un projet',
+        'task_save_project': 'Enregistrement du projet',
+        'project_saved': 'Projet enregistré',
+        'project_opened': 'Projet ouvert : {frames} images en {ms:.0f} ms',
+        'plan_png_only': 'La texture dépasse le budget mémoire. Au-delà du budget, seul l\'enregistrement en PNG (rangée par rangée) est possible ; choisissez PNG ou réduisez la taille.',
+        'task_cancelling': 'Annulation de la tâche, puis tout sera effacé …',
+        'task_atlas': 'Assemblage de l\'atlas',
+        'task_save_atlas': 'Enregistrement de l\'atlas',
+        'task_static': 'Séparation de l\'arrière-plan statique',
     },
     'es': {
         'gif_preview': 'Vista previa GIF',
@@ -359,6 +692,43 @@ translations = {
         'status': 'Estado',
         'file': 'Archivo',
         'master_settings': 'Ajustes principales',
+        'playback_fps': 'Reproducción: {achieved:.1f} / {target:.1f} fps ({skipped} omitidos)',
+        'profiling': 'Perfilado',
+        'export_trace': 'Exportar traza',
+        'frame_store': 'Almacén de fotogramas:',
+        'memory_plan': 'Plan de memoria: {store}, {sheet} (aprox. {peak} de {budget})',
+        'plan_memory': 'fotogramas en RAM',
+        'plan_memmap': 'fotogramas en disco (memmap)',
+        'plan_full': 'hoja completa',
+        'plan_streaming': 'hoja solo al guardar',
+        'plan_over_budget': '¡presupuesto excedido!',
+        'export_static': 'Separar fondo',
+        'static_region': 'Zona animada: {w}x{h} de {fw}x{fh} ({percent:.0f}% de la imagen)',
+        'static_none': 'No se encontró movimiento: solo se guardó el fondo',
+        'export_atlas': 'Crear atlas',
+        'atlas_status': 'Atlas: {count} animaciones, {frames} fotogramas en {w}x{h} ({cols}x{rows} celdas)',
+        'texture_sizes': 'Variantes:',
+        'undo': 'Deshacer',
+        'redo': 'Rehacer',
+        'preview_quality': 'Vista previa:',
+        'cancel': 'Cancelar',
+        'task_busy': 'Espere, todavía hay una tarea en curso (Esc cancela)',
+        'task_cancelled': 'Cancelado',
+        'load_cancelled': 'Carga cancelada – {count} fotogramas conservados',
+        'task_load': 'Cargando',
+        'task_save_gif': 'Guardando GIF',
+        'task_save_texture': 'Guardando textura',
+        'task_export_lsl': 'Exportando LSL',
+        'save_project': 'Guardar proyecto',
+        'open_project': 'Abrir proyecto',
+        'task_save_project': 'Guardando proyecto',
+        'project_saved': 'Proyecto guardado',
+        'project_opened': 'Proyecto abierto: {frames} fotogramas en {ms:.0f} ms',
+        'plan_png_only': 'La textura no cabe en el presupuesto de memoria. Por encima del presupuesto solo puede guardarse como PNG (fila a fila); elija PNG o reduzca el tamaño.',
+        'task_cancelling': 'Cancelando la tarea, después se borrará todo …',
+        'task_atlas': 'Empaquetando atlas',
+        'task_save_atlas': 'Guardando atlas',
+        'task_static': 'Separando fondo estático',
     },
 }
 
@@ -0,0 +1,222 @@
+# OSSL2Gif - Überwachter Ordner: neue und geänderte GIFs (auch WebP/APNG) automatisch umwandeln
+#
+#   python watch.py eingang -o ausgabe --workers 2 --settle 3 --set grayscale=1
+#
+# Der Ordner wird regelmäßig abgefragt (ohne zusätzliche Pakete, auch auf Netzlaufwerken).
+# Eine Datei gilt erst als fertig geschrieben, wenn Größe und Änderungszeit für --settle
+# Sekunden gleich bleiben. Umgewandelt wird wie in cli.py (Textur + LSL) in einem begrenzten
+# Prozess-Pool; unveränderte Inhalte (SHA-256 über Datei und Einstellungen) werden
+# übersprungen, der Stand liegt als JSON im Ausgabeordner und überlebt Neustarts.
+#
+# Log: eine Zeile je Ereignis als schlüssel=wert (für journald/grep), z.B.
+#   2026-01-01 12:00:00 level=INFO event=converted file=fire.gif frames=16 latency_ms=3120 convert_ms=410
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cli
+
+STATE_FILE = ".ossl2gif_watch.json"
+# APNG nur als .apng: .png im Eingang könnte eine fertige Textur sein
+EXTENSIONS = (".gif", ".webp", ".apng")
+log = logging.getLogger("ossl2gif.watch")
+
+
+def format_fields(**fields):
+    # schlüssel=wert, Werte mit Leerzeichen in Anführungszeichen
+    parts = []
+    for key, value in fields.items():
+        value = str(value)
+        if not value or any(c in value for c in ' "='):
+            value = json.dumps(value, ensure_ascii=False)
+        parts.append(f"{key}={value}")
+    return " ".join(parts)
+
+
+def file_digest(path, settings_key):
+    # Inhalt und Einstellungen: geänderte Einstellungen wandeln alles neu um
+    h = hashlib.sha256(settings_key.encode("utf-8"))
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_state(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(path, state):
+    # Erst temporär schreiben, dann ersetzen: bei Abbruch bleibt der alte Stand lesbar
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def scan(indir):
+    # {Pfad: (Größe, Änderungszeit)} aller GIFs im Eingangsordner
+    found = {}
+    with os.scandir(indir) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(EXTENSIONS):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                found[entry.path] = (st.st_size, st.st_mtime_ns)
+    return found
+
+
+class Watcher:
+    def __init__(self, indir, outdir, settings, workers=2, interval=1.0, settle=2.0):
+        self.indir = indir
+        self.outdir = outdir
+        self.settings = settings
+        self.workers = max(1, workers)
+        self.interval = interval
+        self.settle = settle
+        self.settings_key = json.dumps(settings, sort_keys=True)
+        self.settings_hash = hashlib.sha256(self.settings_key.encode("utf-8")).hexdigest()
+        self.state_path = os.path.join(outdir, STATE_FILE)
+        self.state = load_state(self.state_path)
+        self.seen = {}          # Pfad -> (Signatur, erstmals so gesehen)
+        self.queue = []         # fertig geschriebene Dateien, die auf einen Platz im Pool warten
+        self.running = {}       # Future -> (Pfad, Digest, Signatur, erkannt, gestartet)
+        self.stopping = False
+
+    def stop(self, *_):
+        self.stopping = True
+
+    def is_current(self, path, signature):
+        # Schon mit dieser Signatur und diesen Einstellungen umgewandelt (oder gescheitert)
+        entry = self.state.get(path)
+        return bool(entry) and entry.get('signature') == list(signature) and entry.get('settings') == self.settings_hash
+
+    def poll(self):
+        # Eingang abfragen; stabile und geänderte Dateien in die Warteschlange stellen
+        now = time.monotonic()
+        found = scan(self.indir)
+        for path in list(self.seen):
+            if path not in found:
+                del self.seen[path]
+        for path in list(self.state):
+            if path not in found:
+                log.info(format_fields(event="removed", file=os.path.basename(path)))
+                del self.state[path]
+                save_state(self.state_path, self.state)
+        busy = {p for p, *_ in self.running.values()} | {p for p, _ in self.queue}
+        for path, signature in found.items():
+            previous = self.seen.get(path)
+            if previous is None or previous[0] != signature:
+                self.seen[path] = (signature, now)
+                continue
+            if path in busy or now - previous[1] < self.settle or self.is_current(path, signature):
+                continue
+            try:
+                digest = file_digest(path, self.settings_key)
+            except OSError as e:
+                log.warning(format_fields(event="unreadable", file=os.path.basename(path), error=e))
+                continue
+            entry = self.state.get(path)
+            if entry and entry.get('sha256') == digest:
+                # Nur berührt (z.B. erneut kopiert), Inhalt und Einstellungen gleich
+                entry.update({'signature': list(signature), 'settings': self.settings_hash})
+                save_state(self.state_path, self.state)
+                log.info(format_fields(event="unchanged", file=os.path.basename(path)))
+                continue
+            self.queue.append((path, (digest, signature, previous[1])))
+
+    def dispatch(self, pool):
+        # Höchstens so viele Aufträge wie Prozesse, der Rest wartet in der eigenen Warteschlange
+        while self.queue and len(self.running) < self.workers:
+            path, (digest, signature, detected) = self.queue.pop(0)
+            future = pool.submit(cli.convert_file, path, self.outdir, self.settings)
+            self.running[future] = (path, digest, signature, detected, time.monotonic())
+
+    def collect(self):
+        for future in [f for f in self.running if f.done()]:
+            path, digest, signature, detected, started = self.running.pop(future)
+            now = time.monotonic()
+            name = os.path.basename(path)
+            try:
+                result = future.result()
+            except Exception as e:
+                # Fehler merken, damit dieselbe Datei nicht in Dauerschleife umgewandelt wird
+                self.state[path] = {'sha256': digest, 'signature': list(signature), 'settings': self.settings_hash,
+                                    'error': str(e)}
+                log.error(format_fields(event="failed", file=name, error=e, latency_ms=round((now - detected) * 1000)))
+            else:
+                self.state[path] = {'sha256': digest, 'signature': list(signature), 'settings': self.settings_hash,
+                                    'texture': result['texture'], 'lsl': result.get('lsl'), 'converted': time.time()}
+                log.info(format_fields(event="converted", file=name, frames=result['frames'],
+                                       latency_ms=round((now - detected) * 1000), queue_ms=round((started - detected) * 1000),
+                                       convert_ms=round((now - started) * 1000), frame_store=result['frame_store'],
+                                       texture=os.path.basename(result['texture'])))
+            save_state(self.state_path, self.state)
+
+    def run(self, once=False):
+        # once: so lange abfragen, bis alles Vorhandene fertig geschrieben und umgewandelt ist
+        os.makedirs(self.outdir, exist_ok=True)
+        log.info(format_fields(event="start", indir=self.indir, outdir=self.outdir, workers=self.workers,
+                               settle_s=self.settle, interval_s=self.interval, known=len(self.state)))
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            while not self.stopping:
+                self.poll()
+                self.dispatch(pool)
+                self.collect()
+                if once and not self.queue and not self.running and all(
+                        self.is_current(p, sig) for p, (sig, _) in self.seen.items()):
+                    break
+                time.sleep(self.interval)
+            # Laufende Umwandlungen abschließen, Wartende verwerfen (beim nächsten Start erneut)
+            self.queue.clear()
+            pool.shutdown(wait=True)
+            self.collect()
+        log.info(format_fields(event="stop", known=len(self.state)))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="OSSL2Gif: Ordner überwachen und neue/geänderte GIFs umwandeln")
+    parser.add_argument("indir", help="Eingangsordner")
+    cli.add_settings_arguments(parser)
+    parser.add_argument("--workers", type=int, default=max(1, min(4, (os.cpu_count() or 2) // 2)),
+                        help="gleichzeitige Umwandlungen (Prozesse)")
+    parser.add_argument("--interval", type=float, default=1.0, help="Abfrageintervall in Sekunden")
+    parser.add_argument("--settle", type=float, default=2.0,
+                        help="Sekunden ohne Änderung, bevor eine Datei als fertig geschrieben gilt")
+    parser.add_argument("--once", action="store_true", help="Vorhandenes umwandeln und beenden")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        settings = cli.settings_from_args(args)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr,
+                        format="%(asctime)s level=%(levelname)s %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    watcher = Watcher(os.path.abspath(args.indir), os.path.abspath(args.outdir), settings,
+                      args.workers, args.interval, args.settle)
+    # systemd beendet mit SIGTERM: laufende Aufträge noch fertigstellen
+    signal.signal(signal.SIGTERM, watcher.stop)
+    signal.signal(signal.SIGINT, watcher.stop)
+    watcher.run(once=args.once)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())